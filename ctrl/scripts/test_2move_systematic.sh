@@ -12,31 +12,40 @@ moves=(FR UF OR UO RL FU OL UD)
 
 mkdir -p ../obsv/logs
 
-total_tests=$((${#moves[@]} * ${#moves[@]}))
-completed=0
-
+# Build every pair up front; line N of the batch file is pairs[N]
+pairs=()
 for m1 in "${moves[@]}"; do
     for m2 in "${moves[@]}"; do
-        completed=$((completed + 1))
-        echo "[$completed/$total_tests] Testing: $m1,$m2"
-
-        cargo run --release -- \
-            --puzzle ft_hypercube:3 \
-            --moves "$m1,$m2" \
-            --max-iterations 50000 \
-            --output "results_2mov_${m1}_${m2}.json" \
-            > "../obsv/logs/${m1}_${m2}.log" 2>&1 &
-
-        # Limit to 4 parallel jobs to avoid overwhelming the system
-        if [ $(jobs -r | wc -l) -ge 4 ]; then
-            wait -n
-        fi
+        pairs+=("$m1,$m2")
     done
 done
 
-wait
+total_tests=${#pairs[@]}
+batch_file=$(mktemp)
+trap 'rm -f "$batch_file"' EXIT
+printf '%s\n' "${pairs[@]}" > "$batch_file"
+
+# One ctrl process loads the puzzle once and evaluates all pairs on every core
+cargo build --release --quiet || exit 1
+
+completed=0
+./target/release/ctrl \
+    --puzzle ft_hypercube:3 \
+    --batch "$batch_file" \
+    --max-iterations 50000 \
+    2> ../obsv/logs/2move_batch.log |
+while IFS= read -r line; do
+    completed=$((completed + 1))
+
+    # Results stream in completion order; "id" is the line index in the batch file
+    [[ $line =~ \"id\":([0-9]+) ]] || continue
+    pair=${pairs[${BASH_REMATCH[1]}]}
+    echo "[$completed/$total_tests] Finished: $pair"
+
+    echo "$line" > "results_2mov_${pair/,/_}.json"
+done
 
 echo ""
 echo "=== All Tests Complete ==="
 echo "Results saved to results_2mov_*.json"
-echo "Logs saved to logs/*.log"
+echo "Logs saved to logs/2move_batch.log"
@@ -0,0 +1,81 @@
+use hyperpuzzle_core::Puzzle;
+use serde_json::json;
+use std::fs;
+use std::io::{self, Read, Write};
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::sync::{mpsc, Arc};
+use std::thread;
+
+use crate::serve::{self, SequenceRequest};
+
+/// Read move sequences for batch mode, one comma-separated sequence per line
+///
+/// `path` may be "-" to read from stdin. Blank lines and lines starting with
+/// '#' are skipped, but still counted: each sequence is returned with its
+/// 0-based line index, which becomes the `id` of its result.
+pub fn read_sequences(path: &str) -> io::Result<Vec<(usize, String)>> {
+    let contents = if path == "-" {
+        let mut buf = String::new();
+        io::stdin().read_to_string(&mut buf)?;
+        buf
+    } else {
+        fs::read_to_string(path)?
+    };
+
+    Ok(contents
+        .lines()
+        .map(str::trim)
+        .enumerate()
+        .filter(|(_, line)| !line.is_empty() && !line.starts_with('#'))
+        .map(|(index, line)| (index, String::from(line)))
+        .collect())
+}
+
+/// Evaluate many sequences in parallel against one loaded puzzle
+///
+/// Worker threads pull the next sequence index from a shared counter and
+/// share the same `Arc<Puzzle>`. Results are written to stdout as compact
+/// JSON lines in completion order; each carries `id` = the sequence's
+/// line index (see read_sequences).
+pub fn run_batch(
+    puzzle: &Arc<Puzzle>,
+    dimension: usize,
+    sequences: &[(usize, String)],
+    max_iterations: usize,
+    threads: usize,
+) -> io::Result<()> {
+    let next = AtomicUsize::new(0);
+    let (tx, rx) = mpsc::channel();
+
+    thread::scope(|scope| {
+        for _ in 0..threads.max(1) {
+            let tx = tx.clone();
+            let next = &next;
+            scope.spawn(move || loop {
+                let index = next.fetch_add(1, Ordering::Relaxed);
+                if index >= sequences.len() {
+                    break;
+                }
+
+                let (line, moves) = &sequences[index];
+                let request = SequenceRequest {
+                    id: json!(line),
+                    moves: moves.clone(),
+                    max_iterations,
+                };
+                if tx.send(serve::handle_request(puzzle, dimension, &request)).is_err() {
+                    break;
+                }
+            });
+        }
+        drop(tx);
+
+        let stdout = io::stdout();
+        let mut out = stdout.lock();
+        for response in rx {
+            writeln!(out, "{}", response)?;
+            out.flush()?;
+        }
+        Ok(())
+    })
+}
@@ -0,0 +1,13 @@
+//! Trajectory exploration for Hyperspeedcube puzzles
+//!
+//! The `ctrl` binary is a thin CLI over these modules. With the `python`
+//! feature the same code is exposed as an in-process Python extension.
+
+pub mod batch;
+pub mod moves;
+pub mod orbit;
+pub mod perm;
+pub mod serve;
+
+#[cfg(feature = "python")]
+mod python;
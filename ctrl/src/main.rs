@@ -2,8 +2,7 @@ use clap::Parser;
 use hyperpuzzle::{catalog, load_global_catalog};
 use hyperpuzzle_core::Puzzle;
 
-mod moves;
-mod orbit;
+use ctrl::{batch, moves, orbit, perm, serve};
 
 /// Orbit Explorer for Hyperspeedcube puzzles across dimensions
 #[derive(Parser, Debug)]
@@ -22,23 +21,56 @@ struct Args {
     #[arg(short = 'i', long, default_value_t = 100000)]
     max_iterations: usize,
 
-    /// Output file path (JSON format)
+    /// Output file path (JSON format), or "-" to print compact JSON to stdout
+    /// with progress output suppressed
     #[arg(short, long, default_value = "orbit_stats.json")]
     output: String,
+
+    /// Server mode: load the puzzle once, then read JSON sequence requests
+    /// from stdin and write one JSON result per line to stdout
+    #[arg(long)]
+    serve: bool,
+
+    /// Batch mode: evaluate every sequence in FILE (one comma-separated
+    /// sequence per line, "-" for stdin) and stream one JSON result per line
+    #[arg(long, value_name = "FILE")]
+    batch: Option<String>,
+
+    /// Worker threads for batch mode (default: all available cores)
+    #[arg(long)]
+    threads: Option<usize>,
+
+    /// Write every quarter twist's piece permutation to FILE (JSON, "-" for
+    /// stdout) for obsv's permutation engine, then exit
+    #[arg(long, value_name = "FILE")]
+    export_twists: Option<String>,
 }
 
 fn main() {
     let args = Args::parse();
 
-    println!("🧊 Hyperspeedcube Orbit Explorer");
-    println!("=================================\n");
+    // In server and batch modes, and when writing to "-", stdout is reserved for JSON
+    let to_stdout = args.output == "-" || args.export_twists.as_deref() == Some("-");
+    let verbose = !args.serve && args.batch.is_none() && !to_stdout;
+
+    // Human-readable progress, printed only when stdout isn't carrying JSON
+    macro_rules! say {
+        ($($arg:tt)*) => {
+            if verbose {
+                println!($($arg)*);
+            }
+        };
+    }
+
+    say!("🧊 Hyperspeedcube Orbit Explorer");
+    say!("=================================\n");
 
     // Step 1: Load the puzzle catalog (this includes all built-in puzzles)
-    println!("Loading puzzle catalog...");
+    say!("Loading puzzle catalog...");
     load_global_catalog();
 
     // Step 2: Load the requested puzzle
-    println!("Loading puzzle: {}...", args.puzzle);
+    say!("Loading puzzle: {}...", args.puzzle);
     let puzzle = match catalog().build_blocking::<Puzzle>(&args.puzzle) {
         Ok(puz) => puz,
         Err(e) => {
@@ -46,36 +78,74 @@ fn main() {
             eprintln!("\nAvailable puzzles:");
             eprintln!("  3D: ft_cube:2 (2x2x2), ft_cube:3 (3x3x3)");
             eprintln!("  4D: ft_hypercube:2 (2x2x2x2), ft_hypercube:3 (3x3x3x3)");
+            if !verbose {
+                std::process::exit(1);
+            }
             return;
         }
     };
 
-    println!("✅ Loaded puzzle: {}", puzzle.meta.name);
-    println!("   Puzzle ID: {}", puzzle.meta.id);
-
     // Determine dimension from puzzle ID (simple heuristic)
-    let dimension = if puzzle.meta.id.contains("hypercube") {
-        4
-    } else if puzzle.meta.id.contains("cube") {
-        3
-    } else {
-        // Try to infer from number of axes (each dimension typically has 2 opposite axes)
-        puzzle.axis_layers.len() / 2
-    };
-    println!("   Dimension: {}D", dimension);
+    let dimension = orbit::puzzle_dimension(&puzzle);
+
+    if let Some(path) = &args.export_twists {
+        let table = match perm::twist_table(&puzzle) {
+            Ok(t) => t,
+            Err(e) => {
+                eprintln!("❌ Cannot build twist table: {}", e);
+                std::process::exit(1);
+            }
+        };
+        if let Err(e) = table.export_json(path) {
+            eprintln!("❌ Failed to export twist table: {}", e);
+            std::process::exit(1);
+        }
+        say!("✅ Exported {} twists over {} pieces to: {}", table.twists.len(), table.pieces.len(), path);
+        return;
+    }
+
+    if args.serve {
+        if let Err(e) = serve::serve(&puzzle, dimension) {
+            eprintln!("❌ Server error: {}", e);
+            std::process::exit(1);
+        }
+        return;
+    }
+
+    if let Some(path) = &args.batch {
+        let sequences = match batch::read_sequences(path) {
+            Ok(s) => s,
+            Err(e) => {
+                eprintln!("❌ Failed to read batch file '{}': {}", path, e);
+                std::process::exit(1);
+            }
+        };
+        let threads = args.threads.unwrap_or_else(|| {
+            std::thread::available_parallelism().map(|n| n.get()).unwrap_or(1)
+        });
+        if let Err(e) = batch::run_batch(&puzzle, dimension, &sequences, args.max_iterations, threads) {
+            eprintln!("❌ Batch error: {}", e);
+            std::process::exit(1);
+        }
+        return;
+    }
+
+    say!("✅ Loaded puzzle: {}", puzzle.meta.name);
+    say!("   Puzzle ID: {}", puzzle.meta.id);
+    say!("   Dimension: {}D", dimension);
 
     // Step 3: Create the initial (solved) state
     let initial_state = puzzle.new_solved_state();
-    println!("\n✅ Created initial state");
-    println!("   Is solved: {}", initial_state.is_solved());
+    say!("\n✅ Created initial state");
+    say!("   Is solved: {}", initial_state.is_solved());
 
-    println!("\n📋 Configuration:");
-    println!("   Move sequence: {}", args.moves);
-    println!("   Max iterations: {}", args.max_iterations);
-    println!("   Output: {}", args.output);
+    say!("\n📋 Configuration:");
+    say!("   Move sequence: {}", args.moves);
+    say!("   Max iterations: {}", args.max_iterations);
+    say!("   Output: {}", args.output);
 
     // Step 4: Parse moves
-    println!("\n🔄 Parsing move sequence...");
+    say!("\n🔄 Parsing move sequence...");
     let moves = match moves::parse_moves(&puzzle, &args.moves) {
         Ok(m) => m,
         Err(e) => {
@@ -86,46 +156,60 @@ fn main() {
                 eprintln!("    {}: {}", twist_id.0, &name_spec.preferred);
             }
             eprintln!("  ... and {} more", puzzle.twists.names.len().saturating_sub(10));
+            if !verbose {
+                std::process::exit(1);
+            }
             return;
         }
     };
 
-    println!("✅ Parsed move sequence: {} moves per iteration", moves.len());
+    say!("✅ Parsed move sequence: {} moves per iteration", moves.len());
     for (i, layered_twist) in moves.iter().enumerate() {
         let name_spec = puzzle.twists.names.get(layered_twist.transform)
             .expect("Invalid twist ID");
-        println!("   {}: {} (layers: {})", i + 1, &name_spec.preferred, layered_twist.layers.0);
+        say!("   {}: {} (layers: {})", i + 1, &name_spec.preferred, layered_twist.layers.0);
     }
 
     // Step 5: Follow trajectory (discrete dynamical system)
-    let stats = orbit::explore_trajectory(&puzzle, initial_state, &moves, args.max_iterations, dimension);
+    let stats = orbit::explore_trajectory(&puzzle, initial_state, &moves, args.max_iterations, dimension, verbose);
 
     // Step 6: Display summary
-    println!("\n📊 Dynamical Systems Summary:");
-    println!("   Puzzle: {} ({}D)", stats.puzzle_name, stats.dimension);
-    println!("   Map T: {}", stats.move_sequence.join(" → "));
-    println!("   Unique states visited: {}", stats.unique_states_visited);
+    say!("\n📊 Dynamical Systems Summary:");
+    say!("   Puzzle: {} ({}D)", stats.puzzle_name, stats.dimension);
+    say!("   Map T: {}", stats.move_sequence.join(" → "));
+    say!("   Unique states visited: {}", stats.unique_states_visited);
 
     if stats.reached_cycle {
-        println!("\n   🔄 Periodic Behavior:");
-        println!("     Period: {} iterations", stats.period.unwrap());
-        println!("     Transient: {} iterations", stats.transient_length);
-        println!("     Total trajectory: {} states", stats.unique_states_visited);
+        say!("\n   🔄 Periodic Behavior:");
+        say!("     Period: {} iterations", stats.period.unwrap());
+        say!("     Transient: {} iterations", stats.transient_length);
+        say!("     Total trajectory: {} states", stats.unique_states_visited);
     } else {
-        println!("\n   ⏸️  Non-periodic (or period > {} iterations)", stats.max_iterations);
-        println!("     This suggests complex/chaotic behavior!");
+        say!("\n   ⏸️  Non-periodic (or period > {} iterations)", stats.max_iterations);
+        say!("     This suggests complex/chaotic behavior!");
+    }
+
+    // Step 7: Export to JSON (a single compact document on stdout for `--output -`)
+    if to_stdout {
+        match serde_json::to_string(&stats) {
+            Ok(json) => println!("{}", json),
+            Err(e) => {
+                eprintln!("❌ Failed to serialize results: {}", e);
+                std::process::exit(1);
+            }
+        }
+        return;
     }
 
-    // Step 7: Export to JSON
-    println!("\n💾 Exporting results...");
+    say!("\n💾 Exporting results...");
     match stats.export_json(&args.output) {
         Ok(_) => {
-            println!("✅ Results exported to: {}", args.output);
+            say!("✅ Results exported to: {}", args.output);
         }
         Err(e) => {
             eprintln!("❌ Failed to export results: {}", e);
         }
     }
 
-    println!("\n✅ Trajectory analysis complete!");
+    say!("\n✅ Trajectory analysis complete!");
 }
@@ -26,20 +26,38 @@ pub struct TrajectoryStats {
     pub exploration_time_ms: u128,
 }
 
+/// Determine the dimension of a puzzle from its ID (simple heuristic)
+pub fn puzzle_dimension(puzzle: &Puzzle) -> usize {
+    if puzzle.meta.id.contains("hypercube") {
+        4
+    } else if puzzle.meta.id.contains("cube") {
+        3
+    } else {
+        // Try to infer from number of axes (each dimension typically has 2 opposite axes)
+        puzzle.axis_layers.len() / 2
+    }
+}
+
 /// Explore trajectory by repeatedly applying a move sequence
 /// This is for discrete dynamical systems / chaos analysis
+///
+/// When `verbose` is false, nothing is printed (used by server mode, where
+/// stdout carries only JSON responses)
 pub fn explore_trajectory(
     puzzle: &Arc<Puzzle>,
     initial_state: BoxDynPuzzleState,
     move_sequence: &[LayeredTwist],
     max_iterations: usize,
     dimension: usize,
+    verbose: bool,
 ) -> TrajectoryStats {
     let start_time = Instant::now();
 
-    println!("\n🌀 Following trajectory (discrete dynamical system)...");
-    println!("   Initial state: solved");
-    println!("   Move sequence: applying {} moves per iteration", move_sequence.len());
+    if verbose {
+        println!("\n🌀 Following trajectory (discrete dynamical system)...");
+        println!("   Initial state: solved");
+        println!("   Move sequence: applying {} moves per iteration", move_sequence.len());
+    }
 
     let mut state = initial_state;
     let mut visited: HashMap<String, usize> = HashMap::new();
@@ -62,7 +80,9 @@ pub fn explore_trajectory(
                     state = new_state;
                 }
                 Err(_) => {
-                    println!("   ⚠️  Move blocked at iteration {}!", iteration);
+                    if verbose {
+                        println!("   ⚠️  Move blocked at iteration {}!", iteration);
+                    }
                     break;
                 }
             }
@@ -77,16 +97,18 @@ pub fn explore_trajectory(
             transient_length = first_visit;
             reached_cycle = true;
 
-            println!("   🔄 CYCLE DETECTED at iteration {}!", iteration);
-            println!("   First saw this state at iteration {}", first_visit);
-            println!("   Period = {} iterations", period.unwrap());
+            if verbose {
+                println!("   🔄 CYCLE DETECTED at iteration {}!", iteration);
+                println!("   First saw this state at iteration {}", first_visit);
+                println!("   Period = {} iterations", period.unwrap());
+            }
             break;
         }
 
         visited.insert(state_hash, iteration);
 
         // Progress reporting
-        if iteration % 1000 == 0 || last_report.elapsed().as_secs() >= 2 {
+        if verbose && (iteration % 1000 == 0 || last_report.elapsed().as_secs() >= 2) {
             println!("   Iteration {}: {} unique states visited, solved={}",
                      iteration, visited.len(), state.is_solved());
             last_report = Instant::now();
@@ -96,18 +118,20 @@ pub fn explore_trajectory(
     let exploration_time = start_time.elapsed();
     let unique_states = visited.len();
 
-    if !reached_cycle {
-        println!("   ⏸️  Reached max iterations ({}) without finding cycle", max_iterations);
-        println!("   Visited {} unique states", unique_states);
-    }
+    if verbose {
+        if !reached_cycle {
+            println!("   ⏸️  Reached max iterations ({}) without finding cycle", max_iterations);
+            println!("   Visited {} unique states", unique_states);
+        }
 
-    println!("✅ Trajectory exploration complete!");
-    println!("   Unique states visited: {}", unique_states);
-    if let Some(p) = period {
-        println!("   Period: {} iterations", p);
-        println!("   Transient: {} iterations", transient_length);
+        println!("✅ Trajectory exploration complete!");
+        println!("   Unique states visited: {}", unique_states);
+        if let Some(p) = period {
+            println!("   Period: {} iterations", p);
+            println!("   Transient: {} iterations", transient_length);
+        }
+        println!("   Time: {:.2}s", exploration_time.as_secs_f64());
     }
-    println!("   Time: {:.2}s", exploration_time.as_secs_f64());
 
     // Get move names
     let move_names: Vec<String> = move_sequence
@@ -0,0 +1,316 @@
+use hyperpuzzle_core::Puzzle;
+use serde::Serialize;
+use std::fs;
+use std::sync::Arc;
+
+use crate::orbit;
+
+/// Facet letters: (letter, axis, sign). Axes are x = R/L, y = U/D, z = F/B, w = O/I.
+const FACETS: [(char, usize, i32); 8] = [
+    ('R', 0, 1), ('L', 0, -1),
+    ('U', 1, 1), ('D', 1, -1),
+    ('F', 2, 1), ('B', 2, -1),
+    ('O', 3, 1), ('I', 3, -1),
+];
+
+/// Every outer-layer twist of a puzzle as a permutation of its pieces
+///
+/// Each twist is a quarter turn of the pieces on one facet in one
+/// coordinate plane. `obsv` loads this table to compute periods exactly,
+/// from the composed permutation and the rotation each piece accumulates,
+/// without walking the trajectory.
+#[derive(Debug, Serialize)]
+pub struct TwistTable {
+    pub puzzle_id: String,
+    pub puzzle_name: String,
+    pub dimension: usize,
+    pub layers: usize,
+
+    /// Piece positions on the integer grid {-(layers-1), ..., layers-1} (step 2)
+    pub pieces: Vec<Vec<i32>>,
+    pub twists: Vec<TwistPermutation>,
+}
+
+/// A single twist in a `TwistTable`
+#[derive(Debug, Serialize)]
+pub struct TwistPermutation {
+    pub name: String,
+    pub reverse: String,
+
+    /// Facet the twist grips: pieces with `position[axis] == sign * (layers - 1)`
+    pub axis: usize,
+    pub sign: i32,
+
+    /// Rotation plane and direction: +1 turns `plane[0]` toward `plane[1]`, -1 the other way
+    pub plane: [usize; 2],
+    pub direction: i32,
+
+    /// `permutation[i]` is the index of the position piece `i` moves to
+    pub permutation: Vec<usize>,
+}
+
+/// Sign of the permutation that sorts `axes`
+fn parity(axes: &[usize]) -> i32 {
+    let mut sign = 1;
+    for i in 0..axes.len() {
+        for j in i + 1..axes.len() {
+            if axes[i] > axes[j] {
+                sign = -sign;
+            }
+        }
+    }
+    sign
+}
+
+fn facet(letter: char, dimension: usize) -> Option<(usize, i32)> {
+    FACETS
+        .iter()
+        .find(|(l, axis, _)| *l == letter && *axis < dimension)
+        .map(|&(_, axis, sign)| (axis, sign))
+}
+
+/// Geometry of a quarter twist from its name: (axis, sign, plane, direction)
+///
+/// 3D twists are named by their facet ("R"); 4D twists by their facet and the
+/// facet its pieces turn toward ("FR"). A trailing prime reverses the
+/// direction. Returns None for any other name.
+pub fn twist_geometry(name: &str, dimension: usize) -> Option<(usize, i32, [usize; 2], i32)> {
+    if let Some(base) = name.strip_suffix('\'').or_else(|| name.strip_suffix('\u{2019}')) {
+        let (axis, sign, plane, direction) = twist_geometry(base, dimension)?;
+        return Some((axis, sign, plane, -direction));
+    }
+
+    let letters: Vec<char> = name.chars().collect();
+    match (dimension, letters.as_slice()) {
+        (3, &[g]) => {
+            let (a, s) = facet(g, 3)?;
+            let others: Vec<usize> = (0..3).filter(|&k| k != a).collect();
+            let plane = [others[0], others[1]];
+            Some((a, s, plane, -s * parity(&[a, plane[0], plane[1]])))
+        }
+        (4, &[g, h]) => {
+            let (a, s) = facet(g, 4)?;
+            let (b, t) = facet(h, 4)?;
+            if a == b {
+                return None;
+            }
+            let others: Vec<usize> = (0..4).filter(|&k| k != a && k != b).collect();
+            let plane = [others[0], others[1]];
+            Some((a, s, plane, -s * t * parity(&[a, b, plane[0], plane[1]])))
+        }
+        _ => None,
+    }
+}
+
+/// Outer pieces of an n^dimension cube, as positions on the step-2 integer grid
+fn cube_pieces(dimension: usize, layers: usize) -> Vec<Vec<i32>> {
+    let outer = layers as i32 - 1;
+    let coords: Vec<i32> = (0..layers as i32).map(|i| 2 * i - outer).collect();
+
+    let mut pieces = vec![vec![]];
+    for _ in 0..dimension {
+        pieces = pieces
+            .into_iter()
+            .flat_map(|p| {
+                coords.iter().map(move |&c| {
+                    let mut q = p.clone();
+                    q.push(c);
+                    q
+                })
+            })
+            .collect();
+    }
+    pieces.retain(|p| p.iter().any(|c| c.abs() == outer));
+    pieces
+}
+
+/// Build the twist table for a cube-family puzzle (ft_cube:N, ft_hypercube:N)
+///
+/// Twists whose names are not quarter turns ("R", "R'", "FR") are left out.
+pub fn twist_table(puzzle: &Arc<Puzzle>) -> Result<TwistTable, String> {
+    let dimension = orbit::puzzle_dimension(puzzle);
+    let layers: usize = puzzle
+        .meta
+        .id
+        .rsplit(':')
+        .next()
+        .and_then(|n| n.parse().ok())
+        .filter(|&n| n >= 2)
+        .ok_or_else(|| format!("Cannot determine layer count of '{}'", puzzle.meta.id))?;
+
+    let pieces = cube_pieces(dimension, layers);
+    let outer = layers as i32 - 1;
+
+    let mut twists = Vec::new();
+    for (twist_id, name_spec) in puzzle.twists.names.iter() {
+        let name = name_spec.preferred.clone();
+        let Some((axis, sign, plane, direction)) = twist_geometry(&name, dimension) else {
+            continue;
+        };
+
+        let reverse = puzzle.twists.twists.get(twist_id)
+            .and_then(|twist| puzzle.twists.names.get(twist.reverse))
+            .map(|ns| ns.preferred.clone())
+            .map_err(|e| format!("No reverse for twist '{}': {:?}", name, e))?;
+
+        let permutation = pieces
+            .iter()
+            .enumerate()
+            .map(|(i, p)| {
+                if p[axis] != sign * outer {
+                    return i;
+                }
+                let mut q = p.clone();
+                let (c, d) = (q[plane[0]], q[plane[1]]);
+                if direction > 0 {
+                    q[plane[0]] = -d;
+                    q[plane[1]] = c;
+                } else {
+                    q[plane[0]] = d;
+                    q[plane[1]] = -c;
+                }
+                pieces.iter().position(|r| *r == q).expect("rotation maps pieces to pieces")
+            })
+            .collect();
+
+        twists.push(TwistPermutation { name, reverse, axis, sign, plane, direction, permutation });
+    }
+
+    if twists.is_empty() {
+        return Err(format!("No quarter twists recognized for '{}'", puzzle.meta.id));
+    }
+
+    Ok(TwistTable {
+        puzzle_id: puzzle.meta.id.clone(),
+        puzzle_name: puzzle.meta.name.clone(),
+        dimension,
+        layers,
+        pieces,
+        twists,
+    })
+}
+
+impl TwistTable {
+    /// Export the table as JSON to a file, or to stdout if `path` is "-"
+    pub fn export_json(&self, path: &str) -> Result<(), Box<dyn std::error::Error>> {
+        if path == "-" {
+            println!("{}", serde_json::to_string(self)?);
+        } else {
+            fs::write(path, serde_json::to_string(self)?)?;
+        }
+        Ok(())
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use hyperpuzzle::{catalog, load_global_catalog};
+
+    #[test]
+    fn test_twist_geometry() {
+        // R turns F toward U; U turns R toward F
+        assert_eq!(twist_geometry("R", 3), Some((0, 1, [1, 2], -1)));
+        assert_eq!(twist_geometry("U", 3), Some((1, 1, [0, 2], 1)));
+        assert_eq!(twist_geometry("FR", 4), Some((2, 1, [1, 3], -1)));
+        assert_eq!(twist_geometry("R'", 3), Some((0, 1, [1, 2], 1)));
+
+        assert_eq!(twist_geometry("FF", 4), None);
+        assert_eq!(twist_geometry("FB", 4), None);
+        assert_eq!(twist_geometry("O", 3), None);
+        assert_eq!(twist_geometry("R", 4), None);
+    }
+
+    #[test]
+    fn test_cube_pieces() {
+        assert_eq!(cube_pieces(3, 2).len(), 8);
+        assert_eq!(cube_pieces(3, 3).len(), 26);
+        assert_eq!(cube_pieces(4, 3).len(), 80);
+    }
+
+    /// Periods found by walking trajectories (docs/PERIOD_DISCOVERIES.md);
+    /// obsv's PermutationEngine checks the same list as REFERENCE_PERIODS
+    const KNOWN_PERIODS: [(&str, usize); 10] = [
+        ("FR", 8),
+        ("FR,UF", 10080),
+        ("OF,OU", 6),
+        ("OF,OU,OR", 4),
+        ("FR,UF,OR", 2160),
+        ("FR,OR,UF", 7920),
+        ("FR,UF,OR,RO", 41496),
+        ("FR,UF,FU,RF", 1680),
+        ("FR,UO,UF,OR,RO", 27720),
+        ("FR,UF,UR,FO,LU", 720),
+    ];
+
+    fn lcm(a: usize, b: usize) -> usize {
+        let (mut x, mut y) = (a, b);
+        while y != 0 {
+            (x, y) = (y, x % y);
+        }
+        a / x * b
+    }
+
+    #[test]
+    fn test_permutations_match_trajectories() {
+        load_global_catalog();
+        let puzzle = catalog()
+            .build_blocking::<Puzzle>("ft_hypercube:3")
+            .expect("Failed to load puzzle");
+        let table = twist_table(&puzzle).expect("Failed to build twist table");
+
+        for (sequence, known) in KNOWN_PERIODS {
+            let moves = crate::moves::parse_moves(&puzzle, sequence).expect("Failed to parse moves");
+            let stats = orbit::explore_trajectory(
+                &puzzle, puzzle.new_solved_state(), &moves, 100_000, 4, false,
+            );
+            assert_eq!(stats.period, Some(known), "trajectory period of {}", sequence);
+
+            // One iteration as a single permutation of positions
+            let mut composed: Vec<usize> = (0..table.pieces.len()).collect();
+            for name in sequence.split(',') {
+                let twist = table.twists.iter().find(|t| t.name == name)
+                    .expect("Twist missing from table");
+                composed = composed.iter().map(|&p| twist.permutation[p]).collect();
+            }
+
+            // Pieces return to place only after a whole number of permutation
+            // cycles, so every cycle length must divide the true period (a
+            // wrong axis or direction convention changes the cycles)
+            let mut seen = vec![false; composed.len()];
+            let mut order = 1;
+            for start in 0..composed.len() {
+                let (mut length, mut p) = (0, start);
+                while !seen[p] {
+                    seen[p] = true;
+                    p = composed[p];
+                    length += 1;
+                }
+                if length > 0 {
+                    order = lcm(order, length);
+                }
+            }
+            assert_eq!(known % order, 0, "permutation order {} of {}", order, sequence);
+        }
+    }
+
+    #[test]
+    fn test_reverse_undoes_twist() {
+        load_global_catalog();
+        let puzzle = catalog()
+            .build_blocking::<Puzzle>("ft_hypercube:3")
+            .expect("Failed to load puzzle");
+
+        let table = twist_table(&puzzle).expect("Failed to build twist table");
+        assert_eq!(table.pieces.len(), 80);
+        assert_eq!(table.twists.len(), 48);
+
+        for twist in &table.twists {
+            let reverse = table.twists.iter().find(|t| t.name == twist.reverse)
+                .expect("Reverse twist missing from table");
+            for i in 0..table.pieces.len() {
+                assert_eq!(reverse.permutation[twist.permutation[i]], i);
+            }
+        }
+    }
+}
@@ -0,0 +1,124 @@
+use hyperpuzzle::{catalog, load_global_catalog};
+use hyperpuzzle_core::Puzzle as HyperPuzzle;
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use pyo3::types::PyDict;
+use std::sync::{Arc, Once};
+
+use crate::orbit::TrajectoryStats;
+use crate::{moves, orbit};
+
+static LOAD_CATALOG: Once = Once::new();
+
+/// A loaded puzzle, built once and reused across trajectory calls
+#[pyclass(frozen, module = "ctrl")]
+pub struct Puzzle {
+    inner: Arc<HyperPuzzle>,
+    dimension: usize,
+}
+
+#[pymethods]
+impl Puzzle {
+    #[new]
+    #[pyo3(signature = (puzzle_id = "ft_hypercube:3"))]
+    fn new(py: Python<'_>, puzzle_id: &str) -> PyResult<Self> {
+        let inner = py
+            .allow_threads(|| {
+                LOAD_CATALOG.call_once(load_global_catalog);
+                catalog()
+                    .build_blocking::<HyperPuzzle>(puzzle_id)
+                    .map_err(|e| format!("Error loading puzzle '{}': {:?}", puzzle_id, e))
+            })
+            .map_err(PyValueError::new_err)?;
+        let dimension = orbit::puzzle_dimension(&inner);
+        Ok(Self { inner, dimension })
+    }
+
+    #[getter]
+    fn id(&self) -> String {
+        self.inner.meta.id.clone()
+    }
+
+    #[getter]
+    fn name(&self) -> String {
+        self.inner.meta.name.clone()
+    }
+
+    #[getter]
+    fn dimension(&self) -> usize {
+        self.dimension
+    }
+
+    fn __repr__(&self) -> String {
+        format!("Puzzle('{}')", self.inner.meta.id)
+    }
+}
+
+/// Validate a move sequence, returning the puzzle's names for each twist
+///
+/// Raises ValueError for unknown moves.
+#[pyfunction]
+fn parse_moves(puzzle: &Puzzle, moves: Vec<String>) -> PyResult<Vec<String>> {
+    let parsed = moves::parse_moves(&puzzle.inner, &moves.join(",")).map_err(PyValueError::new_err)?;
+    Ok(parsed
+        .iter()
+        .map(|twist| {
+            puzzle.inner.twists.names.get(twist.transform)
+                .map(|ns| ns.preferred.clone())
+                .unwrap_or_else(|_| format!("?{}", twist.transform.0))
+        })
+        .collect())
+}
+
+/// Follow the trajectory of a move sequence from the solved state
+///
+/// Returns the same fields as ctrl's JSON output. The GIL is released while
+/// the trajectory is walked, so Python threads can run trajectories in parallel.
+#[pyfunction]
+#[pyo3(signature = (puzzle, moves, max_iterations = 100000))]
+fn trajectory<'py>(
+    py: Python<'py>,
+    puzzle: &Puzzle,
+    moves: Vec<String>,
+    max_iterations: usize,
+) -> PyResult<Bound<'py, PyDict>> {
+    let parsed = moves::parse_moves(&puzzle.inner, &moves.join(",")).map_err(PyValueError::new_err)?;
+
+    let stats = py.allow_threads(|| {
+        orbit::explore_trajectory(
+            &puzzle.inner,
+            puzzle.inner.new_solved_state(),
+            &parsed,
+            max_iterations,
+            puzzle.dimension,
+            false,
+        )
+    });
+
+    stats_to_dict(py, &stats)
+}
+
+/// Convert trajectory statistics to a dict with ctrl's JSON field names
+fn stats_to_dict<'py>(py: Python<'py>, stats: &TrajectoryStats) -> PyResult<Bound<'py, PyDict>> {
+    let dict = PyDict::new_bound(py);
+    dict.set_item("puzzle_id", &stats.puzzle_id)?;
+    dict.set_item("puzzle_name", &stats.puzzle_name)?;
+    dict.set_item("dimension", stats.dimension)?;
+    dict.set_item("move_sequence", &stats.move_sequence)?;
+    dict.set_item("period", stats.period)?;
+    dict.set_item("transient_length", stats.transient_length)?;
+    dict.set_item("unique_states_visited", stats.unique_states_visited)?;
+    dict.set_item("max_iterations", stats.max_iterations)?;
+    dict.set_item("reached_cycle", stats.reached_cycle)?;
+    dict.set_item("exploration_time_ms", stats.exploration_time_ms)?;
+    Ok(dict)
+}
+
+/// In-process interface to ctrl's trajectory exploration
+#[pymodule]
+fn ctrl(m: &Bound<'_, PyModule>) -> PyResult<()> {
+    m.add_class::<Puzzle>()?;
+    m.add_function(wrap_pyfunction!(parse_moves, m)?)?;
+    m.add_function(wrap_pyfunction!(trajectory, m)?)?;
+    Ok(())
+}
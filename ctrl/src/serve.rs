@@ -0,0 +1,77 @@
+use hyperpuzzle_core::Puzzle;
+use serde::Deserialize;
+use serde_json::{json, Value};
+use std::io::{self, BufRead, Write};
+use std::sync::Arc;
+
+use crate::{moves, orbit};
+
+/// A single sequence request, read as one JSON line from stdin
+#[derive(Debug, Deserialize)]
+pub struct SequenceRequest {
+    /// Opaque request identifier, echoed back in the response
+    #[serde(default)]
+    pub id: Value,
+
+    /// Move sequence (comma-separated, e.g., "FR,UF")
+    pub moves: String,
+
+    /// Maximum iterations to follow trajectory
+    pub max_iterations: usize,
+}
+
+/// Evaluate a single request against an already-loaded puzzle
+///
+/// Returns the trajectory statistics as JSON, or an error message if the
+/// move sequence could not be parsed.
+pub fn handle_request(puzzle: &Arc<Puzzle>, dimension: usize, request: &SequenceRequest) -> Value {
+    let moves = match moves::parse_moves(puzzle, &request.moves) {
+        Ok(m) => m,
+        Err(e) => return json!({ "id": request.id, "error": e }),
+    };
+
+    let stats = orbit::explore_trajectory(
+        puzzle,
+        puzzle.new_solved_state(),
+        &moves,
+        request.max_iterations,
+        dimension,
+        false,
+    );
+
+    match serde_json::to_value(&stats) {
+        Ok(mut value) => {
+            value["id"] = request.id.clone();
+            value
+        }
+        Err(e) => json!({ "id": request.id, "error": e.to_string() }),
+    }
+}
+
+/// Run the long-lived server loop
+///
+/// Reads one JSON request per line from stdin and writes one compact JSON
+/// response per line to stdout, until stdin is closed. The puzzle is loaded
+/// once by the caller and reused for every request.
+pub fn serve(puzzle: &Arc<Puzzle>, dimension: usize) -> io::Result<()> {
+    let stdin = io::stdin();
+    let stdout = io::stdout();
+    let mut out = stdout.lock();
+
+    for line in stdin.lock().lines() {
+        let line = line?;
+        if line.trim().is_empty() {
+            continue;
+        }
+
+        let response = match serde_json::from_str::<SequenceRequest>(&line) {
+            Ok(request) => handle_request(puzzle, dimension, &request),
+            Err(e) => json!({ "id": Value::Null, "error": format!("Invalid request: {}", e) }),
+        };
+
+        writeln!(out, "{}", response)?;
+        out.flush()?;
+    }
+
+    Ok(())
+}
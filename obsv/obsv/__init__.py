@@ -4,14 +4,44 @@ obsv - Analysis and observation tools for 4D hypercube trajectory exploration.
 
 __version__ = "0.1.0"
 
-from .ctrl_runner import CtrlRunner, MoveGenerator
+from .ctrl_runner import CtrlRunner, ExtensionRunner, MoveGenerator, make_runner
+from .async_runner import AsyncCtrlRunner
+from .permutation import PermutationEngine
+from .cache import CachedRunner, ResultCache
+from .journal import RunJournal
+from .symmetry import TwistSymmetry
+from .landscape import PeriodLandscape
+from .stats import PeriodStats, QuantileSketch, RunningMoments, SequentialSignTest
+from .campaign import ResultShard, read_shard, run_campaign
 from .analyze import analyze_results
-from .lyapunov import LyapunovAnalyzer, LyapunovResult
+from .lyapunov import EditSpectrum, LyapunovAnalyzer, LyapunovResult, LyapunovSweepResult
+from .result_table import LyapunovTable
+from .perturbation_graph import PerturbationGraph
 
 __all__ = [
     "CtrlRunner",
+    "ExtensionRunner",
+    "AsyncCtrlRunner",
+    "PermutationEngine",
+    "ResultCache",
+    "CachedRunner",
+    "RunJournal",
+    "TwistSymmetry",
+    "PeriodLandscape",
+    "RunningMoments",
+    "PeriodStats",
+    "QuantileSketch",
+    "SequentialSignTest",
+    "ResultShard",
+    "read_shard",
+    "run_campaign",
     "MoveGenerator",
+    "make_runner",
     "analyze_results",
     "LyapunovAnalyzer",
-    "LyapunovResult"
+    "LyapunovResult",
+    "LyapunovSweepResult",
+    "EditSpectrum",
+    "LyapunovTable",
+    "PerturbationGraph"
 ]
\ No newline at end of file
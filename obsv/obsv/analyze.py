@@ -9,6 +9,8 @@ from pathlib import Path
 from collections import defaultdict, Counter
 import sys
 
+from .stats import PeriodStats
+
 def prime_factorization(n):
     """Return prime factorization as dict {prime: power}"""
     if n <= 1:
@@ -40,7 +42,8 @@ def analyze_results():
 
     # Collect data
     by_length = defaultdict(list)
-    all_periods = []
+    stats = PeriodStats()
+    period_counts = Counter()
     all_factorizations = []
 
     for file in json_files:
@@ -60,7 +63,8 @@ def analyze_results():
                     'time': data.get('exploration_time_ms', 0) / 1000
                 })
 
-                all_periods.append(period)
+                stats.add(length, period)
+                period_counts[period] += 1
                 all_factorizations.append(prime_factorization(period))
         except Exception as e:
             print(f"Error reading {file}: {e}")
@@ -69,11 +73,11 @@ def analyze_results():
     print("="*70)
     print("OVERALL STATISTICS")
     print("="*70)
-    print(f"Total sequences analyzed: {len(all_periods)}")
-    print(f"Min period: {min(all_periods)}")
-    print(f"Max period: {max(all_periods)}")
-    print(f"Mean period: {sum(all_periods) / len(all_periods):.1f}")
-    print(f"Median period: {sorted(all_periods)[len(all_periods)//2]}")
+    print(f"Total sequences analyzed: {stats.count}")
+    print(f"Min period: {stats.min}")
+    print(f"Max period: {stats.max}")
+    print(f"Mean period: {stats.overall.mean:.1f}")
+    print(f"Median period: {stats.sketch.quantile(0.5):.0f}")
     print()
 
     # By sequence length
@@ -109,8 +113,8 @@ def analyze_results():
     ]
 
     for low, high, label in ranges:
-        count = sum(1 for p in all_periods if low <= p <= high)
-        pct = 100 * count / len(all_periods)
+        count = sum(n for p, n in period_counts.items() if low <= p <= high)
+        pct = 100 * count / stats.count
         print(f"  {label:15s}: {count:3d} sequences ({pct:5.1f}%)")
 
     # Common periods
@@ -118,7 +122,6 @@ def analyze_results():
     print("MOST COMMON PERIODS")
     print("="*70)
 
-    period_counts = Counter(all_periods)
     for period, count in period_counts.most_common(10):
         print(f"  {period:>8,}: appears {count:3d} times")
 
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Asyncio interface to the CTRL Rust program.
+
+One event loop can keep hundreds of ctrl processes in flight across a whole
+batch, bounded by a semaphore, without holding an OS thread per subprocess.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import threading
+import weakref
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from .ctrl_runner import CtrlRunner
+
+
+def _kill_process_group(process: asyncio.subprocess.Process):
+    """Kill a ctrl process and anything it spawned (it leads its own session)."""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+class AsyncCtrlRunner:
+    """Asyncio runner for the CTRL trajectory exploration tool."""
+
+    def __init__(self, ctrl_path: Optional[Path] = None, max_concurrency: int = 32):
+        """Initialize the runner.
+
+        Args:
+            ctrl_path: Path to ctrl directory. Defaults to ../../ctrl relative to this file.
+            max_concurrency: Maximum number of ctrl processes running at once
+        """
+        self._sync_runner = CtrlRunner(ctrl_path)
+        self.ctrl_path = self._sync_runner.ctrl_path
+        self.max_concurrency = max_concurrency
+        # One semaphore per event loop: a semaphore is bound to the loop it
+        # is first used on, and a runner may serve several asyncio.run calls
+        self._semaphores: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._binary: Optional[Path] = None
+        self._build_lock = threading.Lock()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Concurrency semaphore of the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def _build(self) -> Path:
+        """Build ctrl on first use and cache the binary path."""
+        with self._build_lock:
+            if self._binary is None:
+                self._binary = self._sync_runner.build()
+            return self._binary
+
+    async def run_sequence(
+        self,
+        moves: List[str],
+        max_iterations: int = 100000,
+        timeout: Optional[float] = 120
+    ) -> Dict:
+        """Run a move sequence and return results.
+
+        If the task is cancelled or times out, the ctrl process group is killed
+        before control returns.
+
+        Args:
+            moves: List of move notations (e.g., ["FR", "UF", "OR"])
+            max_iterations: Maximum iterations before giving up
+            timeout: Timeout in seconds for this sequence, not counting time
+                spent waiting for a concurrency slot (None = no limit)
+
+        Returns:
+            Dictionary containing period, states visited, time, etc.
+
+        Raises:
+            RuntimeError: If CTRL execution fails
+            TimeoutError: If execution exceeds timeout
+            OSError: If the ctrl binary cannot be started
+        """
+        # Build once up front; cargo is never on the per-sequence path
+        binary = self._binary
+        if binary is None:
+            binary = await asyncio.to_thread(self._build)
+
+        async with self._semaphore():
+            process = await asyncio.create_subprocess_exec(
+                str(binary),
+                "--puzzle", CtrlRunner.PUZZLE_ID,
+                "--moves", ",".join(moves),
+                "--max-iterations", str(max_iterations),
+                "--output", "-",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True
+            )
+
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+            except TimeoutError:
+                raise TimeoutError(
+                    f"CTRL execution timed out after {timeout}s for sequence: {moves}"
+                ) from None
+            finally:
+                if process.returncode is None:
+                    _kill_process_group(process)
+                    await process.wait()
+
+        if process.returncode != 0:
+            error_msg = stderr.decode().strip() or "Unknown error"
+            raise RuntimeError(f"CTRL failed for sequence {moves}: {error_msg}")
+
+        try:
+            return json.loads(stdout)
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"Invalid JSON from CTRL for sequence {moves}: {e}")
+
+    async def iter_sequences(
+        self,
+        sequences: List[List[str]],
+        max_iterations: int = 100000,
+        timeout: Optional[float] = 120
+    ) -> AsyncIterator[Tuple[int, Union[Dict, Exception]]]:
+        """Run many sequences concurrently, yielding results as they finish.
+
+        Leaving the loop early cancels (and kills) everything still running.
+
+        Yields:
+            (index, result) pairs in completion order, where result is the
+            result dictionary or the exception raised for that sequence
+        """
+        async def run_indexed(index: int, moves: List[str]):
+            try:
+                return index, await self.run_sequence(moves, max_iterations, timeout)
+            except (TimeoutError, RuntimeError, OSError) as e:
+                return index, e
+
+        tasks = [asyncio.create_task(run_indexed(i, seq)) for i, seq in enumerate(sequences)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run_many(
+        self,
+        sequences: List[List[str]],
+        max_iterations: int = 100000,
+        timeout: Optional[float] = 120
+    ) -> List[Union[Dict, Exception]]:
+        """Run many sequences concurrently.
+
+        Returns:
+            One entry per sequence, in input order: the result dictionary, or
+            the TimeoutError/RuntimeError/OSError raised for that sequence
+        """
+        results: List[Union[Dict, Exception]] = [None] * len(sequences)
+        async for index, result in self.iter_sequences(sequences, max_iterations, timeout):
+            results[index] = result
+        return results
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache of sequence evaluations.
+
+Results are stored in SQLite (WAL mode, so several processes can read and
+write the same cache at once), keyed by puzzle, canonical move sequence,
+evaluation engine and iteration budget. Every evaluation is deterministic, so
+a cached result is exactly what the engine would return again; rotations and
+inverses of a sequence share one entry (see canonical.py).
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .canonical import canonical_key, normalize_move
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / "logs" / "results_cache.sqlite"
+
+
+class ResultCache:
+    """SQLite-backed result cache, safe for concurrent threads and processes."""
+
+    def __init__(self, path: Optional[Path] = None, timeout: float = 30.0):
+        """Open (or create) the cache.
+
+        Args:
+            path: SQLite database file (default: logs/results_cache.sqlite)
+            timeout: Seconds to wait on a lock held by another writer
+        """
+        self.path = Path(path) if path is not None else DEFAULT_CACHE_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self._local = threading.local()
+        # Every thread's connection, so close() can reach them all
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                puzzle_id TEXT NOT NULL,
+                sequence TEXT NOT NULL,
+                engine TEXT NOT NULL,
+                max_iterations INTEGER NOT NULL,
+                period INTEGER,
+                reached_cycle INTEGER NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (puzzle_id, sequence, engine, max_iterations)
+            ) WITHOUT ROWID
+        """)
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections are not shareable)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Only this thread uses it, but close() may run on another thread
+            conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def get(self, puzzle_id: str, moves: List[str], engine: str,
+            max_iterations: int) -> Optional[Dict]:
+        """Look up a cached result, or None if no sequence in this class was stored.
+
+        The result may have been computed for a rotation or inverse of `moves`.
+        """
+        row = self._connection().execute(
+            "SELECT result FROM results "
+            "WHERE puzzle_id = ? AND sequence = ? AND engine = ? AND max_iterations = ?",
+            (puzzle_id, canonical_key(moves), engine, max_iterations)
+        ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, puzzle_id: str, moves: List[str], engine: str,
+            max_iterations: int, result: Dict):
+        """Store a result (replacing any previous entry for the same key)."""
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (puzzle_id, canonical_key(moves), engine, max_iterations,
+                 result.get("period"), int(bool(result.get("reached_cycle"))),
+                 json.dumps(result), time.time())
+            )
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        """Close every thread's connection (threads reconnect on next use)."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+
+
+class CachedRunner:
+    """Wrap any runner so evaluations are served from a ResultCache when possible.
+
+    The cache key includes the runner's ENGINE and ENGINE_VERSION, so results
+    from different engines (or after an engine change) never mix.
+    """
+
+    def __init__(self, runner, cache: Optional[ResultCache] = None):
+        """Wrap a runner.
+
+        Args:
+            runner: Object with a CtrlRunner-compatible run_sequence method
+            cache: Cache to consult (default: a ResultCache at the default path)
+        """
+        self.runner = runner
+        self.cache = cache if cache is not None else ResultCache()
+        self.puzzle_id = getattr(runner, "puzzle_id", None) or runner.PUZZLE_ID
+        self.engine = f"{runner.ENGINE}@{runner.ENGINE_VERSION}"
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()  # run_sequence is called from thread pools
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getattr__(self, name):
+        # Everything else (build, run_batch, ...) goes to the wrapped runner
+        if name == "runner":
+            raise AttributeError(name)
+        return getattr(self.runner, name)
+
+    def run_sequence(
+        self,
+        moves: List[str],
+        max_iterations: int = 100000,
+        output_file: Optional[Path] = None,
+        timeout: int = 120
+    ) -> Dict:
+        """Run a move sequence, returning the cached result if there is one.
+
+        Same interface as CtrlRunner.run_sequence. A result cached for any
+        rotation or inverse of the sequence is reused. Failed evaluations are
+        not cached.
+        """
+        result = self.cache.get(self.puzzle_id, moves, self.engine, max_iterations)
+        if result is not None:
+            with self._lock:
+                self.hits += 1
+            # The entry may belong to an equivalent sequence; report this one
+            result["move_sequence"] = [normalize_move(move) for move in moves]
+            if output_file is not None:
+                output_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(output_file, 'w') as f:
+                    json.dump(result, f, indent=2)
+            return result
+
+        with self._lock:
+            self.misses += 1
+        result = self.runner.run_sequence(moves, max_iterations, output_file, timeout)
+        self.cache.put(self.puzzle_id, moves, self.engine, max_iterations, result)
+        return result
+
+    def close(self):
+        """Close the wrapped runner and the cache."""
+        self.runner.close()
+        self.cache.close()
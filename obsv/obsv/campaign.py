@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Streaming random-sequence campaigns.
+
+A campaign is a generator pipeline: sample random sequences a chunk at a
+time, evaluate each chunk, and sink the results into a single shard file
+while folding them into running statistics. Nothing outlives its chunk, so
+memory stays constant however many sequences are tested, and the output is
+one file instead of one JSON file per sequence.
+
+Shards are JSON Lines (one compact record per sequence) or Parquet (one row
+group per chunk, requires pyarrow); the format follows the file suffix.
+read_shard streams either back as result-shaped dicts.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .ctrl_runner import MoveGenerator
+from .stats import PeriodStats
+
+FORMATS = (".jsonl", ".parquet")
+
+# Default chunk sizes: vectorized runners amortize one call over a large
+# chunk, while per-sequence runners should report progress and flush the
+# shard every few thousand runs
+CHUNK_SIZE = 4096
+BULK_CHUNK_SIZE = 65536
+
+
+def _shard_format(path: Path) -> str:
+    """Shard format from the file suffix.
+
+    Raises:
+        ValueError: If the suffix is not .jsonl or .parquet
+    """
+    suffix = Path(path).suffix
+    if suffix not in FORMATS:
+        raise ValueError(f"Unknown shard format '{suffix}' (use {' or '.join(FORMATS)})")
+    return suffix
+
+
+class ResultShard:
+    """Append-only sink for campaign records (move sequence and period)."""
+
+    def __init__(self, path: Path):
+        """Create (or truncate) a shard.
+
+        Args:
+            path: Output file; .jsonl or .parquet
+
+        Raises:
+            ValueError: If the suffix is not .jsonl or .parquet
+            ImportError: For .parquet if pyarrow is not installed
+        """
+        self.path = Path(path)
+        self.format = _shard_format(self.path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+        if self.format == ".jsonl":
+            self._file = open(self.path, 'w')
+        else:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("Parquet shards require pyarrow: uv add pyarrow") from None
+            self._pa = pa
+            self._schema = pa.schema([("sequence", pa.string()), ("period", pa.int64())])
+            self._writer = pq.ParquetWriter(self.path, self._schema)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, records: List[Dict]):
+        """Append a chunk of records ({"move_sequence": [...], "period": p or None})."""
+        self._write_columns([",".join(r['move_sequence']) for r in records],
+                            [r['period'] for r in records])
+
+    def write_codes(self, codes: np.ndarray, lengths: np.ndarray, periods: np.ndarray,
+                    alphabet: List[str]):
+        """Append a chunk of move codes over `alphabet` (see MoveGenerator.random_codes).
+
+        A period of 0 is written as None.
+        """
+        moves = np.array(alphabet)
+        self._write_columns(
+            [",".join(moves[row[:length]]) for row, length in zip(codes, lengths)],
+            [int(p) if p else None for p in periods.tolist()]
+        )
+
+    def _write_columns(self, sequences: List[str], periods: List[Optional[int]]):
+        if self._file is not None:
+            self._file.writelines(
+                json.dumps({"sequence": seq, "period": period}, separators=(",", ":")) + "\n"
+                for seq, period in zip(sequences, periods)
+            )
+            self._file.flush()
+        else:
+            self._writer.write_table(self._pa.table(
+                {"sequence": sequences, "period": periods}, schema=self._schema
+            ))
+        self.count += len(sequences)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        if self._writer is not None:
+            self._writer.close()
+
+
+def read_shard(path: Path) -> Iterator[Dict]:
+    """Stream a shard's records back as {"move_sequence": [...], "period": p} dicts."""
+    if _shard_format(path) == ".jsonl":
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A campaign killed mid-write leaves at most one partial line
+                    continue
+                yield {"move_sequence": record["sequence"].split(","), "period": record["period"]}
+    else:
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(columns=["sequence", "period"]):
+            for seq, period in zip(batch.column(0).to_pylist(), batch.column(1).to_pylist()):
+                yield {"move_sequence": seq.split(","), "period": period}
+
+
+def sample_chunks(count: int, min_length: int = 2, max_length: int = 6,
+                  chunk_size: int = CHUNK_SIZE, allow_repeats: bool = True,
+                  use_common: bool = True,
+                  seed: Union[int, np.random.Generator, None] = None
+                  ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Draw `count` random sequences, `chunk_size` at a time, as move codes.
+
+    Sequences are i.i.d. draws (MoveGenerator.random_codes), so they may
+    repeat: deduplicating would need a set as large as the campaign, and
+    deduplicating only within a chunk would skew the length distribution
+    toward lengths with more possible sequences.
+
+    Args:
+        count: Total number of sequences
+        min_length: Minimum sequence length
+        max_length: Maximum sequence length
+        chunk_size: Sequences per chunk
+        allow_repeats: Whether to allow consecutive identical moves
+        use_common: Use common moves subset
+        seed: Seed of the whole campaign (default: fresh entropy)
+
+    Yields:
+        (codes, lengths) arrays (see MoveGenerator.random_codes)
+    """
+    rng = np.random.default_rng(seed)
+    start = 0
+    while start < count:
+        codes, lengths = MoveGenerator.random_codes(
+            min(chunk_size, count - start), min_length, max_length,
+            allow_repeats=allow_repeats, use_common=use_common, seed=rng
+        )
+        if not len(codes):
+            return
+        start += len(codes)
+        yield codes, lengths
+
+
+def evaluate_chunks(runner, chunks: Iterable[Tuple[np.ndarray, np.ndarray]],
+                    max_iterations: int = 50000, max_workers: int = 1,
+                    use_common: bool = True
+                    ) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Evaluate each chunk of move codes, yielding one chunk of periods at a time.
+
+    Runners with vectorized `translate`/`periods` (PermutationEngine) get
+    each chunk's code array in a single call, without building move strings;
+    any other runner gets one run_sequence per sequence on a thread pool
+    shared by the whole campaign.
+
+    Yields:
+        (codes, lengths, periods); a period of 0 means the run failed or
+        found no cycle
+    """
+    bulk = getattr(runner, "periods", None)
+    alphabet = MoveGenerator.COMMON_MOVES if use_common else MoveGenerator.MOVES
+
+    def run(seq: List[str]) -> int:
+        try:
+            return runner.run_sequence(seq, max_iterations)['period'] or 0
+        except (TimeoutError, RuntimeError, FileNotFoundError):
+            return 0
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        for codes, lengths in chunks:
+            periods = None
+            if bulk is not None:
+                try:
+                    periods = np.asarray(bulk(runner.translate(codes, alphabet)), dtype=np.int64)
+                except ValueError:
+                    pass
+            if periods is None:
+                sequences = MoveGenerator.decode(codes, lengths, use_common)
+                periods = np.fromiter(executor.map(run, sequences), np.int64, len(sequences))
+            yield codes, lengths, periods
+
+
+def run_campaign(runner, count: int, output: Optional[Path] = None, min_length: int = 2,
+                 max_length: int = 6, max_iterations: int = 50000, chunk_size: Optional[int] = None,
+                 max_workers: int = 1, stats: Optional[PeriodStats] = None,
+                 seed: Optional[int] = None) -> PeriodStats:
+    """Test `count` random sequences in constant memory.
+
+    Args:
+        runner: Runner used to evaluate sequences
+        count: Number of random sequences
+        output: Shard to write every record to (.jsonl or .parquet); records
+            are only summarized if None
+        min_length: Minimum sequence length
+        max_length: Maximum sequence length
+        max_iterations: Max iterations per sequence
+        chunk_size: Sequences sampled and evaluated per step (default:
+            BULK_CHUNK_SIZE for vectorized runners, CHUNK_SIZE otherwise)
+        max_workers: Parallel evaluations for non-vectorized runners
+        stats: Accumulator to fold results into (default: a new one)
+        seed: Seed for reproducible campaigns
+
+    Returns:
+        Running statistics of the campaign's periods
+    """
+    stats = stats if stats is not None else PeriodStats()
+    shard = ResultShard(output) if output is not None else None
+    start_time = time.time()
+    if chunk_size is None:
+        vectorized = getattr(runner, "periods", None) is not None
+        chunk_size = BULK_CHUNK_SIZE if vectorized else CHUNK_SIZE
+
+    chunks = sample_chunks(count, min_length, max_length, chunk_size,
+                           allow_repeats=False,  # More interesting sequences
+                           seed=seed)
+    done = 0
+    try:
+        for codes, lengths, periods in evaluate_chunks(runner, chunks, max_iterations,
+                                                       max_workers):
+            if shard is not None:
+                shard.write_codes(codes, lengths, periods, MoveGenerator.COMMON_MOVES)
+            stats.add_many(lengths, periods)
+            done += len(periods)
+            elapsed = time.time() - start_time
+            median, p99 = stats.sketch.quantiles([0.5, 0.99])
+            print(f"  {done:,}/{count:,} sequences ({done / max(elapsed, 1e-9):,.0f}/s), "
+                  f"median period {median:,.0f}, 99th percentile {p99:,.0f}")
+    finally:
+        if shard is not None:
+            shard.close()
+
+    return stats
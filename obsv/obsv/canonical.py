@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Canonical representatives of move sequences.
+
+Two sequences whose maps are conjugate have the same period (and the same
+trajectory length, since every trajectory is purely periodic):
+
+- Cyclic rotations: applying B,C,A is conjugate to A,B,C (by A).
+- Inversion: the reversed sequence with every move inverted is the inverse
+  map, which has the same order.
+
+Mapping every sequence to one representative of its class lets caches and
+sweeps evaluate each class once.
+"""
+
+from typing import List, Tuple
+
+OPPOSITE = {"R": "L", "L": "R", "U": "D", "D": "U", "F": "B", "B": "F", "O": "I", "I": "O"}
+
+PRIMES = ("'", "’")
+
+
+def inverse_move(move: str) -> str:
+    """Invert a single move.
+
+    A 4D twist "GH" (facet G turning toward H) is undone by turning G toward
+    the opposite of H, so the inverse of "FR" is "FL". 3D twists ("R") are
+    inverted with a prime ("R'"), and a primed move loses its prime.
+    """
+    move = move.strip()
+    if move.endswith(PRIMES):
+        return move[:-1]
+    if len(move) == 2 and move[1] in OPPOSITE:
+        return move[0] + OPPOSITE[move[1]]
+    return move + "'"
+
+
+def normalize_move(move: str) -> str:
+    """Write a move without a prime where the puzzle has a plain name for it ("FR'" -> "FL")."""
+    move = move.strip()
+    if move.endswith(PRIMES) and len(move) == 3:
+        return inverse_move(move[:-1])
+    return move
+
+
+def inverse_sequence(moves: List[str]) -> List[str]:
+    """The sequence that undoes `moves`: reversed, with every move inverted."""
+    return [normalize_move(inverse_move(move)) for move in reversed(moves)]
+
+
+def min_rotation(moves: List[str]) -> Tuple[str, ...]:
+    """Lexicographically smallest cyclic rotation of a sequence."""
+    moves = tuple(moves)
+    if not moves:
+        return moves
+    return min(moves[i:] + moves[:i] for i in range(len(moves)))
+
+
+def canonical_sequence(moves: List[str], invert: bool = True) -> List[str]:
+    """Map a sequence to the representative of its period-preserving class.
+
+    Args:
+        moves: Move sequence
+        invert: Also identify a sequence with its inverse. Turn this off when
+            the quantity of interest is not inversion-invariant (e.g.
+            perturbation statistics drawn from a move pool that is not closed
+            under inversion); rotations alone are always safe.
+
+    Returns:
+        The smallest rotation (of the sequence or, if invert, its inverse)
+    """
+    normalized = [normalize_move(move) for move in moves]
+    best = min_rotation(normalized)
+    if invert:
+        best = min(best, min_rotation(inverse_sequence(normalized)))
+    return list(best)
+
+
+def canonical_key(moves: List[str], invert: bool = True) -> str:
+    """Comma-separated canonical sequence, for use as a cache or dedup key."""
+    return ",".join(canonical_sequence(moves, invert))
@@ -3,26 +3,259 @@
 Interface to the CTRL Rust program for running trajectory experiments.
 """
 
+import hashlib
 import json
+import queue
 import subprocess
 import random
+import threading
 from pathlib import Path
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import List, Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from .cache import CachedRunner
+from .canonical import canonical_key
+
+
+DEFAULT_CTRL_PATH = Path(__file__).parent.parent.parent / "ctrl"
+
+
+@lru_cache(maxsize=None)
+def source_version(ctrl_path: Path = DEFAULT_CTRL_PATH) -> str:
+    """Short content hash of ctrl's sources (src/**/*.rs, Cargo.toml, Cargo.lock).
+
+    Used as the trajectory engine's version in result caches, so rebuilding
+    ctrl from changed sources never serves periods computed by the old code.
+    """
+    ctrl_path = Path(ctrl_path).resolve()
+    files = sorted(ctrl_path.glob("src/**/*.rs"))
+    files += [f for f in (ctrl_path / "Cargo.toml", ctrl_path / "Cargo.lock") if f.exists()]
+    digest = hashlib.sha256()
+    for f in files:
+        digest.update(str(f.relative_to(ctrl_path)).encode())
+        digest.update(f.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class CtrlWorker:
+    """A long-lived CTRL process running in --serve mode.
+
+    The puzzle is loaded once when the process starts; each request is one
+    JSON line on stdin and each response one JSON line on stdout.
+    """
+
+    def __init__(self, binary: Path, puzzle: str):
+        """Start the worker process.
+
+        Args:
+            binary: Path to the compiled ctrl binary
+            puzzle: Puzzle ID to load (e.g., "ft_hypercube:3")
+        """
+        self.process = subprocess.Popen(
+            [str(binary), "--puzzle", puzzle, "--serve"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        self._next_id = 0
+
+        # Responses are read on a background thread so requests can time out
+        self._lines: queue.Queue = queue.Queue()
+        self._reader = threading.Thread(target=self._read_stdout, daemon=True)
+        self._reader.start()
+
+    def _read_stdout(self):
+        """Forward stdout lines to the response queue (None marks EOF)."""
+        for line in self.process.stdout:
+            self._lines.put(line)
+        self._lines.put(None)
+
+    def is_alive(self) -> bool:
+        """Whether the worker process is still running."""
+        return self.process.poll() is None
+
+    def request(self, moves: List[str], max_iterations: int, timeout: int) -> Dict:
+        """Evaluate one move sequence on this worker.
+
+        Raises:
+            RuntimeError: If the worker died or reported an error
+            TimeoutError: If no response arrives within timeout (the worker is killed)
+        """
+        self._next_id += 1
+        request = {
+            "id": self._next_id,
+            "moves": ",".join(moves),
+            "max_iterations": max_iterations,
+        }
+
+        try:
+            self.process.stdin.write(json.dumps(request) + "\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError):
+            raise RuntimeError(f"CTRL worker exited unexpectedly for sequence: {moves}")
+
+        try:
+            line = self._lines.get(timeout=timeout)
+        except queue.Empty:
+            self.close(kill=True)
+            raise TimeoutError(f"CTRL execution timed out after {timeout}s for sequence: {moves}")
+
+        if line is None:
+            raise RuntimeError(f"CTRL worker exited unexpectedly for sequence: {moves}")
+
+        try:
+            response = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"Invalid JSON from CTRL worker: {e}")
+
+        if "error" in response:
+            raise RuntimeError(f"CTRL failed for sequence {moves}: {response['error']}")
+
+        response.pop("id", None)
+        return response
+
+    def close(self, kill: bool = False):
+        """Stop the worker (closing stdin ends its serve loop)."""
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
 
 
 class CtrlRunner:
     """Runner for the CTRL trajectory exploration tool."""
 
-    def __init__(self, ctrl_path: Optional[Path] = None):
+    PUZZLE_ID = "ft_hypercube:3"
+
+    # Identifies the evaluation method in result caches; each instance's
+    # ENGINE_VERSION is the hash of the ctrl sources it builds (source_version)
+    ENGINE = "ctrl-trajectory"
+
+    def __init__(self, ctrl_path: Optional[Path] = None, persistent: bool = False,
+                 pool_size: int = 4):
         """Initialize the runner.
 
         Args:
             ctrl_path: Path to ctrl directory. Defaults to ../../ctrl relative to this file.
+            persistent: Reuse a pool of warm ctrl --serve workers instead of
+                running `cargo run` for every sequence
+            pool_size: Maximum number of workers when persistent=True
         """
         if ctrl_path is None:
             # From obsv/obsv/ctrl_runner.py -> obsv/obsv/ -> obsv/ -> final/ -> final/ctrl/
-            ctrl_path = Path(__file__).parent.parent.parent / "ctrl"
+            ctrl_path = DEFAULT_CTRL_PATH
         self.ctrl_path = ctrl_path.resolve()
+        self.ENGINE_VERSION = source_version(self.ctrl_path)
+
+        self.persistent = persistent
+        self.pool_size = pool_size
+        self._binary: Optional[Path] = None
+        self._idle: queue.Queue = queue.Queue()
+        self._workers: List[CtrlWorker] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def build(self) -> Path:
+        """Build CTRL in release mode (once) and return the binary path.
+
+        Raises:
+            RuntimeError: If the build fails
+        """
+        with self._lock:
+            if self._binary is None:
+                result = subprocess.run(
+                    ["cargo", "build", "--release", "--quiet"],
+                    cwd=self.ctrl_path,
+                    capture_output=True,
+                    text=True
+                )
+                if result.returncode != 0:
+                    error_msg = result.stderr.strip() if result.stderr else "Unknown error"
+                    raise RuntimeError(f"Failed to build CTRL: {error_msg}")
+                self._binary = self.ctrl_path / "target" / "release" / "ctrl"
+        return self._binary
+
+    def _acquire_worker(self) -> CtrlWorker:
+        """Take an idle worker, starting a new one if the pool has room."""
+        binary = self.build()
+
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                if len(self._workers) < self.pool_size:
+                    worker = CtrlWorker(binary, self.PUZZLE_ID)
+                    self._workers.append(worker)
+                    return worker
+
+            # Pool is full: wait for a worker to be released
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def _release_worker(self, worker: CtrlWorker):
+        """Return a worker to the pool, dropping it if it has died."""
+        if worker.is_alive():
+            self._idle.put(worker)
+        else:
+            with self._lock:
+                if worker in self._workers:
+                    self._workers.remove(worker)
+
+    def close(self):
+        """Shut down all persistent workers."""
+        with self._lock:
+            workers, self._workers = self._workers, []
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        for worker in workers:
+            worker.close()
+
+    def export_twists(self, timeout: int = 120) -> Dict:
+        """Export the puzzle's twist table (ctrl --export-twists).
+
+        Returns:
+            Dictionary with the piece positions and, for every quarter twist,
+            its piece permutation and rotation plane
+
+        Raises:
+            RuntimeError: If CTRL execution fails
+        """
+        result = subprocess.run(
+            [str(self.build()), "--puzzle", self.PUZZLE_ID, "--export-twists", "-"],
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+        if result.returncode != 0:
+            error_msg = result.stderr.strip() if result.stderr else "Unknown error"
+            raise RuntimeError(f"CTRL failed to export twists: {error_msg}")
+
+        try:
+            return json.loads(result.stdout)
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"Invalid JSON from CTRL twist export: {e}")
 
     def run_sequence(
         self,
@@ -36,7 +269,8 @@ class CtrlRunner:
         Args:
             moves: List of move notations (e.g., ["FR", "UF", "OR"])
             max_iterations: Maximum iterations before giving up
-            output_file: Optional path to save JSON results
+            output_file: Optional path to save JSON results. Without one, the
+                result is read straight from ctrl's stdout (safe for concurrent calls)
             timeout: Timeout in seconds for the CTRL process (default: 120)
 
         Returns:
@@ -47,21 +281,31 @@ class CtrlRunner:
             TimeoutError: If execution exceeds timeout
             FileNotFoundError: If output file is not created
         """
-        # Default output to logs/temp_result.json
-        if output_file is None:
-            output_file = self.ctrl_path.parent / "obsv" / "logs" / "temp_result.json"
-
-        # Ensure output directory exists
-        output_file.parent.mkdir(parents=True, exist_ok=True)
+        if self.persistent:
+            worker = self._acquire_worker()
+            try:
+                result = worker.request(moves, max_iterations, timeout)
+            finally:
+                self._release_worker(worker)
+
+            if output_file is not None:
+                output_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(output_file, 'w') as f:
+                    json.dump(result, f, indent=2)
+            return result
+
+        # Without an output file, ctrl prints one compact JSON document on stdout
+        if output_file is not None:
+            output_file.parent.mkdir(parents=True, exist_ok=True)
 
         # Build command
         moves_str = ",".join(moves)
         cmd = [
-            "cargo", "run", "--release", "--",
-            "--puzzle", "ft_hypercube:3",
+            "cargo", "run", "--release", "--quiet", "--",
+            "--puzzle", self.PUZZLE_ID,
             "--moves", moves_str,
             "--max-iterations", str(max_iterations),
-            "--output", str(output_file)
+            "--output", str(output_file) if output_file is not None else "-"
         ]
 
         # Run in ctrl directory with timeout
@@ -80,6 +324,12 @@ class CtrlRunner:
             error_msg = result.stderr.strip() if result.stderr else "Unknown error"
             raise RuntimeError(f"CTRL failed for sequence {moves}: {error_msg}")
 
+        if output_file is None:
+            try:
+                return json.loads(result.stdout)
+            except json.JSONDecodeError as e:
+                raise RuntimeError(f"Invalid JSON from CTRL for sequence {moves}: {e}")
+
         # Check if output file was created
         if not output_file.exists():
             raise FileNotFoundError(f"CTRL did not create output file: {output_file}")
@@ -91,6 +341,221 @@ class CtrlRunner:
         except json.JSONDecodeError as e:
             raise RuntimeError(f"Invalid JSON in output file {output_file}: {e}")
 
+    def iter_batch(
+        self,
+        sequences: List[List[str]],
+        max_iterations: int = 100000,
+        threads: Optional[int] = None,
+        timeout: Optional[int] = None
+    ) -> Iterator[Tuple[int, Optional[Dict]]]:
+        """Evaluate many sequences in one ctrl --batch process.
+
+        The puzzle is loaded once and sequences are spread over ctrl's internal
+        thread pool. Results are yielded as soon as each sequence finishes, so
+        the order is completion order, not input order.
+
+        Args:
+            sequences: List of move sequences
+            max_iterations: Maximum iterations per sequence
+            threads: Worker threads inside ctrl (default: all cores)
+            timeout: Timeout in seconds for the whole batch (default: none)
+
+        Yields:
+            (index, result) pairs, where index is the position in `sequences` and
+            result is None if ctrl could not evaluate that sequence (empty
+            sequences are yielded as None first, without running ctrl)
+
+        Raises:
+            RuntimeError: If the ctrl process fails
+            TimeoutError: If the batch exceeds timeout
+        """
+        # ctrl skips blank lines (keeping ids equal to line indices), so an
+        # empty sequence gets no result line of its own
+        for index, seq in enumerate(sequences):
+            if not seq:
+                yield index, None
+        if not any(sequences):
+            return
+
+        cmd = [
+            str(self.build()),
+            "--puzzle", self.PUZZLE_ID,
+            "--batch", "-",
+            "--max-iterations", str(max_iterations),
+        ]
+        if threads is not None:
+            cmd += ["--threads", str(threads)]
+
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+
+        timed_out = threading.Event()
+
+        def kill_on_timeout():
+            timed_out.set()
+            process.kill()
+
+        timer = None
+        if timeout is not None:
+            timer = threading.Timer(timeout, kill_on_timeout)
+            timer.start()
+
+        try:
+            # ctrl reads the whole batch before it starts writing results
+            try:
+                process.stdin.write("\n".join(",".join(seq) for seq in sequences) + "\n")
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+
+            for line in process.stdout:
+                try:
+                    response = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise RuntimeError(f"Invalid JSON from CTRL batch: {e}")
+
+                index = response.pop("id")
+                yield index, (None if "error" in response else response)
+
+            returncode = process.wait()
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+        if timed_out.is_set():
+            raise TimeoutError(f"CTRL batch timed out after {timeout}s ({len(sequences)} sequences)")
+        if returncode != 0:
+            error_msg = process.stderr.read().strip() or "Unknown error"
+            raise RuntimeError(f"CTRL batch failed: {error_msg}")
+
+    def run_batch(
+        self,
+        sequences: List[List[str]],
+        max_iterations: int = 100000,
+        threads: Optional[int] = None,
+        timeout: Optional[int] = None
+    ) -> List[Optional[Dict]]:
+        """Evaluate many sequences in one ctrl --batch process.
+
+        Args:
+            sequences: List of move sequences
+            max_iterations: Maximum iterations per sequence
+            threads: Worker threads inside ctrl (default: all cores)
+            timeout: Timeout in seconds for the whole batch (default: none)
+
+        Returns:
+            Results in the same order as `sequences` (None where ctrl failed)
+        """
+        results: List[Optional[Dict]] = [None] * len(sequences)
+        for index, result in self.iter_batch(sequences, max_iterations, threads, timeout):
+            results[index] = result
+        return results
+
+
+class ExtensionRunner:
+    """In-process runner backed by the compiled `ctrl` Python extension.
+
+    The puzzle is loaded once and each sequence is a direct call into ctrl's
+    explore_trajectory: no subprocess, no JSON file, no catalog reload.
+    Build the extension with `cd ctrl && maturin develop --release`.
+    """
+
+    # Same trajectory walk as the ctrl binary, so results are interchangeable
+    # (the extension is built from the same sources)
+    ENGINE = CtrlRunner.ENGINE
+
+    def __init__(self, puzzle_id: str = CtrlRunner.PUZZLE_ID):
+        """Load the puzzle.
+
+        Args:
+            puzzle_id: Puzzle ID to load (default: ft_hypercube:3)
+
+        Raises:
+            ImportError: If the ctrl extension is not installed
+        """
+        try:
+            import ctrl
+        except ImportError:
+            raise ImportError(
+                "The ctrl Python extension is not installed. "
+                "Build it with: cd ctrl && maturin develop --release"
+            ) from None
+
+        self._ctrl = ctrl
+        self.puzzle_id = puzzle_id
+        self.puzzle = ctrl.Puzzle(puzzle_id)
+        self.ENGINE_VERSION = source_version()
+
+    def run_sequence(
+        self,
+        moves: List[str],
+        max_iterations: int = 100000,
+        output_file: Optional[Path] = None,
+        timeout: int = 120
+    ) -> Dict:
+        """Run a move sequence and return results.
+
+        Same interface as CtrlRunner.run_sequence. The trajectory runs with the
+        GIL released, so threads can evaluate sequences in parallel; `timeout`
+        is accepted for compatibility but cannot interrupt an in-process walk.
+
+        Raises:
+            RuntimeError: If a move cannot be parsed
+        """
+        try:
+            result = self._ctrl.trajectory(self.puzzle, moves, max_iterations)
+        except ValueError as e:
+            raise RuntimeError(f"CTRL failed for sequence {moves}: {e}")
+
+        if output_file is not None:
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_file, 'w') as f:
+                json.dump(result, f, indent=2)
+
+        return result
+
+    def close(self):
+        """No-op; present so all backends can be closed the same way."""
+
+
+BACKENDS = ["cargo", "persistent", "extension", "permutation"]
+
+
+def make_runner(backend: str = "cargo", workers: int = 4, cache: bool = True):
+    """Create a sequence runner for the given backend.
+
+    Args:
+        backend: "cargo" (one `cargo run` per sequence), "persistent" (pool of
+            warm ctrl --serve workers), "extension" (in-process ctrl extension)
+            or "permutation" (exact periods from ctrl's twist permutations)
+        workers: Pool size for the persistent backend
+        cache: Serve repeated evaluations from the on-disk ResultCache
+
+    Returns:
+        An object with a CtrlRunner-compatible run_sequence method
+    """
+    if backend == "cargo":
+        runner = CtrlRunner()
+    elif backend == "persistent":
+        runner = CtrlRunner(persistent=True, pool_size=workers)
+    elif backend == "extension":
+        runner = ExtensionRunner()
+    elif backend == "permutation":
+        from .permutation import PermutationEngine
+        runner = PermutationEngine.from_ctrl()
+    else:
+        raise ValueError(f"Unknown backend: {backend}")
+
+    return CachedRunner(runner) if cache else runner
+
 
 class MoveGenerator:
     """Generate move sequences for testing."""
@@ -115,6 +580,9 @@ class MoveGenerator:
         "OR", "OL", "OU", "OF",
     ]
 
+    # Padding in random_codes arrays (past the end of each sequence)
+    PAD = 255
+
     @classmethod
     def random_sequence(cls, length: int, allow_repeats: bool = True,
                        use_common: bool = True) -> List[str]:
@@ -144,25 +612,125 @@ class MoveGenerator:
 
     @classmethod
     def generate_random_batch(cls, count: int, min_length: int = 2,
-                             max_length: int = 6, **kwargs) -> List[List[str]]:
+                             max_length: int = 6, distinct: bool = False,
+                             **kwargs) -> List[List[str]]:
         """Generate a batch of random sequences.
 
         Args:
             count: Number of sequences to generate
             min_length: Minimum sequence length
             max_length: Maximum sequence length
+            distinct: Skip sequences that are a rotation or inverse of one
+                already in the batch (they have the same period). The batch
+                may come out short if the space of classes is nearly exhausted.
             **kwargs: Additional args passed to random_sequence
 
         Returns:
             List of move sequences
         """
         sequences = []
-        for _ in range(count):
+        seen = set()
+        attempts = 0
+        while len(sequences) < count and attempts < 100 * count:
+            attempts += 1
             length = random.randint(min_length, max_length)
             seq = cls.random_sequence(length, **kwargs)
+            if distinct:
+                key = canonical_key(seq)
+                if key in seen:
+                    continue
+                seen.add(key)
             sequences.append(seq)
         return sequences
 
+    @classmethod
+    def random_codes(cls, count: int, min_length: int = 2, max_length: int = 6,
+                     allow_repeats: bool = True, use_common: bool = True,
+                     distinct: bool = False,
+                     seed: Union[int, np.random.Generator, None] = None
+                     ) -> Tuple[np.ndarray, np.ndarray]:
+        """Generate a batch of random sequences as move codes, vectorized.
+
+        Without distinct, same distribution as generate_random_batch, drawn a
+        column at a time over the whole batch instead of a move at a time.
+        Without repeats, each move is drawn among the other len(pool) - 1
+        moves by skipping over the previous one.
+
+        Args:
+            count: Number of sequences to generate
+            min_length: Minimum sequence length
+            max_length: Maximum sequence length
+            allow_repeats: Whether to allow consecutive identical moves
+            use_common: Use common moves subset (faster to test)
+            distinct: Drop exact duplicates within the batch (drawing more to
+                replace them). This skews lengths toward those with more
+                possible sequences, and the batch may come out short if the
+                space of sequences is nearly exhausted.
+            seed: Seed or NumPy generator (default: fresh entropy)
+
+        Returns:
+            (codes, lengths): codes has shape (count, max_length) and dtype
+            uint8; row i holds indices into the move pool (COMMON_MOVES or
+            MOVES) for its first lengths[i] entries and PAD after them
+        """
+        rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+        pool_size = len(cls.COMMON_MOVES if use_common else cls.MOVES)
+
+        def draw(n: int) -> Tuple[np.ndarray, np.ndarray]:
+            lengths = rng.integers(min_length, max_length + 1, size=n)
+            if allow_repeats or pool_size < 2:
+                codes = rng.integers(0, pool_size, size=(n, max_length), dtype=np.uint8)
+            else:
+                codes = rng.integers(0, pool_size - 1, size=(n, max_length), dtype=np.uint8)
+                codes[:, 0] = rng.integers(0, pool_size, size=n, dtype=np.uint8)
+                for col in range(1, max_length):
+                    codes[:, col] += codes[:, col] >= codes[:, col - 1]
+            codes[np.arange(max_length) >= lengths[:, None]] = cls.PAD
+            return codes, lengths
+
+        if not distinct:
+            return draw(count)
+
+        def keys(codes: np.ndarray) -> np.ndarray:
+            # Padding is identical past each end, so equal rows are equal
+            # sequences; rows of up to 8 codes pack into one integer
+            if max_length <= 8:
+                packed = np.zeros((len(codes), 8), dtype=np.uint8)
+                packed[:, :max_length] = codes
+                return packed.view(np.uint64).ravel()
+            return np.ascontiguousarray(codes).view(np.dtype((np.void, max_length))).ravel()
+
+        codes, lengths = draw(0)
+        seen = keys(codes)  # Sorted keys of the rows kept so far
+        attempts = 0
+        while len(codes) < count and attempts < 100 * count:
+            missing = count - len(codes)
+            new_codes, new_lengths = draw(max(2 * missing, 1024))
+            attempts += len(new_codes)
+            new_keys = keys(new_codes)
+
+            # First occurrence of each new sequence, in draw order, not kept already
+            _, first = np.unique(new_keys, return_index=True)
+            first.sort()
+            position = np.minimum(np.searchsorted(seen, new_keys[first]), max(len(seen) - 1, 0))
+            found = seen[position] == new_keys[first] if len(seen) else np.zeros(len(first), bool)
+            fresh = first[~found][:missing]
+            if not len(fresh):
+                break  # A whole round of draws found nothing new: nearly exhausted
+
+            codes = np.concatenate([codes, new_codes[fresh]])
+            lengths = np.concatenate([lengths, new_lengths[fresh]])
+            seen = np.sort(np.concatenate([seen, new_keys[fresh]]))
+
+        return codes, lengths
+
+    @classmethod
+    def decode(cls, codes: np.ndarray, lengths: np.ndarray,
+               use_common: bool = True) -> List[List[str]]:
+        """Move sequences of a random_codes batch."""
+        pool = np.array(cls.COMMON_MOVES if use_common else cls.MOVES)
+        return [pool[row[:length]].tolist() for row, length in zip(codes, lengths)]
+
 
 if __name__ == "__main__":
     # Test the runner
@@ -31,6 +31,17 @@ def load_all_results(logs_dir: Path) -> List[Dict]:
     return results
 
 
+def load_graph_results(graph_dir: Path) -> List[Dict]:
+    """Load per-sequence results from a perturbation graph (see perturbation_graph.py).
+
+    Same record fields as load_all_results, read from memory-mapped arrays
+    instead of one JSON file per sequence.
+    """
+    from .perturbation_graph import PerturbationGraph
+
+    return PerturbationGraph.load(graph_dir).records()
+
+
 def analyze_perturbation_distribution(results: List[Dict]) -> Dict:
     """
     Analyze the distribution of period ratios across all perturbations.
@@ -252,9 +263,13 @@ def print_analysis_summary(results: List[Dict]):
 if __name__ == "__main__":
     import sys
 
-    # Load data
+    # Load data (from the perturbation graph if one was built)
     logs_dir = Path(__file__).parent.parent / "logs"
-    results = load_all_results(logs_dir)
+    graph_dir = logs_dir / "perturbation_graph"
+    if (graph_dir / "meta.json").exists():
+        results = load_graph_results(graph_dir)
+    else:
+        results = load_all_results(logs_dir)
 
     print(f"Loaded {len(results)} Lyapunov results")
 
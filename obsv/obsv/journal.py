@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Append-only journal for resumable batch runs.
+
+A journal is a JSON Lines file. Each record is appended (and flushed) the
+moment the work it describes finishes: the plan of a batch, every evaluated
+period, every completed per-sequence result. Re-opening the journal of an
+interrupted run replays those records, so the run resumes where it stopped
+without re-parsing result files or repeating finished evaluations.
+
+Record kinds:
+    header   parameters the run was started with
+    batch    the list of sequences a campaign covers
+    plan     perturbations drawn for a base sequence (several records extend)
+    period   period of one evaluated sequence (keyed by canonical class)
+    result   completed result for a base sequence
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .canonical import canonical_key
+
+
+def _sequence_key(moves: List[str]) -> str:
+    """Key for per-sequence records (exact sequence, not its class)."""
+    return ",".join(moves)
+
+
+class RunJournal:
+    """Append-only, crash-tolerant record of a batch run's progress."""
+
+    def __init__(self, path: Path, params: Optional[Dict] = None):
+        """Open (or create) a journal and replay its records.
+
+        Args:
+            path: Journal file (JSON Lines)
+            params: Parameters of the run. Stored when the journal is created;
+                resuming with different parameters raises ValueError.
+
+        Raises:
+            ValueError: If the journal was started with different parameters
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        self.params: Optional[Dict] = None
+        self.batch: Optional[List[List[str]]] = None
+        self.periods: Dict[str, Optional[int]] = {}
+        self._plans: Dict[str, Tuple[List[List[str]], Optional[List[float]]]] = {}
+        self._results: Dict[str, Dict] = {}
+
+        complete = self._replay()
+        self._file = open(self.path, 'a')
+        if not complete:
+            # A crash cut the last record short; start the next one on a fresh line
+            self._file.write("\n")
+
+        if params is not None:
+            params = json.loads(json.dumps(params))
+            if self.params is None:
+                self._append({"kind": "header", "params": params})
+                self.params = params
+            elif self.params != params:
+                raise ValueError(
+                    f"Journal {self.path} was started with different parameters: "
+                    f"{self.params} (now {params})"
+                )
+
+    def _replay(self) -> bool:
+        """Load existing records. Returns False if the file ends mid-record."""
+        if not self.path.exists():
+            return True
+
+        with open(self.path) as f:
+            text = f.read()
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Only the record being written when the run died can be partial
+                continue
+            self._apply(record)
+        return not text or text.endswith("\n")
+
+    def _apply(self, record: Dict):
+        kind = record["kind"]
+        if kind == "header":
+            self.params = record["params"]
+        elif kind == "batch":
+            self.batch = record["sequences"]
+        elif kind == "plan":
+            key = _sequence_key(record["sequence"])
+            perturbations, weights = self._plans.get(key, ([], None))
+            if record.get("weights") is not None:
+                weights = (weights or []) + record["weights"]
+            self._plans[key] = (perturbations + record["perturbations"], weights)
+        elif kind == "period":
+            self.periods[record["key"]] = record["period"]
+        elif kind == "result":
+            self._results[_sequence_key(record["sequence"])] = record["result"]
+
+    def _append(self, record: Dict):
+        with self._lock:
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+        self._apply(record)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record_batch(self, sequences: List[List[str]]):
+        """Record the sequences a campaign covers (once, before any work)."""
+        self._append({"kind": "batch", "sequences": sequences})
+
+    def record_plan(self, sequence: List[str], perturbations: List[List[str]],
+                    weights: Optional[List[float]] = None):
+        """Record perturbations drawn for a base sequence (extends earlier plans)."""
+        self._append({"kind": "plan", "sequence": sequence,
+                      "perturbations": perturbations, "weights": weights})
+
+    def plan(self, sequence: List[str]) -> Optional[Tuple[List[List[str]], Optional[List[float]]]]:
+        """Perturbations (and weights, if any) recorded for a base sequence."""
+        return self._plans.get(_sequence_key(sequence))
+
+    def record_period(self, moves: List[str], period: Optional[int]):
+        """Record the period of an evaluated sequence (None: no cycle found)."""
+        self._append({"kind": "period", "key": canonical_key(moves), "period": period})
+
+    def record_result(self, sequence: List[str], result: Dict):
+        """Record the completed result for a base sequence."""
+        self._append({"kind": "result", "sequence": sequence, "result": result})
+
+    def result(self, sequence: List[str]) -> Optional[Dict]:
+        """Completed result for a base sequence, or None if it is still pending."""
+        return self._results.get(_sequence_key(sequence))
+
+    def results(self) -> List[Dict]:
+        """Every completed result, in completion order."""
+        return list(self._results.values())
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Dense period landscapes: the period of every short sequence over an alphabet.
+
+For an alphabet of A moves, the periods of all A^k sequences of length k are
+stored as a k-dimensional integer tensor indexed by move position in the
+alphabet: periods(2)[i, j] is the period of (alphabet[i], alphabet[j]).
+Heatmaps, period histograms and top-N lists become array slices instead of
+ctrl runs.
+
+Tensors are written as .npy files next to a meta.json and opened
+memory-mapped, so a landscape larger than memory can still be queried.
+A period of 0 marks a sequence that could not be evaluated.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .canonical import canonical_key
+from .ctrl_runner import MoveGenerator
+
+# The 12 moves of collect_2move_heatmap.py
+HEATMAP_MOVES = ["FR", "FL", "FU", "FO", "RF", "RO", "UR", "UF", "UO", "UL", "OR", "OL"]
+
+ALPHABETS = {
+    "heatmap": HEATMAP_MOVES,
+    "common": MoveGenerator.COMMON_MOVES,
+    "all": MoveGenerator.MOVES,
+}
+
+
+class PeriodLandscape:
+    """Periods of all sequences of length 1..max_length over an alphabet."""
+
+    def __init__(self, alphabet: List[str], tensors: Dict[int, np.ndarray],
+                 puzzle_id: Optional[str] = None, directory: Optional[Path] = None):
+        """Wrap period tensors (see compute and load).
+
+        Args:
+            alphabet: Moves, in index order
+            tensors: Length k -> array of shape (len(alphabet),) * k
+            puzzle_id: Puzzle the periods belong to
+            directory: Where the tensors are stored, if on disk
+        """
+        self.alphabet = list(alphabet)
+        self.tensors = tensors
+        self.puzzle_id = puzzle_id
+        self.directory = directory
+        self.max_length = max(tensors, default=0)
+        self._index = {move: i for i, move in enumerate(self.alphabet)}
+
+    @classmethod
+    def compute(cls, runner, alphabet: List[str], max_length: int = 3,
+                directory: Optional[Path] = None, chunk_size: int = 8192,
+                max_iterations: int = 50000, max_workers: Optional[int] = None) -> "PeriodLandscape":
+        """Evaluate every sequence of length 1..max_length.
+
+        Runners with vectorized `encode`/`periods` (PermutationEngine) get
+        the sequences in chunks; any other runner gets one run_sequence per
+        rotation/inversion class (see canonical.py).
+
+        Args:
+            runner: PermutationEngine, or any CtrlRunner-compatible runner
+            alphabet: Moves to combine
+            max_length: Longest sequence length
+            directory: Store the tensors here (memory-mapped .npy files); in
+                memory if None
+            chunk_size: Sequences per vectorized call
+            max_iterations: Max iterations per trajectory (non-vectorized runners)
+            max_workers: Parallel evaluations (non-vectorized runners; default:
+                CPU count)
+        """
+        alphabet = list(alphabet)
+        size = len(alphabet)
+        puzzle_id = getattr(runner, "puzzle_id", None) or getattr(runner, "PUZZLE_ID", None)
+        bulk = getattr(runner, "periods", None)
+        if bulk is not None:
+            move_codes = runner.encode([alphabet])[0]
+
+        if directory is not None:
+            directory = Path(directory)
+            directory.mkdir(parents=True, exist_ok=True)
+
+        tensors = {}
+        for length in range(1, max_length + 1):
+            shape = (size,) * length
+            start_time = time.time()
+            if directory is not None:
+                tensor = np.lib.format.open_memmap(
+                    directory / f"periods_{length}.npy", mode="w+", dtype=np.int64, shape=shape
+                )
+            else:
+                tensor = np.zeros(shape, dtype=np.int64)
+            flat = tensor.reshape(-1)
+
+            if bulk is not None:
+                for start in range(0, flat.size, chunk_size):
+                    index = np.arange(start, min(start + chunk_size, flat.size))
+                    digits = np.stack(np.unravel_index(index, shape), axis=1)
+                    flat[index] = bulk(move_codes[digits])
+            else:
+                flat[:] = cls._run_classes(runner, alphabet, length, max_iterations,
+                                           max_workers or os.cpu_count() or 1)
+
+            if directory is not None:
+                tensor.flush()
+            tensors[length] = tensor
+            print(f"  Length {length}: {flat.size:,} sequences in {time.time() - start_time:.1f}s")
+
+        if directory is not None:
+            with open(directory / "meta.json", 'w') as f:
+                json.dump({"puzzle_id": puzzle_id, "alphabet": alphabet,
+                           "max_length": max_length}, f, indent=2)
+            return cls.load(directory)
+
+        return cls(alphabet, tensors, puzzle_id)
+
+    @staticmethod
+    def _run_classes(runner, alphabet: List[str], length: int,
+                     max_iterations: int, max_workers: int) -> np.ndarray:
+        """Periods of all sequences of one length, one run per canonical class."""
+        shape = (len(alphabet),) * length
+        sequences = [
+            [alphabet[d] for d in digits]
+            for digits in np.ndindex(*shape)
+        ]
+        keys = [canonical_key(seq) for seq in sequences]
+        unique = {}
+        for key, seq in zip(keys, sequences):
+            unique.setdefault(key, seq)
+
+        def run(seq: List[str]) -> int:
+            try:
+                period = runner.run_sequence(seq, max_iterations)['period']
+            except (TimeoutError, RuntimeError, FileNotFoundError):
+                return 0
+            return period or 0
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            periods = dict(zip(unique, executor.map(run, unique.values())))
+        return np.array([periods[key] for key in keys], dtype=np.int64)
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True) -> "PeriodLandscape":
+        """Open a landscape written by compute (memory-mapped by default)."""
+        directory = Path(directory)
+        with open(directory / "meta.json") as f:
+            meta = json.load(f)
+        tensors = {
+            length: np.load(directory / f"periods_{length}.npy", mmap_mode="r" if mmap else None)
+            for length in range(1, meta["max_length"] + 1)
+        }
+        return cls(meta["alphabet"], tensors, meta["puzzle_id"], directory)
+
+    def index(self, moves: List[str]) -> Tuple[int, ...]:
+        """Tensor index of a sequence.
+
+        Raises:
+            KeyError: If a move is not in the alphabet
+        """
+        return tuple(self._index[move.strip()] for move in moves)
+
+    def sequence(self, index) -> List[str]:
+        """Move sequence at a tensor index."""
+        return [self.alphabet[i] for i in index]
+
+    def period(self, moves: List[str]) -> int:
+        """Period of one sequence (0 if it could not be evaluated)."""
+        return int(self.tensors[len(moves)][self.index(moves)])
+
+    def periods(self, length: int) -> np.ndarray:
+        """Period tensor for one length, shape (len(alphabet),) * length."""
+        return self.tensors[length]
+
+    def heatmap(self) -> np.ndarray:
+        """Periods of all 2-move sequences: heatmap()[i, j] is (alphabet[i], alphabet[j])."""
+        return np.asarray(self.tensors[2])
+
+    def most_common(self, length: int, n: int = 10) -> List[Tuple[int, int]]:
+        """Most frequent periods among sequences of a length: (period, count) pairs."""
+        values, counts = np.unique(self.tensors[length], return_counts=True)
+        order = np.argsort(-counts, kind="stable")[:n]
+        return [(int(values[i]), int(counts[i])) for i in order]
+
+    def top(self, length: int, n: int = 10) -> List[Tuple[List[str], int]]:
+        """The n sequences with the highest periods: (sequence, period) pairs."""
+        flat = np.asarray(self.tensors[length]).reshape(-1)
+        n = min(n, flat.size)
+        best = np.argpartition(-flat, n - 1)[:n]
+        best = best[np.argsort(-flat[best], kind="stable")]
+        shape = self.tensors[length].shape
+        return [
+            (self.sequence(np.unravel_index(i, shape)), int(flat[i]))
+            for i in best
+        ]
+
+
+def default_directory(puzzle_id: str, alphabet_name: str) -> Path:
+    """logs/landscape_<puzzle>_<alphabet>/"""
+    name = f"landscape_{puzzle_id.replace(':', '_')}_{alphabet_name}"
+    return Path(__file__).parent.parent / "logs" / name
+
+
+def main():
+    """Compute a period landscape and print its highlights."""
+    import argparse
+
+    from .ctrl_runner import BACKENDS, make_runner
+
+    parser = argparse.ArgumentParser(
+        description="Periods of every sequence of length 1..k over a move alphabet"
+    )
+    parser.add_argument("--alphabet", choices=sorted(ALPHABETS), default="all",
+                       help="Moves to combine: the 12 heat map moves, COMMON_MOVES or "
+                            "all 48 MOVES (default: all)")
+    parser.add_argument("--max-length", type=int, default=3,
+                       help="Longest sequence length (default: 3)")
+    parser.add_argument("--output", type=Path,
+                       help="Directory for the tensors (default: logs/landscape_<puzzle>_<alphabet>)")
+    parser.add_argument("--backend", choices=BACKENDS, default="permutation",
+                       help="How sequences are evaluated (default: permutation)")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1,
+                       help="Parallel evaluations for non-vectorized backends "
+                            "(default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Always re-evaluate instead of using the on-disk result cache")
+    parser.add_argument("--top", type=int, default=10,
+                       help="How many top sequences and common periods to print")
+
+    args = parser.parse_args()
+
+    runner = make_runner(args.backend, workers=args.max_workers, cache=not args.no_cache)
+    alphabet = ALPHABETS[args.alphabet]
+    puzzle_id = getattr(runner, "puzzle_id", None) or runner.PUZZLE_ID
+    output = args.output or default_directory(puzzle_id, args.alphabet)
+
+    print(f"Computing periods over {len(alphabet)} moves, lengths 1-{args.max_length}...")
+    landscape = PeriodLandscape.compute(runner, alphabet, args.max_length, output,
+                                        max_workers=args.max_workers)
+    runner.close()
+    print(f"Saved to: {output}")
+
+    for length in range(1, args.max_length + 1):
+        print(f"\n{length}-move sequences:")
+        print("  Most common periods: " + ", ".join(
+            f"{period:,} (×{count:,})" for period, count in landscape.most_common(length, args.top)
+        ))
+        print("  Highest periods:")
+        for seq, period in landscape.top(length, args.top):
+            print(f"    {' → '.join(seq)}: {period:,}")
+
+
+if __name__ == "__main__":
+    main()
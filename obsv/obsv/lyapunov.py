@@ -10,15 +10,21 @@ Reference: docs/ADDITIONAL_ANALYSES.md, Section 4
 """
 
 import json
+import os
 import numpy as np
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, List, Dict, Tuple, Optional
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import random
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 
-from .ctrl_runner import CtrlRunner, MoveGenerator
+from .canonical import canonical_key
+from .ctrl_runner import BACKENDS, CtrlRunner, MoveGenerator, make_runner
+from .journal import RunJournal
+from .landscape import PeriodLandscape
+from .result_table import LyapunovTable
+from .stats import RunningMoments
 
 
 @dataclass
@@ -33,21 +39,67 @@ class LyapunovResult:
     classification: str  # "chaotic", "regular", or "stable"
 
 
+@dataclass
+class LyapunovSweepResult:
+    """λ of one sequence under several perturbation types, from one evaluation pool."""
+    sequence: List[str]
+    base_period: int
+    by_type: Dict[str, LyapunovResult]
+    lyapunov_exponent: float  # Combined: mean of the per-type exponents
+    classification: str
+
+    def combined(self) -> LyapunovResult:
+        """The combined result as a LyapunovResult.
+
+        The ratios and divergences pool every type's perturbations, but the
+        exponent is the mean of the per-type exponents (each type weighted
+        equally, as in landscape mode), not the mean log ratio of the pooled
+        ratios: types with more neighbors do not dominate it.
+        """
+        results = list(self.by_type.values())
+        return LyapunovResult(
+            sequence=self.sequence,
+            base_period=self.base_period,
+            lyapunov_exponent=self.lyapunov_exponent,
+            perturbations_tested=sum(r.perturbations_tested for r in results),
+            period_ratios=[x for r in results for x in r.period_ratios],
+            divergence_scores=[x for r in results for x in r.divergence_scores],
+            classification=self.classification
+        )
+
+
+@dataclass
+class EditSpectrum:
+    """Mean log period ratio as a function of edit distance from a base sequence."""
+    sequence: List[str]
+    base_period: int
+    shell_sizes: List[int]            # Sequences at distance r = 1, 2, ...
+    evaluated: List[int]              # How many of them were evaluated (sampled)
+    mean_log_ratio: List[float]       # Mean |log(Period(S') / Period(S))| over the shell
+
+
+PERTURBATION_TYPES = ("substitute", "swap", "insert", "delete")
+
+
 class LyapunovAnalyzer:
     """Compute discrete Lyapunov-like exponents for puzzle dynamics."""
 
-    def __init__(self, output_dir: Path = None):
+    # λ values separating weakly, strongly and extremely chaotic (see classify())
+    THRESHOLDS = (2.0, 4.0)
+
+    def __init__(self, output_dir: Path = None, runner: CtrlRunner = None):
         """Initialize analyzer.
 
         Args:
             output_dir: Directory for logs and results
+            runner: Runner used to evaluate sequences (default: a cached CtrlRunner)
         """
         if output_dir is None:
             output_dir = Path(__file__).parent.parent / "logs"
         self.output_dir = output_dir
         self.output_dir.mkdir(exist_ok=True, parents=True)
 
-        self.runner = CtrlRunner()
+        self.runner = runner if runner is not None else make_runner()
         self.generator = MoveGenerator()
 
     def compute_lyapunov_exponent(
@@ -55,7 +107,8 @@ class LyapunovAnalyzer:
         sequence: List[str],
         n_perturbations: int = 10,
         max_iterations: int = 50000,
-        perturbation_type: str = "substitute"
+        perturbation_type: str = "substitute",
+        exhaustive: bool = False
     ) -> LyapunovResult:
         """Compute discrete Lyapunov exponent for a sequence.
 
@@ -69,12 +122,20 @@ class LyapunovAnalyzer:
             n_perturbations: Number of perturbations to test
             max_iterations: Max iterations per trajectory
             perturbation_type: Type of perturbation ('substitute', 'swap', 'insert', 'delete')
+            exhaustive: Evaluate every single-edit neighbor instead of sampling
+                n_perturbations of them, giving the exact expected λ (see neighbors())
 
         Returns:
             LyapunovResult with exponent and diagnostics
         """
         print(f"\nComputing Lyapunov exponent for: {' → '.join(sequence)}")
 
+        if exhaustive:
+            neighbors, weights = self.neighbors(sequence, perturbation_type)
+            print(f"  Evaluating all {len(neighbors)} {perturbation_type} neighbors...")
+            periods = self.evaluate_periods([sequence] + neighbors, max_iterations)
+            return self.result_from_periods(sequence, neighbors, periods, weights)
+
         # Run base sequence
         print(f"  Base sequence...", end=" ")
         base_result = self.runner.run_sequence(sequence, max_iterations)
@@ -121,16 +182,7 @@ class LyapunovAnalyzer:
         log_ratios = [np.log(r) for r in period_ratios]
         lyapunov = np.mean(log_ratios)
 
-        # Classify behavior (data-driven thresholds based on distribution)
-        # Note: System shows sharp phase transition - no "sensitive" middle ground
-        if lyapunov == 0.0:
-            classification = "trivial"           # Single moves only
-        elif lyapunov < 2.0:
-            classification = "weakly_chaotic"    # Below median
-        elif lyapunov < 4.0:
-            classification = "strongly_chaotic"  # Above median
-        else:
-            classification = "extremely_chaotic" # Top outliers
+        classification = self.classify(lyapunov)
 
         print(f"  → Lyapunov exponent: λ = {lyapunov:.3f} ({classification})")
 
@@ -150,102 +202,308 @@ class LyapunovAnalyzer:
         n_perturbations: int = 10,
         max_iterations: int = 50000,
         perturbation_type: str = "substitute",
-        max_workers: int = 8
+        max_workers: Optional[int] = None
     ) -> LyapunovResult:
         """Compute discrete Lyapunov exponent with parallel perturbation testing.
 
-        Runs all perturbations in parallel for ~5-10x speedup depending on CPU cores.
+        The base sequence and all perturbations are evaluated together in one
+        pool (see _run_plans), so the base does not run ahead of them.
 
         Args:
             sequence: Base move sequence
             n_perturbations: Number of perturbations to test
             max_iterations: Max iterations per trajectory
             perturbation_type: Type of perturbation ('substitute', 'swap', 'insert', 'delete')
-            max_workers: Maximum parallel workers (default: 8)
+            max_workers: Maximum parallel workers (default: CPU count)
 
         Returns:
             LyapunovResult with exponent and diagnostics
+
+        Raises:
+            ValueError: If the base sequence or every perturbation failed
         """
         print(f"\nComputing Lyapunov exponent (PARALLEL) for: {' → '.join(sequence)}")
 
-        # Run base sequence (sequential)
-        print(f"  Base sequence...", end=" ", flush=True)
-        base_result = self.runner.run_sequence(sequence, max_iterations)
-        base_period = base_result['period']
-        print(f"period={base_period:,}")
-
-        # Generate all perturbations upfront
         perturbations = [
             self._perturb_sequence(sequence, perturbation_type)
             for _ in range(n_perturbations)
         ]
+        workers = max_workers or os.cpu_count() or 1
+        print(f"  Running base and {n_perturbations} perturbations in parallel "
+              f"(max_workers={workers})...")
 
-        print(f"  Running {n_perturbations} perturbations in parallel (max_workers={max_workers})...")
+        result = self._run_plans([(sequence, perturbations, None)], max_iterations, workers,
+                                 save_results=False)[0]
+        if result is None:
+            raise ValueError(f"Could not analyze {' → '.join(sequence)}")
+        return result
 
-        # Run perturbations in parallel
-        period_ratios = []
-        divergence_scores = []
-        failed_count = 0
-        completed = 0
+    @staticmethod
+    def classify(lyapunov: float) -> str:
+        """Classify behavior from λ (data-driven thresholds based on distribution).
 
-        def run_perturbation(idx: int, pert_seq: List[str]) -> Tuple[int, int, Optional[int], Optional[str]]:
-            """Run single perturbation. Returns (idx, success, period, error_type)."""
+        Note: System shows sharp phase transition - no "sensitive" middle ground
+        """
+        if lyapunov == 0.0:
+            return "trivial"           # Single moves only
+        elif lyapunov < LyapunovAnalyzer.THRESHOLDS[0]:
+            return "weakly_chaotic"    # Below median
+        elif lyapunov < LyapunovAnalyzer.THRESHOLDS[1]:
+            return "strongly_chaotic"  # Above median
+        else:
+            return "extremely_chaotic" # Top outliers
+
+    def evaluate_periods(
+        self,
+        sequences: List[List[str]],
+        max_iterations: int = 50000,
+        max_workers: int = 8,
+        journal: Optional[RunJournal] = None,
+        on_period: Optional[Callable[[str, Optional[int]], None]] = None
+    ) -> Dict[str, Optional[int]]:
+        """Evaluate every distinct sequence exactly once.
+
+        Sequences are deduplicated by canonical key (rotations and inverses
+        share a period), then submitted together to one pool, in order.
+        Runners that can evaluate many sequences at once (PermutationEngine)
+        get the whole set in a single call.
+
+        Args:
+            sequences: Sequences to evaluate
+            max_iterations: Max iterations per trajectory
+            max_workers: Parallel evaluations
+            journal: Periods already in the journal are reused, and every new
+                evaluation is recorded as soon as it finishes
+            on_period: Called (in this thread) with each key and period as
+                soon as it is known, in completion order
+
+        Returns:
+            Canonical key -> period (None if the run failed or found no cycle)
+        """
+        unique: Dict[str, List[str]] = {}
+        for seq in sequences:
+            unique.setdefault(canonical_key(seq), seq)
+
+        periods = {}
+
+        def done(key: str, period: Optional[int]):
+            periods[key] = period
+            if on_period is not None:
+                on_period(key, period)
+
+        if journal is not None:
+            for key in unique:
+                if key in journal.periods:
+                    done(key, journal.periods[key])
+        keys = [key for key in unique if key not in periods]
+
+        bulk = getattr(self.runner, "periods", None)
+        if bulk is not None:
             try:
-                result = self.runner.run_sequence(pert_seq, max_iterations)
-                return (idx, 1, result['period'], None)
-            except (TimeoutError, RuntimeError, FileNotFoundError) as e:
-                return (idx, 0, None, type(e).__name__)
+                codes = self.runner.encode([unique[key] for key in keys])
+            except ValueError:
+                pass
+            else:
+                for key, period in zip(keys, bulk(codes)):
+                    if journal is not None:
+                        journal.record_period(unique[key], int(period))
+                    done(key, int(period))
+                return periods
+
+        def run(key: str) -> Optional[int]:
+            try:
+                period = self.runner.run_sequence(unique[key], max_iterations)['period']
+            except (TimeoutError, RuntimeError, FileNotFoundError):
+                # Not journaled: a resumed run tries again
+                return None
+            if journal is not None:
+                journal.record_period(unique[key], period)
+            return period
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(run, key): key for key in keys}
+            for future in as_completed(futures):
+                done(futures[future], future.result())
+        return periods
+
+    def _run_plans(
+        self,
+        plans: List[Tuple[List[str], List[List[str]], Optional[List[float]]]],
+        max_iterations: int = 50000,
+        max_workers: int = 8,
+        save_results: bool = True,
+        journal: Optional[RunJournal] = None,
+        indices: Optional[List[int]] = None
+    ) -> List[Optional[LyapunovResult]]:
+        """Evaluate a batch's plans in one shared pool, finalizing λ as dependencies finish.
+
+        Every base and perturbation of every plan is submitted at once (each
+        distinct sequence once, bases first), so no worker waits at a
+        sequence boundary. A sequence's λ is computed, saved and journaled
+        the moment its last evaluation completes, not when the batch ends.
+
+        Returns:
+            One result per plan, in plan order (None if it could not be analyzed)
+        """
+        if indices is None:
+            indices = list(range(1, len(plans) + 1))
+
+        pending = [
+            {canonical_key(s) for s in [seq] + perturbations}
+            for seq, perturbations, _ in plans
+        ]
+        waiting: Dict[str, List[int]] = defaultdict(list)
+        for i, keys in enumerate(pending):
+            for key in keys:
+                waiting[key].append(i)
+
+        results: List[Optional[LyapunovResult]] = [None] * len(plans)
+        periods: Dict[str, Optional[int]] = {}
+
+        def finalize(i: int):
+            results[i] = self._fan_out([plans[i]], periods, save_results, journal, [indices[i]])[0]
+
+        def on_period(key: str, period: Optional[int]):
+            periods[key] = period
+            for i in waiting.pop(key, []):
+                pending[i].discard(key)
+                if not pending[i]:
+                    finalize(i)
+
+        # Bases first, then perturbations in plan order: early sequences finish first
+        ordered = [seq for seq, _, _ in plans] + [p for _, perturbations, _ in plans for p in perturbations]
+        self.evaluate_periods(ordered, max_iterations, max_workers, journal, on_period)
+        return results
+
+    def _adaptive_plans(
+        self,
+        sequences: List[List[str]],
+        perturbation_type: str = "substitute",
+        round_size: int = 5,
+        max_perturbations: int = 100,
+        ci_width: float = 0.5,
+        confidence: float = 0.95,
+        max_iterations: int = 50000,
+        max_workers: int = 8,
+        journal: Optional[RunJournal] = None
+    ) -> Tuple[List[Tuple[List[str], List[List[str]], None]], Dict[str, Optional[int]]]:
+        """Sample perturbations in rounds until each sequence's λ is pinned down.
+
+        Every round draws round_size more perturbations for each sequence
+        still open and evaluates the new distinct ones together. A sequence
+        stops once the confidence interval on its λ is narrower than ci_width,
+        or no longer contains a classification threshold (the class is decided
+        at that confidence), or max_perturbations have been drawn.
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_idx = {
-                executor.submit(run_perturbation, i, pert): i
-                for i, pert in enumerate(perturbations)
+        With a journal, each round's draws are recorded before they are
+        evaluated, and a resumed run continues from the recorded draws.
+
+        Returns:
+            (plans, periods) in the form analyze_sequence_batch fans out
+        """
+        periods = self.evaluate_periods(sequences, max_iterations, max_workers, journal)
+        perturbations: List[List[List[str]]] = [[] for _ in sequences]
+        moments = [RunningMoments() for _ in sequences]
+
+        def add(i: int, drawn: List[List[str]]) -> bool:
+            """Fold evaluated draws into sequence i's estimate; True while still open."""
+            base_period = periods[canonical_key(sequences[i])]
+            for perturbed in drawn:
+                pert_period = periods.get(canonical_key(perturbed))
+                if pert_period is not None:
+                    moments[i].add(np.log(max(pert_period, base_period) /
+                                          min(pert_period, base_period)))
+            perturbations[i].extend(drawn)
+
+            low, high = moments[i].confidence_interval(confidence)
+            decided = not any(low < t <= high for t in self.THRESHOLDS)
+            return len(perturbations[i]) < max_perturbations and \
+                not (high - low <= ci_width or decided)
+
+        open_ = []
+        for i, seq in enumerate(sequences):
+            if periods.get(canonical_key(seq)) is None:
+                continue
+            recorded = journal.plan(seq) if journal is not None else None
+            if recorded is not None:
+                periods.update(self.evaluate_periods(recorded[0], max_iterations,
+                                                      max_workers, journal))
+                if not add(i, recorded[0]):
+                    continue
+            open_.append(i)
+
+        round_number = 0
+        while open_:
+            round_number += 1
+            draws = {
+                i: [self._perturb_sequence(sequences[i], perturbation_type)
+                    for _ in range(round_size)]
+                for i in open_
             }
+            if journal is not None:
+                for i, drawn in draws.items():
+                    journal.record_plan(sequences[i], drawn)
+            new = [p for drawn in draws.values() for p in drawn
+                   if canonical_key(p) not in periods]
+            periods.update(self.evaluate_periods(new, max_iterations, max_workers, journal))
 
-            # Collect results as they complete
-            for future in as_completed(future_to_idx):
-                idx, success, pert_period, error_type = future.result()
-                completed += 1
+            open_ = [i for i, drawn in draws.items() if add(i, drawn)]
 
-                pert_seq = perturbations[idx]
-                print(f"    [{completed}/{n_perturbations}] {' → '.join(pert_seq)}: ", end="")
+            print(f"  Round {round_number}: {len(new)} new evaluations, "
+                  f"{len(open_)} sequences undecided")
 
-                if success:
-                    # Compute ratio and divergence
-                    ratio = max(pert_period, base_period) / min(pert_period, base_period)
-                    divergence = abs(pert_period - base_period)
+        return [(seq, perturbations[i], None) for i, seq in enumerate(sequences)], periods
 
-                    period_ratios.append(ratio)
-                    divergence_scores.append(divergence)
+    def result_from_periods(
+        self,
+        sequence: List[str],
+        perturbations: List[List[str]],
+        periods: Dict[str, Optional[int]],
+        weights: Optional[List[float]] = None,
+        quiet: bool = False
+    ) -> LyapunovResult:
+        """Compute λ for a sequence from already-evaluated periods.
 
-                    print(f"period={pert_period:,}, ratio={ratio:.2f}")
-                else:
-                    failed_count += 1
-                    print(f"FAILED ({error_type})")
+        Args:
+            sequence: Base move sequence
+            perturbations: Perturbed sequences
+            periods: Canonical key -> period, see evaluate_periods()
+            weights: Probability of each perturbation (default: equal); failed
+                perturbations are dropped and the rest renormalized
+            quiet: Don't print the result line
+
+        Raises:
+            ValueError: If the base sequence or every perturbation failed
+        """
+        base_period = periods.get(canonical_key(sequence))
+        if base_period is None:
+            raise ValueError("Base sequence failed or found no cycle")
 
-        if not period_ratios:
-            raise ValueError(f"All {n_perturbations} perturbations failed!")
+        if weights is None:
+            weights = [1.0] * len(perturbations)
 
-        if failed_count > 0:
-            print(f"  Note: {failed_count}/{n_perturbations} perturbations failed")
+        period_ratios = []
+        divergence_scores = []
+        ratio_weights = []
+        for perturbed, weight in zip(perturbations, weights):
+            pert_period = periods.get(canonical_key(perturbed))
+            if pert_period is None:
+                continue
+            period_ratios.append(max(pert_period, base_period) / min(pert_period, base_period))
+            divergence_scores.append(abs(pert_period - base_period))
+            ratio_weights.append(weight)
 
-        # Compute Lyapunov exponent
-        log_ratios = [np.log(r) for r in period_ratios]
-        lyapunov = np.mean(log_ratios)
+        if not period_ratios:
+            raise ValueError(f"All {len(perturbations)} perturbations failed!")
 
-        # Classify behavior (data-driven thresholds based on distribution)
-        # Note: System shows sharp phase transition - no "sensitive" middle ground
-        if lyapunov == 0.0:
-            classification = "trivial"           # Single moves only
-        elif lyapunov < 2.0:
-            classification = "weakly_chaotic"    # Below median
-        elif lyapunov < 4.0:
-            classification = "strongly_chaotic"  # Above median
-        else:
-            classification = "extremely_chaotic" # Top outliers
+        lyapunov = float(np.average(np.log(period_ratios), weights=ratio_weights))
+        classification = self.classify(lyapunov)
 
-        print(f"  → Lyapunov exponent: λ = {lyapunov:.3f} ({classification})")
+        failed_count = len(perturbations) - len(period_ratios)
+        note = f", {failed_count} failed" if failed_count else ""
+        if not quiet:
+            print(f"  {' → '.join(sequence)}: period={base_period:,}, "
+                  f"λ = {lyapunov:.3f} ({classification}{note})")
 
         return LyapunovResult(
             sequence=sequence,
@@ -311,6 +569,159 @@ class LyapunovAnalyzer:
 
         return perturbed
 
+    def neighbors(
+        self,
+        sequence: List[str],
+        perturbation_type: str = "substitute"
+    ) -> Tuple[List[List[str]], List[float]]:
+        """Enumerate every outcome of _perturb_sequence.
+
+        Each neighbor comes with the probability that _perturb_sequence
+        returns it, so the weighted mean of log ratios over the neighbors is
+        exactly the λ that random sampling converges to. Outcomes reached in
+        several ways (e.g. inserting a move next to a copy of itself) are
+        listed once per way.
+
+        Args:
+            sequence: Original move sequence
+            perturbation_type: Type of perturbation
+
+        Returns:
+            (neighbors, probabilities)
+        """
+        moves = self.generator.COMMON_MOVES
+        neighbors, weights = [], []
+
+        def substitutions(positions: List[int]):
+            for idx in positions:
+                candidates = [m for m in moves if m != sequence[idx]]
+                for move in candidates:
+                    perturbed = sequence.copy()
+                    perturbed[idx] = move
+                    neighbors.append(perturbed)
+                    weights.append(1.0 / (len(positions) * len(candidates)))
+
+        if perturbation_type == "substitute":
+            substitutions(list(range(len(sequence))))
+
+        elif perturbation_type == "swap":
+            if len(sequence) < 2:
+                substitutions([0])
+            else:
+                for idx in range(len(sequence) - 1):
+                    perturbed = sequence.copy()
+                    perturbed[idx], perturbed[idx + 1] = perturbed[idx + 1], perturbed[idx]
+                    neighbors.append(perturbed)
+                    weights.append(1.0 / (len(sequence) - 1))
+
+        elif perturbation_type == "insert":
+            for idx in range(len(sequence) + 1):
+                for move in moves:
+                    neighbors.append(sequence[:idx] + [move] + sequence[idx:])
+                    weights.append(1.0 / ((len(sequence) + 1) * len(moves)))
+
+        elif perturbation_type == "delete":
+            if len(sequence) > 1:
+                for idx in range(len(sequence)):
+                    neighbors.append(sequence[:idx] + sequence[idx + 1:])
+                    weights.append(1.0 / len(sequence))
+            else:
+                substitutions([0])
+
+        else:
+            raise ValueError(f"Unknown perturbation type: {perturbation_type}")
+
+        return neighbors, weights
+
+    def landscape_lyapunov(
+        self,
+        landscape: PeriodLandscape,
+        length: int,
+        perturbation_type: str = "substitute"
+    ) -> np.ndarray:
+        """Exact λ of every sequence of one length, from a period landscape.
+
+        Every neighbor that neighbors() would enumerate is an index into the
+        landscape (length-1, length or length+1), so λ for all
+        len(alphabet)**length sequences is a handful of array operations and
+        nothing is evaluated. Perturbations with an unknown period (0 in the
+        landscape) are dropped and the rest renormalized, as in exhaustive mode.
+
+        Args:
+            landscape: Periods over an alphabet containing COMMON_MOVES, up to
+                length + 1 for insertions
+            length: Sequence length
+            perturbation_type: Type of perturbation
+
+        Returns:
+            Array of shape (len(alphabet),) * length: λ of each sequence,
+            indexed like landscape.periods(length) (NaN if the base period is unknown)
+
+        Raises:
+            ValueError: If the landscape lacks a needed length or pool move
+        """
+        pool = self.generator.COMMON_MOVES
+        try:
+            q = np.array(landscape.index(pool), dtype=np.intp)
+        except KeyError as e:
+            raise ValueError(f"Landscape alphabet lacks perturbation move {e}") from None
+
+        def log_periods(k: int) -> np.ndarray:
+            if k not in landscape.tensors:
+                raise ValueError(f"Landscape has no {k}-move periods (up to {landscape.max_length})")
+            periods = np.asarray(landscape.periods(k), dtype=np.float64)
+            return np.log(np.where(periods > 0, periods, np.nan))
+
+        base = log_periods(length)
+        size = len(landscape.alphabet)
+        total = np.zeros(base.shape)    # Σ weight × |log ratio| over known neighbors
+        known = np.zeros(base.shape)    # Σ weight over known neighbors
+
+        def add(neighbor: np.ndarray, weight):
+            """neighbor: log periods broadcastable to base.shape + (candidates,)."""
+            diff = np.abs(neighbor - base[..., None])
+            weight = np.broadcast_to(weight, diff.shape)
+            ok = ~np.isnan(diff) & (weight > 0)
+            total[...] += np.where(ok, diff * weight, 0.0).sum(axis=-1)
+            known[...] += np.where(ok, weight, 0.0).sum(axis=-1)
+
+        def substitutions():
+            # Candidate j replaces position i: the neighbor does not depend on
+            # the base's own move there, only on the other positions
+            in_pool = np.isin(np.arange(size), q)
+            for i in range(length):
+                neighbor = np.expand_dims(np.moveaxis(np.take(base, q, axis=i), i, -1), i)
+                shape = [1] * length + [len(q)]
+                shape[i] = size
+                own = np.arange(size).reshape([-1 if d == i else 1 for d in range(length)])
+                weight = (q != own[..., None]) / (length * (len(q) - in_pool[own]))[..., None]
+                add(neighbor, weight.reshape(shape))
+
+        if perturbation_type == "substitute" or (
+                perturbation_type in ("swap", "delete") and length < 2):
+            substitutions()
+
+        elif perturbation_type == "swap":
+            for i in range(length - 1):
+                add(np.swapaxes(base, i, i + 1)[..., None], 1.0 / (length - 1))
+
+        elif perturbation_type == "insert":
+            longer = log_periods(length + 1)
+            for i in range(length + 1):
+                add(np.moveaxis(np.take(longer, q, axis=i), i, -1),
+                    1.0 / ((length + 1) * len(q)))
+
+        elif perturbation_type == "delete":
+            shorter = log_periods(length - 1)
+            for i in range(length):
+                add(np.expand_dims(shorter, (i, -1)), 1.0 / length)
+
+        else:
+            raise ValueError(f"Unknown perturbation type: {perturbation_type}")
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(np.isnan(base) | (known == 0), np.nan, total / known)
+
     def analyze_sequence_batch(
         self,
         sequences: List[List[str]],
@@ -318,56 +729,313 @@ class LyapunovAnalyzer:
         perturbation_type: str = "substitute",
         save_results: bool = True,
         parallel: bool = False,
-        max_workers: int = 8
+        max_workers: Optional[int] = None,
+        max_iterations: int = 50000,
+        exhaustive: bool = False,
+        adaptive: bool = False,
+        ci_width: float = 0.5,
+        confidence: float = 0.95,
+        max_perturbations: int = 100,
+        journal: Optional[RunJournal] = None
     ) -> List[LyapunovResult]:
         """Analyze multiple sequences.
 
+        Runs in two phases. Planning draws every base sequence's perturbations
+        up front; evaluation then runs each distinct sequence in the whole
+        batch exactly once (perturbations overlap heavily across bases, and
+        are often bases themselves). All of those evaluations share one pool,
+        and each λ is computed as soon as its own evaluations have finished
+        (see _run_plans).
+
         Args:
             sequences: List of move sequences
-            n_perturbations: Perturbations per sequence
+            n_perturbations: Perturbations per sequence (per round in adaptive mode)
             perturbation_type: Type of perturbation
             save_results: Save individual results to JSON
-            parallel: Use parallel execution for perturbations (default: False)
-            max_workers: Max parallel workers when parallel=True (default: 8)
+            parallel: Evaluate in parallel (default: False)
+            max_workers: Max parallel workers when parallel=True (default: CPU count)
+            max_iterations: Max iterations per trajectory
+            exhaustive: Use every single-edit neighbor instead of
+                n_perturbations random ones (exact λ, see neighbors())
+            adaptive: Sample n_perturbations at a time until λ is known to
+                within ci_width or its classification is decided (see _adaptive_plans)
+            ci_width: Adaptive mode: target confidence interval width on λ
+            confidence: Adaptive mode: confidence level of the interval
+            max_perturbations: Adaptive mode: cap on perturbations per sequence
+            journal: Record plans, evaluations and results as they finish.
+                Sequences already completed in the journal are not re-run, and
+                recorded perturbations and periods are reused.
 
         Returns:
             List of LyapunovResult objects
         """
-        results = []
+        if exhaustive and adaptive:
+            raise ValueError("exhaustive and adaptive are mutually exclusive")
 
         mode = "PARALLEL" if parallel else "SEQUENTIAL"
         print(f"Analyzing {len(sequences)} sequences ({mode} mode)...")
 
-        compute_fn = (self.compute_lyapunov_exponent_parallel if parallel
-                     else self.compute_lyapunov_exponent)
+        workers = (max_workers or os.cpu_count() or 1) if parallel else 1
+
+        # Sequences finished in an earlier run come straight from the journal
+        done: Dict[int, LyapunovResult] = {}
+        if journal is not None:
+            for i, seq in enumerate(sequences):
+                recorded = journal.result(seq)
+                if recorded is not None:
+                    done[i] = LyapunovResult(**recorded)
+            if done:
+                print(f"  {len(done)} sequences already complete in {journal.path.name}")
+        pending = [seq for i, seq in enumerate(sequences) if i not in done]
+
+        if adaptive:
+            # Phases 1 and 2 interleaved: plan and evaluate one round at a time
+            plans, periods = self._adaptive_plans(
+                pending, perturbation_type, n_perturbations, max_perturbations,
+                ci_width, confidence, max_iterations, workers, journal
+            )
+        else:
+            # Phase 1: plan every evaluation the batch needs
+            plans = []
+            for seq in pending:
+                recorded = journal.plan(seq) if journal is not None else None
+                if recorded is not None:
+                    plans.append((seq, *recorded))
+                    continue
+                if exhaustive:
+                    perturbations, weights = self.neighbors(seq, perturbation_type)
+                else:
+                    perturbations = [self._perturb_sequence(seq, perturbation_type)
+                                     for _ in range(n_perturbations)]
+                    weights = None
+                if journal is not None:
+                    journal.record_plan(seq, perturbations, weights)
+                plans.append((seq, perturbations, weights))
+            needed = [s for seq, perturbations, _ in plans for s in [seq] + perturbations]
+
+            # Phase 2: evaluate each distinct sequence once, in one shared
+            # pool; each λ is finalized as soon as its own evaluations are in
+            distinct = len({canonical_key(s) for s in needed})
+            print(f"  {len(needed)} evaluations planned, {distinct} distinct")
+
+        indices = [i + 1 for i in range(len(sequences)) if i not in done]
+        if adaptive:
+            # Phase 3: fan periods back out to each base sequence
+            computed = self._fan_out(plans, periods, save_results, journal, indices)
+        else:
+            computed = self._run_plans(plans, max_iterations, workers, save_results, journal, indices)
+        for i, result in zip(indices, computed):
+            if result is not None:
+                done[i - 1] = result
+        return [done[i] for i in sorted(done)]
 
-        for i, seq in enumerate(sequences, 1):
-            print(f"\n[{i}/{len(sequences)}] " + "="*60)
+    def analyze_perturbation_sweep(
+        self,
+        sequences: List[List[str]],
+        perturbation_types: Tuple[str, ...] = PERTURBATION_TYPES,
+        n_perturbations: int = 10,
+        save_results: bool = True,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+        max_iterations: int = 50000,
+        exhaustive: bool = False
+    ) -> List[LyapunovSweepResult]:
+        """Analyze sequences under several perturbation types at once.
 
-            try:
-                if parallel:
-                    result = compute_fn(
-                        seq,
-                        n_perturbations=n_perturbations,
-                        perturbation_type=perturbation_type,
-                        max_workers=max_workers
-                    )
+        All types' perturbations go into one evaluation plan, so base periods
+        are evaluated once and neighbors shared between types (a swap of two
+        equal moves is the base itself, an insertion next to a deletion...)
+        are evaluated once too.
+
+        Args:
+            sequences: List of move sequences
+            perturbation_types: Types to sweep (default: all four)
+            n_perturbations: Perturbations per sequence and type
+            save_results: Save individual results to JSON
+            parallel: Evaluate in parallel (default: False)
+            max_workers: Max parallel workers when parallel=True (default: CPU count)
+            max_iterations: Max iterations per trajectory
+            exhaustive: Use every single-edit neighbor of each type (see neighbors())
+
+        Returns:
+            List of LyapunovSweepResult objects
+        """
+        mode = "PARALLEL" if parallel else "SEQUENTIAL"
+        print(f"Sweeping {len(sequences)} sequences over {', '.join(perturbation_types)} "
+              f"({mode} mode)...")
+
+        # Phase 1: one plan for every (sequence, type)
+        plans = []
+        for seq in sequences:
+            by_type = {}
+            for perturbation_type in perturbation_types:
+                if exhaustive:
+                    by_type[perturbation_type] = self.neighbors(seq, perturbation_type)
                 else:
-                    result = compute_fn(
-                        seq,
-                        n_perturbations=n_perturbations,
-                        perturbation_type=perturbation_type
+                    by_type[perturbation_type] = (
+                        [self._perturb_sequence(seq, perturbation_type)
+                         for _ in range(n_perturbations)],
+                        None
+                    )
+            plans.append((seq, by_type))
+        needed = [s for seq, by_type in plans
+                  for s in [seq] + [p for perturbations, _ in by_type.values() for p in perturbations]]
+
+        # Phase 2: evaluate each distinct sequence once
+        distinct = len({canonical_key(s) for s in needed})
+        print(f"  {len(needed)} evaluations planned, {distinct} distinct")
+        workers = (max_workers or os.cpu_count() or 1) if parallel else 1
+        periods = self.evaluate_periods(needed, max_iterations, workers)
+
+        # Phase 3: per-type and combined exponents
+        results = []
+        for i, (seq, by_type) in enumerate(plans, 1):
+            try:
+                type_results = {
+                    perturbation_type: self.result_from_periods(
+                        seq, perturbations, periods, weights, quiet=True
                     )
+                    for perturbation_type, (perturbations, weights) in by_type.items()
+                }
+            except ValueError as e:
+                print(f"ERROR: Failed to analyze {' → '.join(seq)}: {e}")
+                continue
 
-                results.append(result)
+            lyapunov = float(np.mean([r.lyapunov_exponent for r in type_results.values()]))
+            result = LyapunovSweepResult(
+                sequence=seq,
+                base_period=next(iter(type_results.values())).base_period,
+                by_type=type_results,
+                lyapunov_exponent=lyapunov,
+                classification=self.classify(lyapunov)
+            )
+            results.append(result)
 
-                if save_results:
-                    self._save_result(result, i)
+            per_type = ", ".join(f"{t}={r.lyapunov_exponent:.3f}" for t, r in type_results.items())
+            print(f"  {' → '.join(seq)}: period={result.base_period:,}, "
+                  f"λ = {lyapunov:.3f} ({result.classification}; {per_type})")
 
-            except Exception as e:
+            if save_results:
+                self._save_sweep_result(result, i)
+
+        return results
+
+    def edit_distance_spectrum(
+        self,
+        sequence: List[str],
+        max_distance: int = 3,
+        perturbation_types: Tuple[str, ...] = ("substitute",),
+        sample_size: Optional[int] = None,
+        max_iterations: int = 50000,
+        max_workers: Optional[int] = None,
+        periods: Optional[Dict[str, Optional[int]]] = None
+    ) -> EditSpectrum:
+        """Measure how period ratios grow with the number of edits.
+
+        The neighborhood is grown one edit at a time: the shell at distance r
+        is every single-edit neighbor (see neighbors()) of the shell at r-1
+        that is not closer to the base. Each shell is built from the previous
+        one only, and periods are memoized across shells (and across calls,
+        via `periods`), so the cost follows the number of distinct sequences,
+        not the number of edit paths to them.
+
+        Args:
+            sequence: Base move sequence
+            max_distance: Largest edit distance R
+            perturbation_types: Edits allowed (default: substitutions only,
+                i.e. Hamming distance)
+            sample_size: Evaluate at most this many sequences per shell, drawn
+                uniformly (shells are still enumerated in full)
+            max_iterations: Max iterations per trajectory
+            max_workers: Parallel evaluations (default: CPU count)
+            periods: Memo of canonical key -> period, updated in place
+
+        Returns:
+            EditSpectrum with one entry per distance 1..max_distance
+
+        Raises:
+            ValueError: If the base sequence cannot be evaluated
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        if periods is None:
+            periods = {}
+        periods.update(self.evaluate_periods(
+            [s for s in [sequence] if canonical_key(s) not in periods], max_iterations, max_workers
+        ))
+        base_period = periods.get(canonical_key(sequence))
+        if base_period is None:
+            raise ValueError("Base sequence failed or found no cycle")
+
+        print(f"\nEdit-distance spectrum for: {' → '.join(sequence)} (period={base_period:,})")
+
+        spectrum = EditSpectrum(sequence, base_period, [], [], [])
+        seen = {tuple(sequence)}
+        shell = [sequence]
+        for distance in range(1, max_distance + 1):
+            next_shell = []
+            for seq in shell:
+                for perturbation_type in perturbation_types:
+                    for neighbor in self.neighbors(seq, perturbation_type)[0]:
+                        if tuple(neighbor) not in seen:
+                            seen.add(tuple(neighbor))
+                            next_shell.append(neighbor)
+            shell = next_shell
+            if not shell:
+                break
+
+            members = shell
+            if sample_size is not None and len(shell) > sample_size:
+                members = random.sample(shell, sample_size)
+            periods.update(self.evaluate_periods(
+                [s for s in members if canonical_key(s) not in periods], max_iterations, max_workers
+            ))
+
+            log_ratios = [
+                abs(np.log(periods[key] / base_period))
+                for key in map(canonical_key, members)
+                if periods.get(key) is not None
+            ]
+            mean = float(np.mean(log_ratios)) if log_ratios else float("nan")
+            spectrum.shell_sizes.append(len(shell))
+            spectrum.evaluated.append(len(log_ratios))
+            spectrum.mean_log_ratio.append(mean)
+            print(f"  r={distance}: {len(shell):,} sequences ({len(log_ratios):,} evaluated), "
+                  f"mean log ratio = {mean:.3f}")
+
+        return spectrum
+
+    def _fan_out(
+        self,
+        plans: List[Tuple[List[str], List[List[str]], Optional[List[float]]]],
+        periods: Dict[str, Optional[int]],
+        save_results: bool = True,
+        journal: Optional[RunJournal] = None,
+        indices: Optional[List[int]] = None
+    ) -> List[Optional[LyapunovResult]]:
+        """Compute each planned sequence's λ from evaluated periods.
+
+        Results are saved (numbered by `indices`, default 1, 2, ...) and
+        journaled as requested. A sequence that cannot be analyzed gets None.
+        """
+        if indices is None:
+            indices = list(range(1, len(plans) + 1))
+
+        results = []
+        for i, (seq, perturbations, weights) in zip(indices, plans):
+            try:
+                result = self.result_from_periods(seq, perturbations, periods, weights)
+            except ValueError as e:
                 print(f"ERROR: Failed to analyze {' → '.join(seq)}: {e}")
+                results.append(None)
                 continue
 
+            results.append(result)
+
+            if journal is not None:
+                journal.record_result(seq, asdict(result))
+            if save_results:
+                self.save_result(result, i)
+
         return results
 
     def analyze_from_logs(
@@ -414,7 +1082,7 @@ class LyapunovAnalyzer:
             n_perturbations=n_perturbations
         )
 
-    def _save_result(self, result: LyapunovResult, index: int):
+    def save_result(self, result: LyapunovResult, index: int):
         """Save a single result to JSON."""
         seq_name = "_".join(result.sequence)
         filename = f"lyapunov_{index:03d}_{seq_name}.json"
@@ -440,6 +1108,31 @@ class LyapunovAnalyzer:
         with open(filepath, 'w') as f:
             json.dump(data, f, indent=2)
 
+    def _save_sweep_result(self, result: LyapunovSweepResult, index: int):
+        """Save a single sweep result to JSON."""
+        seq_name = "_".join(result.sequence)
+        filepath = self.output_dir / f"lyapunov_sweep_{index:03d}_{seq_name}.json"
+
+        data = {
+            'move_sequence': result.sequence,
+            'base_period': result.base_period,
+            'lyapunov_exponent': result.lyapunov_exponent,
+            'classification': result.classification,
+            'by_type': {
+                perturbation_type: {
+                    'lyapunov_exponent': r.lyapunov_exponent,
+                    'classification': r.classification,
+                    'perturbations_tested': r.perturbations_tested,
+                    'period_ratios': r.period_ratios,
+                    'divergence_scores': r.divergence_scores,
+                }
+                for perturbation_type, r in result.by_type.items()
+            }
+        }
+
+        with open(filepath, 'w') as f:
+            json.dump(data, f, indent=2)
+
     def generate_summary_report(
         self,
         results: List[LyapunovResult]
@@ -447,109 +1140,45 @@ class LyapunovAnalyzer:
         """Generate summary statistics from results.
 
         Args:
-            results: List of LyapunovResult objects
+            results: List of LyapunovResult objects, or a LyapunovTable
 
         Returns:
             Summary dictionary
         """
-        if not results:
-            return {}
-
-        # Group by sequence length
-        by_length = defaultdict(list)
-        for r in results:
-            by_length[len(r.sequence)].append(r)
-
-        # Overall statistics
-        exponents = [r.lyapunov_exponent for r in results]
-        classifications = [r.classification for r in results]
-
-        summary = {
-            'total_sequences': len(results),
-            'overall': {
-                'mean_lambda': float(np.mean(exponents)),
-                'median_lambda': float(np.median(exponents)),
-                'std_lambda': float(np.std(exponents)),
-                'min_lambda': float(np.min(exponents)),
-                'max_lambda': float(np.max(exponents)),
-            },
-            'classifications': {
-                'trivial': classifications.count('trivial'),
-                'weakly_chaotic': classifications.count('weakly_chaotic'),
-                'strongly_chaotic': classifications.count('strongly_chaotic'),
-                'extremely_chaotic': classifications.count('extremely_chaotic'),
-            },
-            'by_length': {}
-        }
-
-        # By length statistics
-        for length, length_results in sorted(by_length.items()):
-            length_exponents = [r.lyapunov_exponent for r in length_results]
-            summary['by_length'][length] = {
-                'count': len(length_results),
-                'mean_lambda': float(np.mean(length_exponents)),
-                'median_lambda': float(np.median(length_exponents)),
-                'max_lambda': float(np.max(length_exponents)),
-                'most_chaotic': {
-                    'sequence': ' → '.join(max(length_results,
-                                             key=lambda r: r.lyapunov_exponent).sequence),
-                    'lambda': float(max(length_exponents))
-                }
-            }
-
-        return summary
+        return LyapunovTable.from_results(results).summary()
 
     def export_to_csv(self, results: List[LyapunovResult],
                      output_file: Optional[Path] = None):
         """Export results to CSV for Octave/MATLAB analysis.
 
         Args:
-            results: List of LyapunovResult objects
+            results: List of LyapunovResult objects, or a LyapunovTable
             output_file: Path to output CSV (default: logs/lyapunov_data.csv)
         """
         if output_file is None:
             output_file = self.output_dir / "lyapunov_data.csv"
 
-        import csv
-
-        with open(output_file, 'w', newline='') as f:
-            writer = csv.writer(f)
-
-            # Header
-            writer.writerow([
-                'sequence',
-                'sequence_length',
-                'base_period',
-                'lyapunov_exponent',
-                'classification',
-                'perturbations_tested',
-                'mean_ratio',
-                'std_ratio',
-                'max_ratio',
-                'mean_divergence',
-                'max_divergence'
-            ])
-
-            # Data rows
-            for r in results:
-                writer.writerow([
-                    ' → '.join(r.sequence),
-                    len(r.sequence),
-                    r.base_period,
-                    r.lyapunov_exponent,
-                    r.classification,
-                    r.perturbations_tested,
-                    float(np.mean(r.period_ratios)),
-                    float(np.std(r.period_ratios)),
-                    float(np.max(r.period_ratios)),
-                    float(np.mean(r.divergence_scores)),
-                    float(np.max(r.divergence_scores))
-                ])
+        LyapunovTable.from_results(results).to_csv(output_file)
 
         print(f"CSV data exported to: {output_file}")
 
+    def export_to_parquet(self, results: List[LyapunovResult],
+                          output_file: Optional[Path] = None):
+        """Export results to Parquet (same columns as export_to_csv; needs pyarrow).
+
+        Args:
+            results: List of LyapunovResult objects, or a LyapunovTable
+            output_file: Path to output file (default: logs/lyapunov_data.parquet)
+        """
+        if output_file is None:
+            output_file = self.output_dir / "lyapunov_data.parquet"
+
+        LyapunovTable.from_results(results).to_parquet(output_file)
+
+        print(f"Parquet data exported to: {output_file}")
+
     def print_summary(self, results: List[LyapunovResult]):
-        """Print formatted summary of results."""
+        """Print formatted summary of results (a list or a LyapunovTable)."""
         if not results:
             print("\n" + "="*70)
             print("LYAPUNOV EXPONENT ANALYSIS SUMMARY")
@@ -558,7 +1187,9 @@ class LyapunovAnalyzer:
             print("="*70)
             return
 
-        summary = self.generate_summary_report(results)
+        # Columnar once, for both the summary and the CSV export
+        table = LyapunovTable.from_results(results)
+        summary = table.summary()
 
         print("\n" + "="*70)
         print("LYAPUNOV EXPONENT ANALYSIS SUMMARY")
@@ -596,7 +1227,7 @@ class LyapunovAnalyzer:
         print(f"\nSummary saved to: {summary_file}")
 
         # Export CSV for Octave
-        self.export_to_csv(results)
+        self.export_to_csv(table)
 
 
 def main():
@@ -613,19 +1244,88 @@ def main():
     parser.add_argument("--n-perturbations", type=int, default=10,
                        help="Number of perturbations per sequence")
     parser.add_argument("--perturbation-type",
-                       choices=["substitute", "swap", "insert", "delete"],
+                       choices=[*PERTURBATION_TYPES, "all"],
                        default="substitute",
-                       help="Type of perturbation to apply")
+                       help="Type of perturbation to apply ('all': every type from one "
+                            "evaluation pool, reporting per-type and combined λ)")
+    parser.add_argument("--exhaustive", action="store_true",
+                       help="Evaluate every single-edit neighbor for an exact λ "
+                            "(ignores --n-perturbations)")
+    parser.add_argument("--adaptive", action="store_true",
+                       help="Sample --n-perturbations per round until λ's confidence "
+                            "interval is narrow enough or its class is decided")
+    parser.add_argument("--ci-width", type=float, default=0.5,
+                       help="Adaptive mode: target confidence interval width (default: 0.5)")
+    parser.add_argument("--confidence", type=float, default=0.95,
+                       help="Adaptive mode: confidence level (default: 0.95)")
+    parser.add_argument("--max-perturbations", type=int, default=100,
+                       help="Adaptive mode: most perturbations per sequence (default: 100)")
+    parser.add_argument("--journal", type=Path,
+                       help="Append progress to this journal file and resume from it "
+                            "if it already exists")
+    parser.add_argument("--spectrum", type=int, metavar="R",
+                       help="Instead of λ, measure the mean log period ratio at edit "
+                            "distance 1..R (uses --perturbation-type edits, 'all' for any)")
+    parser.add_argument("--spectrum-samples", type=int,
+                       help="Spectrum mode: evaluate at most this many sequences per distance")
+    parser.add_argument("--landscape", type=Path,
+                       help="Compute exact λ of every --length sequence from this period "
+                            "landscape directory (see build_landscape.py)")
+    parser.add_argument("--length", type=int, default=2,
+                       help="Landscape mode: sequence length (default: 2)")
     parser.add_argument("--max-sequences", type=int,
                        help="Maximum sequences to analyze from logs")
     parser.add_argument("--parallel", action="store_true",
                        help="Run perturbations in parallel for ~5-10x speedup")
-    parser.add_argument("--max-workers", type=int, default=8,
-                       help="Maximum parallel workers (default: 8)")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1,
+                       help="Size of the shared evaluation pool (default: CPU count)")
+    parser.add_argument("--backend", choices=BACKENDS, default="cargo",
+                       help="How sequences are evaluated: one cargo run each, warm ctrl "
+                            "--serve workers, the in-process ctrl extension, or exact "
+                            "periods from twist permutations")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Always re-evaluate instead of using the on-disk result cache")
 
     args = parser.parse_args()
 
-    analyzer = LyapunovAnalyzer()
+    if args.perturbation_type == "all" and (args.adaptive or args.journal):
+        parser.error("--perturbation-type all does not support --adaptive or --journal")
+    if args.spectrum and args.journal:
+        parser.error("--spectrum does not support --journal")
+
+    if args.landscape:
+        # Exact λ for every sequence of one length; nothing is evaluated
+        landscape = PeriodLandscape.load(args.landscape)
+        analyzer = LyapunovAnalyzer(runner=CtrlRunner())  # never run
+        types = PERTURBATION_TYPES if args.perturbation_type == "all" else [args.perturbation_type]
+        exponents = np.mean([analyzer.landscape_lyapunov(landscape, args.length, t)
+                             for t in types], axis=0)
+        output_file = args.landscape / f"lambda_{args.perturbation_type}_{args.length}.npy"
+        np.save(output_file, exponents)
+        print(f"λ of all {exponents.size:,} {args.length}-move sequences saved to: {output_file}")
+
+        flat = np.nan_to_num(exponents, nan=-np.inf).reshape(-1)
+        print("Most chaotic:")
+        for i in np.argsort(-flat, kind="stable")[:10]:
+            seq = landscape.sequence(np.unravel_index(i, exponents.shape))
+            print(f"  {' → '.join(seq)}: λ = {flat[i]:.3f}")
+        return
+
+    runner = make_runner(args.backend, workers=args.max_workers, cache=not args.no_cache)
+    analyzer = LyapunovAnalyzer(runner=runner)
+
+    journal = None
+    if args.journal:
+        journal = RunJournal(args.journal, params={
+            "perturbation_type": args.perturbation_type,
+            "n_perturbations": args.n_perturbations,
+            "exhaustive": args.exhaustive,
+            "adaptive": args.adaptive,
+            "ci_width": args.ci_width,
+            "confidence": args.confidence,
+            "max_perturbations": args.max_perturbations,
+            "backend": args.backend,
+        })
 
     if args.from_logs:
         # Analyze from existing logs
@@ -646,22 +1346,9 @@ def main():
                 print(f"Warning: Could not load {json_file}: {e}")
 
         print(f"Loaded {len(sequences)} sequences")
-        results = analyzer.analyze_sequence_batch(
-            sequences,
-            n_perturbations=args.n_perturbations,
-            parallel=args.parallel,
-            max_workers=args.max_workers
-        )
     elif args.sequences:
         # Analyze specific sequences
         sequences = [seq.split(',') for seq in args.sequences]
-        results = analyzer.analyze_sequence_batch(
-            sequences,
-            n_perturbations=args.n_perturbations,
-            perturbation_type=args.perturbation_type,
-            parallel=args.parallel,
-            max_workers=args.max_workers
-        )
     else:
         # Default: analyze a few interesting sequences
         print("No input specified. Analyzing default sequences...")
@@ -671,13 +1358,49 @@ def main():
             ["OF", "OU"],           # Low period (6)
             ["FR", "UF", "OR", "RO"],  # Record period (41,496)
         ]
+
+    if args.spectrum:
+        types = PERTURBATION_TYPES if args.perturbation_type == "all" else (args.perturbation_type,)
+        memo: Dict[str, Optional[int]] = {}
+        for seq in sequences:
+            spectrum = analyzer.edit_distance_spectrum(
+                seq, args.spectrum, types, args.spectrum_samples,
+                max_workers=args.max_workers if args.parallel else 1, periods=memo
+            )
+            spectrum_file = analyzer.output_dir / f"lyapunov_spectrum_{'_'.join(seq)}.json"
+            with open(spectrum_file, 'w') as f:
+                json.dump(asdict(spectrum), f, indent=2)
+        runner.close()
+        return
+
+    if args.perturbation_type == "all":
+        sweep = analyzer.analyze_perturbation_sweep(
+            sequences,
+            n_perturbations=args.n_perturbations,
+            parallel=args.parallel,
+            max_workers=args.max_workers,
+            exhaustive=args.exhaustive
+        )
+        results = [r.combined() for r in sweep]
+    else:
         results = analyzer.analyze_sequence_batch(
             sequences,
             n_perturbations=args.n_perturbations,
+            perturbation_type=args.perturbation_type,
             parallel=args.parallel,
-            max_workers=args.max_workers
+            max_workers=args.max_workers,
+            exhaustive=args.exhaustive,
+            adaptive=args.adaptive,
+            ci_width=args.ci_width,
+            confidence=args.confidence,
+            max_perturbations=args.max_perturbations,
+            journal=journal
         )
 
+    runner.close()
+    if journal is not None:
+        journal.close()
+
     # Print summary
     analyzer.print_summary(results)
 
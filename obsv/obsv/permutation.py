@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Exact period computation from ctrl's twist permutations.
+
+Every move permutes the puzzle's pieces and rotates the pieces it grips, so
+one iteration of a move sequence is itself a permutation of pieces, each
+carrying an accumulated rotation. The trajectory is purely periodic (the
+transient is always 0) and its period is the LCM, over the cycles of that
+permutation, of cycle length times the order of the rotation a piece picks
+up going once around its cycle.
+
+ctrl's state hash distinguishes a piece's motor from its negation, so
+rotations are tracked in the Spin double cover of the rotation group: a
+single quarter twist has period 8, not 4. The finite group generated by the
+twists is closed once into integer ids with a multiplication table, which
+makes sequence evaluation pure integer indexing.
+"""
+
+import hashlib
+import json
+import time
+from math import sqrt
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .ctrl_runner import CtrlRunner, source_version
+
+
+def _blade_product(a: int, b: int) -> Tuple[int, int]:
+    """Product of two basis blades (as axis bitmasks): (sign, blade)."""
+    sign = 1
+    x = a >> 1
+    while x:
+        if bin(x & b).count("1") % 2:
+            sign = -sign
+        x >>= 1
+    return sign, a ^ b
+
+
+def _quantize(values: np.ndarray) -> np.ndarray:
+    """Round rotor coefficients to integers so equal rotors compare equal."""
+    return np.rint(values * 1e6).astype(np.int64)
+
+
+# Periods found by walking trajectories with ctrl (docs/PERIOD_DISCOVERIES.md).
+# A twist table is built from twist names, so these catch a wrong axis or
+# direction convention: reversing the twists of any facet they grip (R, L, U,
+# F, O) changes at least one of them.
+REFERENCE_PERIODS = {
+    "ft_hypercube:3": [
+        (["FR"], 8),
+        (["FR", "UF"], 10080),
+        (["OF", "OU"], 6),
+        (["OF", "OU", "OR"], 4),
+        (["FR", "UF", "OR"], 2160),
+        (["FR", "OR", "UF"], 7920),
+        (["FR", "UF", "OR", "RO"], 41496),
+        (["FR", "UF", "FU", "RF"], 1680),
+        (["FR", "UO", "UF", "OR", "RO"], 27720),
+        (["FR", "UF", "UR", "FO", "LU"], 720),
+    ],
+}
+
+
+def load_twist_table(runner: Optional[CtrlRunner] = None,
+                     cache_path: Optional[Path] = None) -> Dict:
+    """Export the twist table from ctrl, or load it from its cache file.
+
+    Args:
+        runner: CtrlRunner used to build and run ctrl (default: a new one)
+        cache_path: Where the table is cached. Defaults to
+            logs/twists_<puzzle>.json; if it exists and was exported from
+            the current ctrl sources, ctrl is not run.
+    """
+    if runner is None:
+        runner = CtrlRunner()
+    if cache_path is None:
+        name = runner.PUZZLE_ID.replace(":", "_")
+        cache_path = Path(__file__).parent.parent / "logs" / f"twists_{name}.json"
+
+    version = source_version(runner.ctrl_path)
+    if cache_path.exists():
+        with open(cache_path) as f:
+            table = json.load(f)
+        if table.get("ctrl_version") == version:
+            return table
+
+    table = runner.export_twists()
+    table["ctrl_version"] = version
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(cache_path, 'w') as f:
+        json.dump(table, f)
+    return table
+
+
+def move_codes(twists: List[Dict]) -> Dict[str, int]:
+    """Map move names (including primed names) to indices into `twists`."""
+    codes = {t["name"]: i for i, t in enumerate(twists)}
+    for t in twists:
+        if t["reverse"] in codes:
+            for prime in ("'", "’"):
+                codes[t["name"] + prime] = codes[t["reverse"]]
+    return codes
+
+
+class PermutationEngine:
+    """Compute exact periods of move sequences without walking trajectories.
+
+    Drop-in replacement for CtrlRunner.run_sequence, for the quarter twists
+    exported by `ctrl --export-twists`.
+    """
+
+    # Identifies the evaluation method in result caches; each instance's
+    # ENGINE_VERSION hashes its twist table and this module's source
+    ENGINE = "permutation"
+
+    def __init__(self, table: Dict):
+        """Build the engine from a twist table.
+
+        Args:
+            table: Twist table as exported by `ctrl --export-twists`
+        """
+        self.puzzle_id = table["puzzle_id"]
+        self.puzzle_name = table["puzzle_name"]
+        self.dimension = table["dimension"]
+        self.num_pieces = len(table["pieces"])
+
+        digest = hashlib.sha256(json.dumps(table, sort_keys=True).encode())
+        digest.update(Path(__file__).read_bytes())
+        self.ENGINE_VERSION = digest.hexdigest()[:16]
+
+        twists = table["twists"]
+        self.moves: List[str] = [t["name"] for t in twists]
+        self._codes = move_codes(twists)
+
+        self._build_group(twists)
+
+        # One extra code that leaves everything in place, used to pad
+        # sequences of different lengths into one array
+        self.identity_code = len(twists)
+        pieces = np.arange(self.num_pieces)
+        outer = table["layers"] - 1
+        positions = np.array(table["pieces"])
+
+        self._dest = np.tile(pieces, (len(twists) + 1, 1))
+        self._mask = np.zeros((len(twists) + 1, self.num_pieces), dtype=bool)
+        for i, t in enumerate(twists):
+            self._dest[i] = t["permutation"]
+            self._mask[i] = positions[:, t["axis"]] == t["sign"] * outer
+
+    def _build_group(self, twists: List[Dict]):
+        """Close the rotors of all twists into a finite group of integer ids."""
+        blades = [b for b in range(1 << self.dimension) if bin(b).count("1") % 2 == 0]
+        blade_index = {b: i for i, b in enumerate(blades)}
+        k = len(blades)
+
+        # Structure constants of the even Clifford algebra
+        structure = np.zeros((k, k, k))
+        for i, a in enumerate(blades):
+            for j, b in enumerate(blades):
+                sign, c = _blade_product(a, b)
+                structure[i, j, blade_index[c]] = sign
+
+        # A quarter turn taking axis c toward axis d is the rotor (1 + e_d e_c) / sqrt(2)
+        generators = []
+        for t in twists:
+            c, d = t["plane"]
+            sign, blade = _blade_product(1 << d, 1 << c)
+            rotor = np.zeros(k)
+            rotor[0] = sqrt(0.5)
+            rotor[blade_index[blade]] = sqrt(0.5) * sign * t["direction"]
+            generators.append(rotor)
+
+        identity = np.zeros(k)
+        identity[0] = 1.0
+        elements = [identity]
+        ids = {tuple(_quantize(identity)): 0}
+        frontier = [identity]
+        while frontier:
+            next_frontier = []
+            for element in frontier:
+                for rotor in generators:
+                    product = np.einsum("i,j,ijk->k", rotor, element, structure)
+                    key = tuple(_quantize(product))
+                    if key not in ids:
+                        ids[key] = len(elements)
+                        elements.append(product)
+                        next_frontier.append(product)
+            frontier = next_frontier
+
+        group = np.array(elements)
+        size = len(group)
+
+        # Multiplication table: look every product up among the elements at once
+        products = np.einsum("ai,bj,ijk->abk", group, group, structure).reshape(-1, k)
+        _, inverse = np.unique(
+            np.vstack([_quantize(group), _quantize(products)]), axis=0, return_inverse=True
+        )
+        inverse = inverse.ravel()
+        element_of = np.empty(inverse.max() + 1, dtype=np.intp)
+        element_of[inverse[:size]] = np.arange(size)
+        self._mul = element_of[inverse[size:]].reshape(size, size)
+
+        self._order = np.zeros(size, dtype=np.int64)
+        power = np.arange(size)
+        for exponent in range(1, size + 1):
+            self._order[(power == 0) & (self._order == 0)] = exponent
+            if self._order.all():
+                break
+            power = self._mul[power, np.arange(size)]
+
+        self._rotor = np.array(
+            [ids[tuple(_quantize(g))] for g in generators] + [0], dtype=np.intp
+        )
+        self.group_size = size
+
+    @classmethod
+    def load(cls, path: Path) -> "PermutationEngine":
+        """Load an engine from a twist table file written by ctrl --export-twists."""
+        with open(path) as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def from_ctrl(cls, runner: Optional[CtrlRunner] = None,
+                  cache_path: Optional[Path] = None) -> "PermutationEngine":
+        """Export the twist table from ctrl (once) and build an engine.
+
+        See load_twist_table for the arguments.
+
+        Raises:
+            RuntimeError: If the engine disagrees with REFERENCE_PERIODS
+        """
+        engine = cls(load_twist_table(runner, cache_path))
+        mismatches = engine.check_reference_periods()
+        if mismatches:
+            details = ", ".join(f"{','.join(seq)}: {got} (expected {expected})"
+                                for seq, got, expected in mismatches)
+            raise RuntimeError(f"Twist table disagrees with trajectory periods: {details}")
+        return engine
+
+    def check_reference_periods(self) -> List[Tuple[List[str], int, int]]:
+        """Compare periods against REFERENCE_PERIODS for this puzzle.
+
+        Returns:
+            (sequence, engine period, reference period) for every disagreement
+        """
+        reference = REFERENCE_PERIODS.get(self.puzzle_id, [])
+        if not reference:
+            return []
+        sequences = [seq for seq, _ in reference]
+        periods = self.periods(self.encode(sequences))
+        return [(seq, int(period), expected)
+                for (seq, expected), period in zip(reference, periods)
+                if period != expected]
+
+    def encode(self, sequences: List[List[str]]) -> np.ndarray:
+        """Encode move sequences as a padded array of move codes.
+
+        Returns:
+            Array of shape (len(sequences), longest sequence), padded with
+            identity_code
+
+        Raises:
+            ValueError: If a move is not in the twist table
+        """
+        width = max((len(seq) for seq in sequences), default=0)
+        codes = np.full((len(sequences), width), self.identity_code, dtype=np.intp)
+        for row, seq in enumerate(sequences):
+            for col, move in enumerate(seq):
+                code = self._codes.get(move.strip())
+                if code is None:
+                    raise ValueError(f"Unknown move: '{move}'")
+                codes[row, col] = code
+        return codes
+
+    def translate(self, codes: np.ndarray, alphabet: List[str]) -> np.ndarray:
+        """Translate move codes over an alphabet into this engine's codes.
+
+        Lets arrays from MoveGenerator.random_codes (indices into
+        COMMON_MOVES or MOVES, padded with MoveGenerator.PAD) go straight
+        to periods without building move strings.
+
+        Raises:
+            ValueError: If a move of the alphabet is not in the twist table
+        """
+        lookup = np.full(256, self.identity_code, dtype=np.intp)
+        lookup[:len(alphabet)] = self.encode([alphabet])[0]
+        return lookup[codes]
+
+    def periods(self, codes: np.ndarray) -> np.ndarray:
+        """Compute the periods of many encoded sequences at once.
+
+        Args:
+            codes: Array of move codes, one sequence per row (see encode)
+
+        Returns:
+            Array of periods, one per row
+        """
+        codes = np.asarray(codes, dtype=np.intp)
+        if codes.ndim == 1:
+            codes = codes[None, :]
+        batch = codes.shape[0]
+        pieces = np.arange(self.num_pieces)
+
+        # Apply one iteration: where each piece ends up and the rotor it carries
+        position = np.tile(pieces, (batch, 1))
+        rotor = np.zeros((batch, self.num_pieces), dtype=np.intp)
+        for col in range(codes.shape[1]):
+            move = codes[:, col, None]
+            gripped = self._mask[move, position]
+            rotor = np.where(gripped, self._mul[self._rotor[move], rotor], rotor)
+            position = self._dest[move, position]
+
+        # Walk every cycle of the iteration's permutation, accumulating rotors
+        cycle_length = np.zeros((batch, self.num_pieces), dtype=np.int64)
+        cycle_rotor = np.zeros((batch, self.num_pieces), dtype=np.intp)
+        at = position.copy()
+        carried = rotor.copy()
+        for length in range(1, self.num_pieces + 1):
+            closed = (at == pieces) & (cycle_length == 0)
+            cycle_length[closed] = length
+            cycle_rotor[closed] = carried[closed]
+            if cycle_length.all():
+                break
+            carried = self._mul[np.take_along_axis(rotor, at, axis=1), carried]
+            at = np.take_along_axis(position, at, axis=1)
+
+        return np.lcm.reduce(cycle_length * self._order[cycle_rotor], axis=1)
+
+    def period(self, moves: List[str]) -> int:
+        """Compute the exact period of a single move sequence."""
+        return int(self.periods(self.encode([moves]))[0])
+
+    def run_sequence(
+        self,
+        moves: List[str],
+        max_iterations: int = 100000,
+        output_file: Optional[Path] = None,
+        timeout: int = 120
+    ) -> Dict:
+        """Compute a sequence's trajectory statistics.
+
+        Same interface and result fields as CtrlRunner.run_sequence, except
+        that the period is always found: periods above max_iterations are
+        returned exactly (ctrl would report None). `max_iterations` is only
+        recorded and `timeout` is ignored.
+
+        Raises:
+            RuntimeError: If a move is not in the twist table
+        """
+        start = time.perf_counter()
+        if not moves:
+            raise RuntimeError("CTRL failed for sequence []: Empty move string")
+        try:
+            codes = self.encode([moves])
+        except ValueError as e:
+            raise RuntimeError(f"CTRL failed for sequence {moves}: {e}")
+        period = int(self.periods(codes)[0])
+
+        result = {
+            "puzzle_id": self.puzzle_id,
+            "puzzle_name": self.puzzle_name,
+            "dimension": self.dimension,
+            "move_sequence": [self.moves[c] for c in codes[0]],
+            "period": period,
+            "transient_length": 0,
+            "unique_states_visited": period,
+            "max_iterations": max_iterations,
+            "reached_cycle": True,
+            "exploration_time_ms": int((time.perf_counter() - start) * 1000),
+        }
+
+        if output_file is not None:
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_file, 'w') as f:
+                json.dump(result, f, indent=2)
+
+        return result
+
+    def close(self):
+        """No-op; present so all backends can be closed the same way."""
+
+    def verify_against(self, runner, sequences: List[List[str]],
+                       max_iterations: int = 100000) -> List[Tuple[List[str], int, int]]:
+        """Cross-check periods against a trajectory-walking runner.
+
+        Sequences for which the runner found no cycle are skipped.
+
+        Returns:
+            (sequence, engine period, runner period) for every disagreement
+        """
+        mismatches = []
+        expected = self.periods(self.encode(sequences))
+        for seq, period in zip(sequences, expected):
+            result = runner.run_sequence(seq, max_iterations)
+            if result["reached_cycle"] and result["period"] != period:
+                mismatches.append((seq, int(period), result["period"]))
+        return mismatches
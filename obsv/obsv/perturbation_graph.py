@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Perturbation graph: sequences linked to their single-edit neighbors.
+
+Nodes are move sequences annotated with their period and, for the base
+sequences the graph was built from, their exact λ. Each base has an edge to
+every distinct single-edit neighbor (see LyapunovAnalyzer.neighbors),
+labeled with the edit type and the log period ratio log(P_neighbor / P_base).
+
+Edges are stored in compressed sparse row form: the out-edges of node i are
+indices[indptr[i]:indptr[i + 1]], with edit_type and log_ratio alongside.
+Every array is saved as its own .npy file, so a stored graph is opened
+memory-mapped with no copy, and queries (high-λ regions, period class
+boundaries, divergence statistics) are array operations instead of a pass
+over lyapunov_*.json files.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .canonical import canonical_key
+from .lyapunov import PERTURBATION_TYPES, LyapunovAnalyzer
+
+ARRAYS = ("sequences", "period", "lyapunov", "indptr", "indices", "edit_type", "log_ratio")
+
+
+class PerturbationGraph:
+    """Sequences and their single-edit neighbors, as CSR arrays."""
+
+    def __init__(self, sequences: np.ndarray, period: np.ndarray, lyapunov: np.ndarray,
+                 indptr: np.ndarray, indices: np.ndarray, edit_type: np.ndarray,
+                 log_ratio: np.ndarray, perturbation_types: Tuple[str, ...] = PERTURBATION_TYPES):
+        """Wrap graph arrays (see build and load).
+
+        Args:
+            sequences: Comma-joined move sequence of each node
+            period: Period of each node (0 if it could not be evaluated)
+            lyapunov: λ of each node (NaN for nodes that are only neighbors)
+            indptr: len(sequences) + 1 offsets into the edge arrays
+            indices: Target node of each edge
+            edit_type: Index into perturbation_types of each edge
+            log_ratio: log(period[target] / period[source]) of each edge (NaN if unknown)
+            perturbation_types: Edit type names
+        """
+        self.sequences = sequences
+        self.period = period
+        self.lyapunov = lyapunov
+        self.indptr = indptr
+        self.indices = indices
+        self.edit_type = edit_type
+        self.log_ratio = log_ratio
+        self.perturbation_types = tuple(perturbation_types)
+        self._node_index: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def build(cls, analyzer: LyapunovAnalyzer, sequences: List[List[str]],
+              perturbation_types: Tuple[str, ...] = PERTURBATION_TYPES,
+              max_iterations: int = 50000, max_workers: Optional[int] = None
+              ) -> "PerturbationGraph":
+        """Evaluate base sequences and all their neighbors, and link them.
+
+        Every distinct sequence is evaluated once (see
+        LyapunovAnalyzer.evaluate_periods). A base's λ is its exact λ (as in
+        exhaustive mode), averaged over the perturbation types.
+
+        Args:
+            analyzer: Analyzer whose runner evaluates the sequences
+            sequences: Base sequences
+            perturbation_types: Edit types to link
+            max_iterations: Max iterations per trajectory
+            max_workers: Parallel evaluations (default: CPU count)
+        """
+        node_index: Dict[Tuple[str, ...], int] = {}
+        nodes: List[List[str]] = []
+
+        def node(seq: List[str]) -> int:
+            key = tuple(seq)
+            if key not in node_index:
+                node_index[key] = len(nodes)
+                nodes.append(seq)
+            return node_index[key]
+
+        for seq in sequences:
+            node(seq)
+        plans = [
+            (seq, {t: analyzer.neighbors(seq, t) for t in perturbation_types})
+            for seq in sequences
+        ]
+        for _, by_type in plans:
+            for neighbors, _ in by_type.values():
+                for neighbor in neighbors:
+                    node(neighbor)
+
+        print(f"Building perturbation graph: {len(sequences)} bases, {len(nodes)} nodes")
+        periods = analyzer.evaluate_periods(nodes, max_iterations,
+                                             max_workers or os.cpu_count() or 1)
+        period = np.array([periods.get(canonical_key(seq)) or 0 for seq in nodes], dtype=np.int64)
+        log_period = np.log(np.where(period > 0, period, np.nan))
+
+        lyapunov = np.full(len(nodes), np.nan)
+        counts = np.zeros(len(nodes), dtype=np.int64)
+        sources, targets, types = [], [], []
+        for seq, by_type in plans:
+            source = node_index[tuple(seq)]
+            if counts[source]:
+                continue  # Listed twice among the bases
+            exponents = []
+            for type_code, (neighbors, weights) in enumerate(by_type.values()):
+                try:
+                    exponents.append(analyzer.result_from_periods(
+                        seq, neighbors, periods, weights, quiet=True
+                    ).lyapunov_exponent)
+                except ValueError:
+                    pass
+                for target in dict.fromkeys(node_index[tuple(n)] for n in neighbors):
+                    sources.append(source)
+                    targets.append(target)
+                    types.append(type_code)
+                    counts[source] += 1
+            if exponents:
+                lyapunov[source] = np.mean(exponents)
+
+        # Bases are nodes 0, 1, ... and their edges were appended in that
+        # order, so the edge lists are already in CSR order
+        indices = np.array(targets, dtype=np.int64)
+        source_array = np.array(sources, dtype=np.int64)
+        indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+
+        return cls(
+            sequences=np.array([",".join(seq) for seq in nodes], dtype=str),
+            period=period,
+            lyapunov=lyapunov,
+            indptr=indptr,
+            indices=indices,
+            edit_type=np.array(types, dtype=np.int8),
+            log_ratio=log_period[indices] - log_period[source_array],
+            perturbation_types=perturbation_types,
+        )
+
+    def save(self, directory: Path):
+        """Write each array as directory/<name>.npy, plus meta.json."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ARRAYS:
+            np.save(directory / f"{name}.npy", np.asarray(getattr(self, name)))
+        with open(directory / "meta.json", 'w') as f:
+            json.dump({"perturbation_types": list(self.perturbation_types),
+                       "nodes": len(self), "edges": self.num_edges}, f, indent=2)
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True) -> "PerturbationGraph":
+        """Open a graph written by save (memory-mapped, no copy, by default)."""
+        directory = Path(directory)
+        with open(directory / "meta.json") as f:
+            meta = json.load(f)
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r" if mmap else None)
+            for name in ARRAYS
+        }
+        return cls(**arrays, perturbation_types=tuple(meta["perturbation_types"]))
+
+    def __len__(self) -> int:
+        return len(self.sequences)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    @property
+    def sources(self) -> np.ndarray:
+        """Source node of each edge."""
+        return np.repeat(np.arange(len(self)), np.diff(self.indptr))
+
+    @property
+    def bases(self) -> np.ndarray:
+        """Nodes the graph was built from (those with out-edges)."""
+        return np.flatnonzero(np.diff(self.indptr))
+
+    def node(self, moves: List[str]) -> int:
+        """Node index of a sequence.
+
+        Raises:
+            KeyError: If the sequence is not in the graph
+        """
+        if self._node_index is None:
+            self._node_index = {seq: i for i, seq in enumerate(self.sequences.tolist())}
+        return self._node_index[",".join(moves)]
+
+    def sequence(self, node: int) -> List[str]:
+        return str(self.sequences[node]).split(",")
+
+    def neighbors(self, node: int) -> np.ndarray:
+        """Target nodes of a node's out-edges."""
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def adjacency(self, directed: bool = False):
+        """The graph as a scipy.sparse CSR matrix (edge values: edit type + 1)."""
+        from scipy.sparse import csr_matrix
+
+        matrix = csr_matrix(
+            (np.asarray(self.edit_type, dtype=np.int8) + 1, self.indices, self.indptr),
+            shape=(len(self), len(self))
+        )
+        return matrix if directed else matrix.maximum(matrix.T)
+
+    def high_lambda_regions(self, threshold: float = LyapunovAnalyzer.THRESHOLDS[1],
+                            min_size: int = 2) -> List[np.ndarray]:
+        """Connected regions of bases with λ >= threshold.
+
+        Two bases are connected when one is a single edit from the other.
+
+        Returns:
+            Node arrays, largest region first
+        """
+        from scipy.sparse.csgraph import connected_components
+
+        keep = np.flatnonzero(np.nan_to_num(self.lyapunov, nan=-np.inf) >= threshold)
+        if not len(keep):
+            return []
+        subgraph = self.adjacency()[keep][:, keep]
+        _, labels = connected_components(subgraph, directed=False)
+        regions = [keep[labels == label] for label in np.unique(labels)]
+        regions = [region for region in regions if len(region) >= min_size]
+        return sorted(regions, key=len, reverse=True)
+
+    def period_boundaries(self) -> np.ndarray:
+        """Edges that cross between period classes (neighbor period differs).
+
+        Returns:
+            Boolean mask over edges
+        """
+        known = (self.period[self.sources] > 0) & (self.period[self.indices] > 0)
+        return known & (self.period[self.sources] != self.period[self.indices])
+
+    def records(self) -> List[Dict]:
+        """One lyapunov_*.json-style record per base, for extended_analysis.
+
+        Fields: move_sequence, base_period, lyapunov_exponent, classification,
+        period_ratios and statistics (mean/max ratio and divergence).
+        """
+        bases = self.bases
+        ratios = np.exp(np.abs(np.asarray(self.log_ratio)))
+        divergence = np.abs(self.period[self.indices] - self.period[self.sources]).astype(np.float64)
+
+        records = []
+        for node in bases:
+            start, end = self.indptr[node], self.indptr[node + 1]
+            known = ~np.isnan(ratios[start:end])
+            node_ratios = ratios[start:end][known]
+            node_divergence = divergence[start:end][known]
+            if not len(node_ratios) or np.isnan(self.lyapunov[node]):
+                continue
+            records.append({
+                'move_sequence': self.sequence(node),
+                'base_period': int(self.period[node]),
+                'lyapunov_exponent': float(self.lyapunov[node]),
+                'classification': LyapunovAnalyzer.classify(float(self.lyapunov[node])),
+                'period_ratios': node_ratios.tolist(),
+                'statistics': {
+                    'mean_ratio': float(node_ratios.mean()),
+                    'max_ratio': float(node_ratios.max()),
+                    'mean_divergence': float(node_divergence.mean()),
+                    'max_divergence': float(node_divergence.max()),
+                }
+            })
+        return records
+
+
+def default_directory() -> Path:
+    return Path(__file__).parent.parent / "logs" / "perturbation_graph"
+
+
+def main():
+    """Build a perturbation graph from base sequences."""
+    import argparse
+    from itertools import product
+
+    from .ctrl_runner import BACKENDS, make_runner
+    from .landscape import ALPHABETS
+
+    parser = argparse.ArgumentParser(
+        description="Link sequences to their single-edit neighbors as a CSR graph"
+    )
+    parser.add_argument("--sequences", type=str, nargs="+",
+                       help="Base sequences (comma-separated moves)")
+    parser.add_argument("--length", type=int,
+                       help="Use every sequence of this length over --alphabet as a base")
+    parser.add_argument("--alphabet", choices=sorted(ALPHABETS), default="heatmap",
+                       help="Alphabet for --length (default: heatmap)")
+    parser.add_argument("--perturbation-types", nargs="+", choices=PERTURBATION_TYPES,
+                       default=list(PERTURBATION_TYPES),
+                       help="Edit types to link (default: all)")
+    parser.add_argument("--output", type=Path, default=default_directory(),
+                       help="Output directory (default: logs/perturbation_graph)")
+    parser.add_argument("--backend", choices=BACKENDS, default="cargo",
+                       help="How sequences are evaluated")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1,
+                       help="Parallel evaluations (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Always re-evaluate instead of using the on-disk result cache")
+
+    args = parser.parse_args()
+
+    if args.sequences:
+        sequences = [seq.split(',') for seq in args.sequences]
+    elif args.length:
+        sequences = [list(seq) for seq in product(ALPHABETS[args.alphabet], repeat=args.length)]
+    else:
+        parser.error("Give --sequences or --length")
+
+    runner = make_runner(args.backend, workers=args.max_workers, cache=not args.no_cache)
+    analyzer = LyapunovAnalyzer(runner=runner)
+    graph = PerturbationGraph.build(analyzer, sequences, tuple(args.perturbation_types),
+                                    max_workers=args.max_workers)
+    runner.close()
+
+    graph.save(args.output)
+    print(f"{len(graph):,} nodes, {graph.num_edges:,} edges saved to: {args.output}")
+
+    regions = graph.high_lambda_regions()
+    print(f"High-λ regions (λ ≥ {LyapunovAnalyzer.THRESHOLDS[1]}): {len(regions)}"
+          + (f", largest has {len(regions[0])} sequences" if regions else ""))
+    boundaries = graph.period_boundaries()
+    print(f"Edges crossing period classes: {int(boundaries.sum()):,}/{graph.num_edges:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,31 +4,37 @@ Random sequence testing suite for chaos detection and statistical analysis.
 """
 
 import json
+import os
 import time
 import random
 from pathlib import Path
-from typing import List, Dict, Tuple
-from collections import defaultdict
+from typing import List, Dict, Optional, Tuple, Union
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import numpy as np
 
-from .ctrl_runner import CtrlRunner, MoveGenerator
+from .campaign import FORMATS, run_campaign
+from .canonical import canonical_key
+from .ctrl_runner import BACKENDS, CtrlRunner, MoveGenerator, make_runner
+from .journal import RunJournal
+from .stats import PeriodStats, SequentialSignTest
 
 
 class RandomSequenceTester:
     """Test suite for random sequence analysis."""
 
-    def __init__(self, output_dir: Path = None):
+    def __init__(self, output_dir: Path = None, runner: CtrlRunner = None):
         """Initialize tester.
 
         Args:
             output_dir: Directory to save results
+            runner: Runner used to evaluate sequences (default: a cached CtrlRunner)
         """
         if output_dir is None:
             output_dir = Path(__file__).parent / "logs"
         self.output_dir = output_dir
         self.output_dir.mkdir(exist_ok=True, parents=True)
 
-        self.runner = CtrlRunner()
+        self.runner = runner if runner is not None else make_runner()
         self.generator = MoveGenerator()
 
     def test_random_batch(
@@ -37,7 +43,8 @@ class RandomSequenceTester:
         min_length: int = 2,
         max_length: int = 6,
         max_iterations: int = 50000,
-        save_results: bool = True
+        save_results: bool = True,
+        journal: Optional[RunJournal] = None
     ) -> List[Dict]:
         """Run a batch of random sequences.
 
@@ -47,29 +54,42 @@ class RandomSequenceTester:
             max_length: Maximum sequence length
             max_iterations: Max iterations per sequence
             save_results: Save individual JSON results
+            journal: Record the batch and each result as it finishes. If the
+                journal already holds a batch, that batch is resumed instead of
+                generating a new one, skipping completed sequences.
 
         Returns:
             List of result dictionaries
         """
-        print(f"Generating {count} random sequences...")
-        sequences = self.generator.generate_random_batch(
-            count, min_length, max_length,
-            allow_repeats=False  # More interesting sequences
-        )
+        if journal is not None and journal.batch is not None:
+            sequences = journal.batch
+            print(f"Resuming {len(sequences)} random sequences from {journal.path.name}...")
+        else:
+            print(f"Generating {count} random sequences...")
+            sequences = self.generator.generate_random_batch(
+                count, min_length, max_length,
+                allow_repeats=False,  # More interesting sequences
+                distinct=True  # Rotations/inverses share a period; test each class once
+            )
+            if journal is not None:
+                journal.record_batch(sequences)
 
         results = []
         start_time = time.time()
 
         for i, seq in enumerate(sequences, 1):
-            print(f"[{i}/{count}] Testing: {' → '.join(seq)}", end=" ... ")
+            if journal is not None and journal.result(seq) is not None:
+                results.append(journal.result(seq))
+                continue
+
+            print(f"[{i}/{len(sequences)}] Testing: {' → '.join(seq)}", end=" ... ")
 
             try:
-                # Generate unique filename
+                # Generate unique filename (results are kept in memory otherwise)
                 seq_name = "_".join(seq)
+                output_file = None
                 if save_results:
                     output_file = self.output_dir / f"results_random_{i:03d}_{seq_name}.json"
-                else:
-                    output_file = self.output_dir / "temp_random.json"
 
                 result = self.runner.run_sequence(
                     seq,
@@ -79,65 +99,157 @@ class RandomSequenceTester:
 
                 print(f"period={result['period']:,}")
                 results.append(result)
+                if journal is not None:
+                    journal.record_result(seq, result)
 
             except Exception as e:
                 print(f"FAILED: {e}")
                 continue
 
         elapsed = time.time() - start_time
-        print(f"\nCompleted {len(results)}/{count} sequences in {elapsed:.1f}s")
+        print(f"\nCompleted {len(results)}/{len(sequences)} sequences in {elapsed:.1f}s")
 
         return results
 
-    def analyze_chaos(self, sequences: List[List[str]], perturbation_size: int = 1,
-                     max_iterations: int = 50000) -> Dict:
+    def stream_random_batch(
+        self,
+        count: int,
+        output: Optional[Path] = None,
+        min_length: int = 2,
+        max_length: int = 6,
+        max_iterations: int = 50000,
+        chunk_size: Optional[int] = None,
+        max_workers: int = 1,
+        seed: Optional[int] = None
+    ) -> PeriodStats:
+        """Run a random campaign in constant memory (see campaign.py).
+
+        Unlike test_random_batch, results are not kept: each chunk of records
+        is appended to one shard file and folded into running statistics.
+
+        Args:
+            count: Number of random sequences to test
+            output: Shard file (.jsonl or .parquet; default:
+                output_dir/random_campaign.jsonl)
+            min_length: Minimum sequence length
+            max_length: Maximum sequence length
+            max_iterations: Max iterations per sequence
+            chunk_size: Sequences sampled and evaluated per step (default:
+                65536 for vectorized runners, 4096 otherwise)
+            max_workers: Parallel evaluations for non-vectorized runners
+            seed: Seed for reproducible campaigns
+
+        Returns:
+            Running statistics of the campaign's periods
+        """
+        if output is None:
+            output = self.output_dir / "random_campaign.jsonl"
+        print(f"Streaming {count:,} random sequences to {output}...")
+        start_time = time.time()
+        stats = run_campaign(self.runner, count, output, min_length, max_length,
+                             max_iterations, chunk_size, max_workers, seed=seed)
+        elapsed = time.time() - start_time
+        print(f"\nCompleted {stats.count:,}/{count:,} sequences in {elapsed:.1f}s")
+        return stats
+
+    def analyze_chaos(self, results: List, n_perturbations: int = 1,
+                     perturbation_size: int = 1, max_iterations: int = 50000,
+                     max_workers: Optional[int] = None) -> Dict:
         """Test for chaotic behavior via sensitivity analysis.
 
-        For each sequence, perturb it slightly and measure divergence.
+        Each sequence is perturbed slightly, several times, and the period
+        divergence is measured. Base periods are taken from already-evaluated
+        results instead of being run again; every perturbed sequence of the
+        whole batch (and any base given without a period) is then evaluated
+        in one pass through LyapunovAnalyzer's batch path, once per distinct
+        sequence.
 
         Args:
-            sequences: Base sequences to test
+            results: Results of test_random_batch (move_sequence and period),
+                or bare move sequences to evaluate first
+            n_perturbations: Perturbed variants per sequence
             perturbation_size: How many moves to change
             max_iterations: Max iterations per test
+            max_workers: Parallel evaluations (default: CPU count)
 
         Returns:
-            Dictionary with chaos metrics
+            Dictionary with chaos metrics. chaotic_perturbations counts
+            perturbations whose period ratio exceeds 2 (out of
+            perturbations_tested); chaotic_sequences_mean_ratio counts
+            sequences whose mean ratio exceeds 2 (out of total_tested)
         """
+        from .lyapunov import LyapunovAnalyzer
+
         print("Testing for chaotic behavior...")
 
+        bases = []
+        known = {}
+        for r in results:
+            seq = r['move_sequence'] if isinstance(r, dict) else list(r)
+            bases.append(seq)
+            if isinstance(r, dict) and r.get('period'):
+                known[canonical_key(seq)] = r['period']
+
+        plans = []
+        for seq in bases:
+            perturbations = []
+            for _ in range(n_perturbations):
+                # Perturb: change random moves
+                perturbed = seq.copy()
+                for idx in random.sample(range(len(seq)), min(perturbation_size, len(seq))):
+                    perturbed[idx] = random.choice(self.generator.COMMON_MOVES)
+                perturbations.append(perturbed)
+            plans.append(perturbations)
+
+        unevaluated = [seq for seq in bases if canonical_key(seq) not in known]
+        perturbed = [p for perturbations in plans for p in perturbations]
+        print(f"  {len(bases)} sequences, {len(perturbed)} perturbations, "
+              f"{len(unevaluated)} base periods to evaluate")
+        analyzer = LyapunovAnalyzer(output_dir=self.output_dir, runner=self.runner)
+        periods = analyzer.evaluate_periods(unevaluated + perturbed, max_iterations,
+                                             max_workers or os.cpu_count() or 1)
+        periods.update(known)
+
         divergences = []
         sensitivity_scores = []
-
-        for seq in sequences:
-            # Run original sequence
-            result_orig = self.runner.run_sequence(seq, max_iterations)
-
-            # Perturb: change one random move
-            perturbed = seq.copy()
-            idx = random.randint(0, len(seq) - 1)
-            perturbed[idx] = random.choice(self.generator.COMMON_MOVES)
-
-            # Run perturbed sequence
-            result_pert = self.runner.run_sequence(perturbed, max_iterations)
+        chaotic_by_mean = 0
+        tested = 0
+
+        for seq, perturbations in zip(bases, plans):
+            base = periods.get(canonical_key(seq))
+            pairs = [(base, periods.get(canonical_key(p))) for p in perturbations]
+            pairs = [(a, b) for a, b in pairs if a and b]
+            if not pairs:
+                print(f"  {' → '.join(seq)}: FAILED")
+                continue
 
             # Measure divergence
-            period_diff = abs(result_orig['period'] - result_pert['period'])
-            period_ratio = max(result_orig['period'], result_pert['period']) / \
-                          min(result_orig['period'], result_pert['period'])
+            base_periods, perturbed_periods = np.array(pairs, dtype=np.float64).T
+            ratios = (np.maximum(base_periods, perturbed_periods) /
+                      np.minimum(base_periods, perturbed_periods))
+            divergences.extend(np.abs(base_periods - perturbed_periods))
+            sensitivity_scores.extend(ratios)
+            tested += 1
+            if ratios.mean() > 2.0:
+                chaotic_by_mean += 1
 
-            divergences.append(period_diff)
-            sensitivity_scores.append(period_ratio)
+            print(f"  {' → '.join(seq)}: {base:,} → {len(ratios)} perturbed "
+                  f"(mean ratio: {ratios.mean():.2f}, max: {ratios.max():.2f})")
 
-            print(f"  {' → '.join(seq)}: {result_orig['period']} → {result_pert['period']} "
-                  f"(ratio: {period_ratio:.2f})")
+        if not tested:
+            raise ValueError("No sequence could be perturbed and evaluated")
 
         return {
             'mean_divergence': np.mean(divergences),
             'std_divergence': np.std(divergences),
             'mean_sensitivity': np.mean(sensitivity_scores),
             'max_sensitivity': np.max(sensitivity_scores),
-            'chaotic_sequences': sum(1 for s in sensitivity_scores if s > 2.0),
-            'total_tested': len(sequences)
+            # Perturbations with a >2x period ratio (what chaotic_sequences
+            # counted when every sequence got exactly one perturbation)
+            'chaotic_perturbations': int(np.sum(np.array(sensitivity_scores) > 2.0)),
+            'chaotic_sequences_mean_ratio': chaotic_by_mean,
+            'total_tested': tested,
+            'perturbations_tested': len(sensitivity_scores)
         }
 
     def compare_strategic_vs_random(self, random_results: List[Dict],
@@ -153,15 +265,7 @@ class RandomSequenceTester:
         """
         print("Comparing random vs strategic sequences...")
 
-        # Load strategic results
-        if strategic_file is None:
-            strategic_results = []
-            for json_file in self.output_dir.glob("results_[!r]*.json"):  # Exclude random_
-                try:
-                    with open(json_file) as f:
-                        strategic_results.append(json.load(f))
-                except:
-                    continue
+        strategic_results = self._load_strategic_results(strategic_file)
 
         random_periods = [r['period'] for r in random_results]
         strategic_periods = [r['period'] for r in strategic_results]
@@ -201,59 +305,174 @@ class RandomSequenceTester:
 
         return comparison
 
-    def analyze_period_distribution(self, results: List[Dict]) -> Dict:
-        """Analyze statistical properties of period distribution.
+    def _load_strategic_results(self, strategic_file: Path = None) -> List[Dict]:
+        """Curated results: a JSON file of results, or every non-random result in output_dir."""
+        if strategic_file is not None:
+            with open(strategic_file) as f:
+                data = json.load(f)
+            return data if isinstance(data, list) else [data]
+
+        strategic_results = []
+        for json_file in self.output_dir.glob("results_[!r]*.json"):  # Exclude random_
+            try:
+                with open(json_file) as f:
+                    strategic_results.append(json.load(f))
+            except:
+                continue
+        return strategic_results
+
+    def compare_strategic_vs_random_sequential(
+        self,
+        strategic_file: Path = None,
+        alpha: float = 0.05,
+        margin: float = 0.2,
+        max_draws: int = 100,
+        min_length: int = 2,
+        max_length: int = 6,
+        max_iterations: int = 50000,
+        max_workers: int = 1
+    ) -> Tuple[Dict, List[Dict]]:
+        """Compare random sequences against the strategic median, drawing only until decided.
+
+        This is a one-sample test against a fixed reference: each random
+        period is compared with the median of the strategic periods, and the
+        share of random periods above it is tracked by an anytime-valid sign
+        test (SequentialSignTest). The strategic median is treated as a known
+        constant, so the sampling variability of a small strategic set is
+        not accounted for: "significant" means random periods are not
+        centered on that value, not that the two populations are shown to
+        differ (see compare_strategic_vs_random for a two-sample t-test). Random sequences are evaluated
+        `max_workers` at a time and the test is updated after every result,
+        so the campaign stops as soon as the medians are shown to differ
+        (significance) or to agree within `margin` (futility), or after
+        `max_draws` sequences.
 
         Args:
-            results: List of trajectory results
+            strategic_file: Path to curated results (default: analyze existing logs)
+            alpha: Significance level
+            margin: Futility margin on P(random period > strategic median) - 1/2
+            max_draws: Most random sequences to evaluate
+            min_length: Minimum random sequence length
+            max_length: Maximum random sequence length
+            max_iterations: Max iterations per sequence
+            max_workers: Random sequences evaluated in parallel
 
         Returns:
-            Statistical analysis dictionary
-        """
-        periods = [r['period'] for r in results]
+            (comparison statistics, random results drawn)
 
-        # Group by sequence length
-        by_length = defaultdict(list)
-        for r in results:
-            length = len(r['move_sequence'])
-            by_length[length].append(r['period'])
-
-        analysis = {
-            'overall': {
-                'count': len(periods),
-                'mean': np.mean(periods),
-                'median': np.median(periods),
-                'std': np.std(periods),
-                'min': np.min(periods),
-                'max': np.max(periods),
-                'percentiles': {
-                    '25': np.percentile(periods, 25),
-                    '50': np.percentile(periods, 50),
-                    '75': np.percentile(periods, 75),
-                    '90': np.percentile(periods, 90),
-                    '95': np.percentile(periods, 95),
-                    '99': np.percentile(periods, 99),
-                }
+        Raises:
+            ValueError: If there are no strategic results to compare against
+        """
+        strategic_periods = [r['period'] for r in self._load_strategic_results(strategic_file)
+                             if r.get('period')]
+        if not strategic_periods:
+            raise ValueError("No strategic results to compare against")
+        reference = float(np.median(strategic_periods))
+
+        print(f"Sequentially comparing random sequences against the strategic median "
+              f"({reference:,.0f})...")
+        test = SequentialSignTest(alpha, margin)
+        results = []
+        submitted = 0
+
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        pending = set()
+        try:
+            while True:
+                while test.decision is None and submitted < max_draws and len(pending) < max_workers:
+                    seq = self.generator.random_sequence(
+                        random.randint(min_length, max_length), allow_repeats=False
+                    )
+                    pending.add(executor.submit(self.runner.run_sequence, seq, max_iterations))
+                    submitted += 1
+                if not pending or test.decision is not None:
+                    break
+
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    try:
+                        result = future.result()
+                    except (TimeoutError, RuntimeError, FileNotFoundError) as e:
+                        print(f"  FAILED: {e}")
+                        continue
+                    if test.decision is not None:
+                        continue  # Decided while this one was in flight
+                    results.append(result)
+                    period = result['period']
+                    if period is None or period == reference:
+                        continue  # No cycle found, or a tie: no sign
+                    test.add(period > reference)
+                    low, high = test.confidence_sequence()
+                    print(f"  [{len(results)}] {' → '.join(result['move_sequence'])}: "
+                          f"period={period:,}, P(above) in [{low:.2f}, {high:.2f}], "
+                          f"p={test.p_value:.4f}")
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        decision = test.decision or "inconclusive"
+        print(f"Stopped after {len(results)} random sequences: {decision}")
+
+        stats = PeriodStats.from_results(results)
+        max_strategic = max(strategic_periods)
+        random_periods = [r['period'] for r in results if r['period'] is not None]
+        low, high = test.confidence_sequence()
+        # As in PeriodStats.summary: None, not inf/NaN, if every draw failed
+        empty = stats.count == 0
+        comparison = {
+            'random': {
+                'count': stats.count,
+                'mean': stats.overall.mean,
+                'median': None if empty else stats.sketch.quantile(0.5),
+                'std': stats.overall.std,
+                'max': None if empty else stats.max,
+                'min': None if empty else stats.min,
             },
-            'by_length': {}
+            'strategic': {
+                'count': len(strategic_periods),
+                'mean': np.mean(strategic_periods),
+                'median': reference,
+                'std': np.std(strategic_periods),
+                'max': max_strategic,
+                'min': np.min(strategic_periods),
+            },
+            'statistical_test': {
+                'test': 'one-sample sequential sign test vs fixed strategic median',
+                'reference': reference,
+                'p_value': test.p_value,
+                'significantly_different': decision == "significant",
+                'decision': decision,
+                'draws': len(results),
+                'fraction_above_interval': [low, high],
+            },
+            'max_strategic_percentile': (
+                sum(1 for p in random_periods if p < max_strategic) / len(random_periods) * 100
+                if random_periods else None
+            ),
         }
+        return comparison, results
 
-        for length, length_periods in sorted(by_length.items()):
-            analysis['by_length'][length] = {
-                'count': len(length_periods),
-                'mean': np.mean(length_periods),
-                'median': np.median(length_periods),
-                'max': np.max(length_periods),
-            }
+    def analyze_period_distribution(self, results: List[Dict]) -> Dict:
+        """Analyze statistical properties of period distribution.
 
-        return analysis
+        Results are folded into running moments and quantile sketches (see
+        PeriodStats), so `results` may be any iterable, e.g. read_shard over
+        a campaign shard. Medians and percentiles match np.percentile for
+        small batches and are sketch estimates beyond a few hundred periods.
 
-    def print_summary(self, results: List[Dict], comparison: Dict = None,
+        Args:
+            results: List of trajectory results
+
+        Returns:
+            Statistical analysis dictionary
+        """
+        return PeriodStats.from_results(results).summary()
+
+    def print_summary(self, results: Union[List[Dict], PeriodStats], comparison: Dict = None,
                      chaos: Dict = None):
         """Print formatted summary of results.
 
         Args:
-            results: Test results
+            results: Test results, or the statistics of a streamed campaign
             comparison: Strategic vs random comparison
             chaos: Chaos analysis results
         """
@@ -261,17 +480,25 @@ class RandomSequenceTester:
         print("RANDOM SEQUENCE ANALYSIS SUMMARY")
         print("="*70)
 
-        periods = [r['period'] for r in results]
+        stats = results if isinstance(results, PeriodStats) else PeriodStats.from_results(results)
+
+        print(f"\nTotal sequences tested: {stats.count:,}")
+        if stats.failed:
+            print(f"Failed: {stats.failed:,}")
+        if stats.count:
+            print(f"Mean period: {stats.overall.mean:,.1f}")
+            print(f"Median period: {stats.sketch.quantile(0.5):,.0f}")
+            print(f"Std deviation: {stats.overall.std:,.1f}")
+            print(f"Range: [{stats.min} - {stats.max:,}]")
 
-        print(f"\nTotal sequences tested: {len(results)}")
-        print(f"Mean period: {np.mean(periods):,.1f}")
-        print(f"Median period: {np.median(periods):,.0f}")
-        print(f"Std deviation: {np.std(periods):,.1f}")
-        print(f"Range: [{np.min(periods)} - {np.max(periods):,}]")
+            print("\nPercentiles:")
+            for p, value in stats.sketch.percentiles().items():
+                print(f"  {p:>2}th: {value:>10,.0f}")
 
-        print("\nPercentiles:")
-        for p in [25, 50, 75, 90, 95, 99]:
-            print(f"  {p:2d}th: {np.percentile(periods, p):>10,.0f}")
+            print("\nBy length:")
+            for length, row in stats.summary()['by_length'].items():
+                print(f"  {length}: n={row['count']:,}, mean={row['mean']:,.1f}, "
+                      f"median={row['median']:,.0f}, max={row['max']:,}")
 
         if comparison:
             print("\n" + "-"*70)
@@ -279,20 +506,29 @@ class RandomSequenceTester:
             print("-"*70)
             print(f"\nRandom sequences:")
             print(f"  Mean period: {comparison['random']['mean']:,.1f}")
-            print(f"  Max period:  {comparison['random']['max']:,}")
+            if comparison['random']['count']:
+                print(f"  Max period:  {comparison['random']['max']:,}")
 
             print(f"\nStrategic sequences:")
             print(f"  Mean period: {comparison['strategic']['mean']:,.1f}")
             print(f"  Max period:  {comparison['strategic']['max']:,}")
 
             print(f"\nStatistical significance: p={comparison['statistical_test']['p_value']:.4f}")
+            if 'decision' in comparison['statistical_test']:
+                print(f"  Sequential test stopped after "
+                      f"{comparison['statistical_test']['draws']} random sequences "
+                      f"({comparison['statistical_test']['decision']})")
+            if 'decision' in comparison['statistical_test']:
+                print("  (one-sample test against the strategic median as a fixed "
+                      "reference; the strategic set's own variability is not included)")
             if comparison['statistical_test']['significantly_different']:
                 print("  ✓ Strategic selection produces significantly different periods")
             else:
                 print("  ✗ No significant difference detected")
 
-            print(f"\nOur record of {comparison['strategic']['max']:,} is at the "
-                  f"{comparison['max_strategic_percentile']:.1f}th percentile of random sequences")
+            if comparison['max_strategic_percentile'] is not None:
+                print(f"\nOur record of {comparison['strategic']['max']:,} is at the "
+                      f"{comparison['max_strategic_percentile']:.1f}th percentile of random sequences")
 
         if chaos:
             print("\n" + "-"*70)
@@ -300,7 +536,10 @@ class RandomSequenceTester:
             print("-"*70)
             print(f"\nMean sensitivity ratio: {chaos['mean_sensitivity']:.2f}")
             print(f"Max sensitivity ratio: {chaos['max_sensitivity']:.2f}")
-            print(f"Sequences with >2x sensitivity: {chaos['chaotic_sequences']}/{chaos['total_tested']}")
+            print(f"Perturbations with >2x sensitivity: "
+                  f"{chaos['chaotic_perturbations']}/{chaos['perturbations_tested']}")
+            print(f"Sequences with >2x mean sensitivity: "
+                  f"{chaos['chaotic_sequences_mean_ratio']}/{chaos['total_tested']}")
             if chaos['mean_sensitivity'] > 2.0:
                 print("  ✓ System shows chaotic behavior (high sensitivity)")
             else:
@@ -321,37 +560,128 @@ def main():
     parser.add_argument("--max-length", type=int, default=6,
                        help="Maximum sequence length")
     parser.add_argument("--chaos", action="store_true",
-                       help="Run chaos sensitivity analysis")
+                       help="Run chaos sensitivity analysis on every tested sequence")
+    parser.add_argument("--chaos-perturbations", type=int, default=10,
+                       help="Chaos: perturbed variants per sequence (default: 10)")
     parser.add_argument("--compare", action="store_true",
                        help="Compare with strategic sequences")
     parser.add_argument("--max-iterations", type=int, default=50000,
                        help="Max iterations per sequence")
+    parser.add_argument("--backend", choices=BACKENDS, default="cargo",
+                       help="How sequences are evaluated: one cargo run each, a warm ctrl "
+                            "--serve worker, the in-process ctrl extension, or exact "
+                            "periods from twist permutations")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Always re-evaluate instead of using the on-disk result cache")
+    parser.add_argument("--journal", type=Path,
+                       help="Append progress to this journal file and resume from it "
+                            "if it already exists")
+    parser.add_argument("--stream", type=Path, metavar="SHARD",
+                       help="Stream the campaign in constant memory: append one compact "
+                            f"record per sequence to this {' or '.join(FORMATS)} file and keep "
+                            "only running statistics")
+    parser.add_argument("--chunk-size", type=int,
+                       help="Streaming: sequences sampled and evaluated per step (default: "
+                            "65536 for the permutation backend, 4096 otherwise)")
+    parser.add_argument("--seed", type=int,
+                       help="Streaming: seed for a reproducible campaign")
+    parser.add_argument("--sequential", action="store_true",
+                       help="Compare with the strategic median sequentially (one-sample "
+                            "test against it as a fixed reference): draw random sequences "
+                            "only until the difference is significant or ruled out "
+                            "(at most --count)")
+    parser.add_argument("--alpha", type=float, default=0.05,
+                       help="Sequential: significance level (default: 0.05)")
+    parser.add_argument("--margin", type=float, default=0.2,
+                       help="Sequential: futility margin on P(random > strategic median) - 1/2 "
+                            "(default: 0.2)")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1,
+                       help="Parallel evaluations for streaming, sequential comparison and "
+                            "chaos analysis (default: CPU count)")
 
     args = parser.parse_args()
+    if args.stream and (args.journal or args.compare or args.chaos or args.sequential):
+        parser.error("--stream keeps no per-sequence results; it cannot be combined "
+                     "with --journal, --compare, --sequential or --chaos")
+    if args.sequential and args.journal:
+        parser.error("--sequential draws its own random sequences; it cannot resume a journal")
+
+    runner = make_runner(args.backend, workers=args.max_workers, cache=not args.no_cache)
+    tester = RandomSequenceTester(runner=runner)
+
+    if args.stream:
+        stats = tester.stream_random_batch(
+            count=args.count,
+            output=args.stream,
+            min_length=args.min_length,
+            max_length=args.max_length,
+            max_iterations=args.max_iterations,
+            chunk_size=args.chunk_size,
+            max_workers=args.max_workers,
+            seed=args.seed
+        )
+        runner.close()
+        tester.print_summary(stats)
+
+        summary_file = tester.output_dir / "random_campaign_summary.json"
+        with open(summary_file, 'w') as f:
+            json.dump(stats.summary(), f, indent=2)
+        print(f"\nSummary saved to: {summary_file}")
+        return
+
+    comparison = None
+    if args.sequential:
+        # The sequential comparison's draws are the random batch
+        comparison, results = tester.compare_strategic_vs_random_sequential(
+            alpha=args.alpha,
+            margin=args.margin,
+            max_draws=args.count,
+            min_length=args.min_length,
+            max_length=args.max_length,
+            max_iterations=args.max_iterations,
+            max_workers=args.max_workers
+        )
 
-    tester = RandomSequenceTester()
+    journal = None
+    if args.journal:
+        journal = RunJournal(args.journal, params={
+            "count": args.count,
+            "min_length": args.min_length,
+            "max_length": args.max_length,
+            "max_iterations": args.max_iterations,
+            "backend": args.backend,
+        })
 
     # Run random batch
-    results = tester.test_random_batch(
-        count=args.count,
-        min_length=args.min_length,
-        max_length=args.max_length,
-        max_iterations=args.max_iterations
-    )
+    if not args.sequential:
+        results = tester.test_random_batch(
+            count=args.count,
+            min_length=args.min_length,
+            max_length=args.max_length,
+            max_iterations=args.max_iterations,
+            journal=journal
+        )
+    if journal is not None:
+        journal.close()
 
     # Analyze distribution
     distribution = tester.analyze_period_distribution(results)
 
     # Optional analyses
-    comparison = None
-    if args.compare:
+    if args.compare and not args.sequential:
         comparison = tester.compare_strategic_vs_random(results)
 
     chaos = None
     if args.chaos:
-        # Test a subset for chaos (expensive)
-        test_sequences = [r['move_sequence'] for r in results[:10]]
-        chaos = tester.analyze_chaos(test_sequences)
+        # Base periods are reused from the batch; perturbations run in one pass
+        chaos = tester.analyze_chaos(
+            results,
+            n_perturbations=args.chaos_perturbations,
+            max_iterations=args.max_iterations,
+            max_workers=args.max_workers
+        )
+
+    runner.close()
 
     # Print summary
     tester.print_summary(results, comparison, chaos)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Columnar storage for Lyapunov results.
+
+A list of LyapunovResult objects holds a Python list of ratios per result,
+and every summary walks it result by result. LyapunovTable keeps the same
+data as flat NumPy columns, one entry per result, with the per-perturbation
+ratios and divergences concatenated into single arrays and indexed by
+offsets (result i owns ratios[offsets[i]:offsets[i + 1]]). Per-result
+statistics are segmented reductions, and grouping by length is a sort.
+"""
+
+import csv
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+CLASSIFICATIONS = ("trivial", "weakly_chaotic", "strongly_chaotic", "extremely_chaotic")
+
+
+class LyapunovTable:
+    """Lyapunov results as flat columns with offset-indexed perturbation data."""
+
+    def __init__(self, sequences: np.ndarray, base_period: np.ndarray,
+                 lyapunov_exponent: np.ndarray, classification: np.ndarray,
+                 offsets: np.ndarray, period_ratios: np.ndarray,
+                 divergence_scores: np.ndarray):
+        """Wrap columns (see from_results to build a table from results).
+
+        Args:
+            sequences: Comma-joined move sequences
+            base_period: Base period of each sequence
+            lyapunov_exponent: λ of each sequence
+            classification: Index into CLASSIFICATIONS
+            offsets: len(sequences) + 1 offsets into the perturbation columns
+            period_ratios: All perturbation ratios, concatenated
+            divergence_scores: All perturbation divergences, concatenated
+        """
+        self.sequences = np.asarray(sequences, dtype=str)
+        self.base_period = np.asarray(base_period, dtype=np.int64)
+        self.lyapunov_exponent = np.asarray(lyapunov_exponent, dtype=np.float64)
+        self.classification = np.asarray(classification, dtype=np.int8)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.period_ratios = np.asarray(period_ratios, dtype=np.float64)
+        self.divergence_scores = np.asarray(divergence_scores, dtype=np.float64)
+
+        self.length = np.char.count(self.sequences, ",").astype(np.int64) + 1
+        self.length[np.char.str_len(self.sequences) == 0] = 0
+
+    @classmethod
+    def from_results(cls, results) -> "LyapunovTable":
+        """Build a table from LyapunovResult objects (a table is returned as is)."""
+        if isinstance(results, cls):
+            return results
+        counts = [len(r.period_ratios) for r in results]
+        offsets = np.zeros(len(results) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(
+            sequences=np.array([",".join(r.sequence) for r in results], dtype=str),
+            base_period=np.fromiter((r.base_period for r in results), np.int64, len(results)),
+            lyapunov_exponent=np.fromiter((r.lyapunov_exponent for r in results),
+                                          np.float64, len(results)),
+            classification=np.fromiter((CLASSIFICATIONS.index(r.classification)
+                                        for r in results), np.int8, len(results)),
+            offsets=offsets,
+            period_ratios=np.fromiter((x for r in results for x in r.period_ratios),
+                                      np.float64, offsets[-1]),
+            divergence_scores=np.fromiter((x for r in results for x in r.divergence_scores),
+                                          np.float64, offsets[-1]),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "LyapunovTable":
+        """Load a table written by save."""
+        with np.load(path) as data:
+            return cls(**{name: data[name] for name in data.files})
+
+    def save(self, path: Path):
+        """Write the columns to a compressed .npz file."""
+        np.savez_compressed(
+            path, sequences=self.sequences, base_period=self.base_period,
+            lyapunov_exponent=self.lyapunov_exponent, classification=self.classification,
+            offsets=self.offsets, period_ratios=self.period_ratios,
+            divergence_scores=self.divergence_scores,
+        )
+
+    def __len__(self) -> int:
+        return len(self.sequences)
+
+    @property
+    def perturbations_tested(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def _segment_stats(self, values: np.ndarray) -> Dict[str, np.ndarray]:
+        """Mean, standard deviation and max of each result's segment of `values`."""
+        counts = self.perturbations_tested
+        starts = self.offsets[:-1]
+        if not len(values):
+            empty = np.full(len(self), np.nan)
+            return {"mean": empty, "std": empty, "max": empty}
+        # reduceat needs in-range starts; every result has at least one perturbation
+        starts = np.minimum(starts, len(values) - 1)
+        mean = np.add.reduceat(values, starts) / counts
+        deviation = values - np.repeat(mean, counts)
+        std = np.sqrt(np.add.reduceat(deviation * deviation, starts) / counts)
+        return {"mean": mean, "std": std, "max": np.maximum.reduceat(values, starts)}
+
+    def ratio_stats(self) -> Dict[str, np.ndarray]:
+        """Per-result mean, std and max of the period ratios."""
+        return self._segment_stats(self.period_ratios)
+
+    def divergence_stats(self) -> Dict[str, np.ndarray]:
+        """Per-result mean, std and max of the divergence scores."""
+        return self._segment_stats(self.divergence_scores)
+
+    def summary(self) -> Dict:
+        """Summary statistics, overall and by sequence length.
+
+        Same structure as LyapunovAnalyzer.generate_summary_report.
+        """
+        if not len(self):
+            return {}
+
+        exponents = self.lyapunov_exponent
+        counts = np.bincount(self.classification, minlength=len(CLASSIFICATIONS))
+
+        summary = {
+            'total_sequences': len(self),
+            'overall': {
+                'mean_lambda': float(np.mean(exponents)),
+                'median_lambda': float(np.median(exponents)),
+                'std_lambda': float(np.std(exponents)),
+                'min_lambda': float(np.min(exponents)),
+                'max_lambda': float(np.max(exponents)),
+            },
+            'classifications': {
+                name: int(count) for name, count in zip(CLASSIFICATIONS, counts)
+            },
+            'by_length': {}
+        }
+
+        # Sort by (length, λ): each length is one contiguous run, sorted by λ
+        order = np.lexsort((exponents, self.length))
+        lengths, starts, group_counts = np.unique(
+            self.length[order], return_index=True, return_counts=True
+        )
+        sorted_exponents = exponents[order]
+        ends = starts + group_counts
+        means = np.add.reduceat(sorted_exponents, starts) / group_counts
+        medians = (sorted_exponents[starts + (group_counts - 1) // 2] +
+                   sorted_exponents[starts + group_counts // 2]) / 2
+        maxima = sorted_exponents[ends - 1]
+
+        # Most chaotic: the first result (in input order) reaching the group max
+        by_length = np.argsort(self.length, kind="stable")
+        is_max = exponents[by_length] == np.repeat(maxima, group_counts)
+        candidates = np.where(is_max, by_length, len(self))
+        most_chaotic = np.minimum.reduceat(candidates, starts)
+
+        for i, length in enumerate(lengths):
+            summary['by_length'][int(length)] = {
+                'count': int(group_counts[i]),
+                'mean_lambda': float(means[i]),
+                'median_lambda': float(medians[i]),
+                'max_lambda': float(maxima[i]),
+                'most_chaotic': {
+                    'sequence': self.sequences[most_chaotic[i]].replace(",", " → "),
+                    'lambda': float(maxima[i])
+                }
+            }
+
+        return summary
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """One value per result for every exported column, in CSV order."""
+        ratios = self.ratio_stats()
+        divergences = self.divergence_stats()
+        return {
+            'sequence': np.char.replace(self.sequences, ",", " → "),
+            'sequence_length': self.length,
+            'base_period': self.base_period,
+            'lyapunov_exponent': self.lyapunov_exponent,
+            'classification': np.array(CLASSIFICATIONS)[self.classification],
+            'perturbations_tested': self.perturbations_tested,
+            'mean_ratio': ratios["mean"],
+            'std_ratio': ratios["std"],
+            'max_ratio': ratios["max"],
+            'mean_divergence': divergences["mean"],
+            'max_divergence': divergences["max"],
+        }
+
+    def to_csv(self, output_file: Path):
+        """Write one row per result (see columns)."""
+        columns = self.columns()
+        with open(output_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(zip(*(column.tolist() for column in columns.values())))
+
+    def to_parquet(self, output_file: Path):
+        """Write one row per result (see columns) as Parquet. Requires pyarrow."""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow: uv add pyarrow") from None
+        pq.write_table(pa.table(self.columns()), output_file)
+
+    def result(self, index: int):
+        """Rebuild a single LyapunovResult."""
+        from .lyapunov import LyapunovResult
+
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return LyapunovResult(
+            sequence=self.sequences[index].split(",") if self.length[index] else [],
+            base_period=int(self.base_period[index]),
+            lyapunov_exponent=float(self.lyapunov_exponent[index]),
+            perturbations_tested=int(end - start),
+            period_ratios=self.period_ratios[start:end].tolist(),
+            divergence_scores=self.divergence_scores[start:end].tolist(),
+            classification=CLASSIFICATIONS[self.classification[index]]
+        )
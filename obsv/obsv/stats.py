@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Streaming statistics for sampled quantities.
+
+Lyapunov exponents and period distributions are estimated from samples that
+arrive a few at a time (rounds of perturbations, chunks of random sequences).
+These accumulators keep constant-size summaries that can be updated as
+samples arrive and merged across workers.
+"""
+
+import random
+from collections import defaultdict
+from itertools import islice
+from math import ceil, exp, inf, lgamma, log, sqrt
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+PERCENTILES = (25, 50, 75, 90, 95, 99)
+
+
+class RunningMoments:
+    """Running count, mean and variance of a stream (Welford's algorithm)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float):
+        """Add one sample."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def update(self, values: Iterable[float]):
+        """Add several samples."""
+        for value in values:
+            self.add(value)
+
+    @classmethod
+    def from_array(cls, values: np.ndarray) -> "RunningMoments":
+        """Moments of an array of samples, computed in one vectorized pass."""
+        moments = cls()
+        values = np.asarray(values, dtype=np.float64)
+        if len(values):
+            moments.count = len(values)
+            moments.mean = float(values.mean())
+            moments._m2 = float(np.square(values - moments.mean).sum())
+        return moments
+
+    def merge(self, other: "RunningMoments"):
+        """Fold another accumulator's samples into this one (Chan et al.)."""
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 with fewer than two samples)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return sqrt(self.variance)
+
+    def confidence_interval(self, confidence: float = 0.95) -> Tuple[float, float]:
+        """Student-t confidence interval for the mean.
+
+        Returns:
+            (low, high); unbounded with fewer than two samples
+        """
+        if self.count < 2:
+            return -inf, inf
+        from scipy import stats
+        half_width = stats.t.ppf(0.5 + confidence / 2, self.count - 1) * self.std / sqrt(self.count)
+        return self.mean - half_width, self.mean + half_width
+
+
+class QuantileSketch:
+    """Mergeable streaming quantile sketch (KLL, Karnin, Lang & Liberty 2016).
+
+    Samples are kept in a stack of compactors. When level h fills up it is
+    sorted and every other item (from a random offset) is promoted to level
+    h + 1, where each item stands for 2^(h+1) samples. Capacities shrink
+    geometrically towards the bottom, so the sketch holds O(k) items however
+    many samples it has seen; quantiles have rank error around 1/k.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        """Create an empty sketch.
+
+        Args:
+            k: Accuracy parameter (capacity of the top compactor)
+            seed: Seed for the compaction coin flips
+        """
+        self.k = k
+        self.count = 0
+        self._compactors: List[List[float]] = []
+        self._size = 0
+        self._random = random.Random(seed)
+        self._grow()
+
+    def _grow(self):
+        """Add a level on top; every level's capacity shrinks by 2/3."""
+        self._compactors.append([])
+        height = len(self._compactors)
+        self._capacities = [int(ceil(self.k * (2 / 3) ** (height - level - 1))) + 1
+                            for level in range(height)]
+        self._max_size = sum(self._capacities)
+
+    def add(self, value: float):
+        """Add one sample."""
+        self._compactors[0].append(value)
+        self._size += 1
+        self.count += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def update(self, values: Iterable[float]):
+        """Add several samples."""
+        values = iter(values)
+        while True:
+            # Fill level 0 up to the next compaction in one extend
+            chunk = list(islice(values, max(1, self._max_size - self._size)))
+            if not chunk:
+                return
+            self._compactors[0].extend(chunk)
+            self._size += len(chunk)
+            self.count += len(chunk)
+            while self._size >= self._max_size:
+                self._compress()
+
+    def merge(self, other: "QuantileSketch"):
+        """Fold another sketch's samples into this one."""
+        while len(self._compactors) < len(other._compactors):
+            self._grow()
+        for level, items in enumerate(other._compactors):
+            self._compactors[level].extend(items)
+        self._size += other._size
+        self.count += other.count
+        while self._size >= self._max_size:
+            self._compress()
+
+    def _compress(self):
+        """Compact full levels, lowest first, until the sketch fits again."""
+        for level, items in enumerate(self._compactors):
+            if len(items) < self._capacities[level]:
+                continue
+            if level + 1 == len(self._compactors):
+                self._grow()
+            items.sort()
+            # An odd item out stays at this level
+            leftover = [items.pop()] if len(items) % 2 else []
+            self._compactors[level + 1].extend(items[self._random.randint(0, 1)::2])
+            self._compactors[level] = leftover
+            self._size = sum(len(c) for c in self._compactors)
+            if self._size < self._max_size:
+                return
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """Approximate quantiles, qs in [0, 1] (NaN while the sketch is empty).
+
+        Until the first compaction every sample is still held, so quantiles
+        are exact and interpolate between ranks like np.quantile; after it,
+        they are the sketch's weighted lower-rank estimates.
+        """
+        if not self._size:
+            return [float("nan")] * len(qs)
+        if self._size == self.count:
+            return np.quantile(np.asarray(self._compactors[0], dtype=np.float64), qs).tolist()
+        values = np.concatenate([np.asarray(c, dtype=np.float64) for c in self._compactors])
+        weights = np.concatenate([np.full(len(c), 2.0 ** level)
+                                  for level, c in enumerate(self._compactors)])
+        order = np.argsort(values, kind="stable")
+        values = values[order]
+        cumulative = np.cumsum(weights[order])
+        ranks = np.asarray(qs, dtype=np.float64) * cumulative[-1]
+        index = np.minimum(np.searchsorted(cumulative, ranks), len(values) - 1)
+        return values[index].tolist()
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile, q in [0, 1]."""
+        return self.quantiles([q])[0]
+
+    def percentiles(self, ps: Sequence[float] = PERCENTILES) -> Dict[str, float]:
+        """Approximate percentiles keyed like analyze_period_distribution ('25', '50', ...)."""
+        return {str(p): value for p, value in zip(ps, self.quantiles([p / 100 for p in ps]))}
+
+
+class PeriodStats:
+    """Running summary of a stream of periods, overall and by sequence length."""
+
+    def __init__(self, k: int = 200):
+        """Create empty accumulators.
+
+        Args:
+            k: Accuracy parameter of the quantile sketches (see QuantileSketch)
+        """
+        self.k = k
+        self.overall = RunningMoments()
+        self.by_length: Dict[int, RunningMoments] = defaultdict(RunningMoments)
+        self.sketch = QuantileSketch(k)
+        self.sketch_by_length: Dict[int, QuantileSketch] = defaultdict(lambda: QuantileSketch(self.k))
+        self.min = inf
+        self.max = -inf
+        self.max_by_length: Dict[int, int] = {}
+        self.failed = 0
+
+    @property
+    def count(self) -> int:
+        """Number of periods added (failures excluded)."""
+        return self.overall.count
+
+    def add(self, length: int, period: Optional[int]):
+        """Add one sequence's period (None or 0 counts as a failure, as in add_many)."""
+        if period is None or period <= 0:
+            self.failed += 1
+            return
+        self.overall.add(period)
+        self.by_length[length].add(period)
+        self.sketch.add(period)
+        self.sketch_by_length[length].add(period)
+        self.min = min(self.min, period)
+        self.max = max(self.max, period)
+        self.max_by_length[length] = max(self.max_by_length.get(length, period), period)
+
+    def add_many(self, lengths: np.ndarray, periods: np.ndarray):
+        """Add a chunk of sequence lengths and periods (0 counts as a failure)."""
+        lengths = np.asarray(lengths)
+        periods = np.asarray(periods)
+        ok = periods > 0
+        self.failed += int(len(periods) - ok.sum())
+        lengths, periods = lengths[ok], periods[ok]
+        if not len(periods):
+            return
+        self.overall.merge(RunningMoments.from_array(periods))
+        self.sketch.update(periods.tolist())
+        self.min = min(self.min, int(periods.min()))
+        self.max = max(self.max, int(periods.max()))
+        for length in np.unique(lengths).tolist():
+            group = periods[lengths == length]
+            self.by_length[length].merge(RunningMoments.from_array(group))
+            self.sketch_by_length[length].update(group.tolist())
+            self.max_by_length[length] = max(self.max_by_length.get(length, -inf),
+                                             int(group.max()))
+
+    def merge(self, other: "PeriodStats"):
+        """Fold another accumulator (e.g. another worker's) into this one."""
+        self.overall.merge(other.overall)
+        self.sketch.merge(other.sketch)
+        for length, moments in other.by_length.items():
+            self.by_length[length].merge(moments)
+            self.sketch_by_length[length].merge(other.sketch_by_length[length])
+            self.max_by_length[length] = max(self.max_by_length.get(length, -inf),
+                                             other.max_by_length[length])
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.failed += other.failed
+
+    @classmethod
+    def from_results(cls, results: Iterable[Dict], k: int = 200) -> "PeriodStats":
+        """Accumulate result dicts (move_sequence and period), e.g. from read_shard."""
+        stats = cls(k)
+        for r in results:
+            stats.add(len(r['move_sequence']), r['period'])
+        return stats
+
+    def summary(self) -> Dict:
+        """Count, mean, median, std, min, max and percentiles overall, and
+        count, mean, median and max by length (medians and percentiles are
+        exact until a sketch compacts, then estimates). Order statistics are None until a period is added,
+        so the summary stays valid JSON."""
+        empty = self.count == 0
+        return {
+            'overall': {
+                'count': self.count,
+                'failed': self.failed,
+                'mean': self.overall.mean,
+                'median': None if empty else self.sketch.quantile(0.5),
+                'std': self.overall.std,
+                'min': None if empty else self.min,
+                'max': None if empty else self.max,
+                'percentiles': ({str(p): None for p in PERCENTILES} if empty
+                                else self.sketch.percentiles()),
+            },
+            'by_length': {
+                length: {
+                    'count': self.by_length[length].count,
+                    'mean': self.by_length[length].mean,
+                    'median': self.sketch_by_length[length].quantile(0.5),
+                    'max': self.max_by_length[length],
+                }
+                for length in sorted(self.by_length)
+            }
+        }
+
+
+class SequentialSignTest:
+    """Anytime-valid sign test: is P(X = 1) different from 1/2?
+
+    Observations are Bernoulli (e.g. "this random period is above the
+    strategic median"). Evidence against p = 1/2 is the Bayes factor of a
+    uniform Beta(1, 1) mixture over p, a nonnegative martingale under the
+    null; by Ville's inequality it exceeds 1/alpha with probability at most
+    alpha however often it is checked. The test can therefore be updated
+    after every observation and stopped as soon as it is decided:
+
+        significant  the confidence sequence for p excludes 1/2
+        futile       it lies inside 1/2 ± margin: any difference is smaller
+                     than the margin of interest
+    """
+
+    _GRID = np.linspace(1e-4, 1 - 1e-4, 9999)
+
+    def __init__(self, alpha: float = 0.05, margin: float = 0.2):
+        """Create a test with no observations.
+
+        Args:
+            alpha: Significance level (and 1 - coverage of the confidence sequence)
+            margin: Futility margin on |p - 1/2|
+        """
+        self.alpha = alpha
+        self.margin = margin
+        self.successes = 0
+        self.failures = 0
+        self._max_log_bayes_factor = 0.0
+
+    @property
+    def count(self) -> int:
+        return self.successes + self.failures
+
+    def _log_marginal(self) -> float:
+        """log ∫ p^a (1 - p)^b dp under the uniform prior (log Beta(a + 1, b + 1))."""
+        a, b = self.successes, self.failures
+        return lgamma(a + 1) + lgamma(b + 1) - lgamma(a + b + 2)
+
+    def add(self, success: bool):
+        """Add one observation."""
+        if success:
+            self.successes += 1
+        else:
+            self.failures += 1
+        log_bayes_factor = self._log_marginal() + self.count * log(2)
+        self._max_log_bayes_factor = max(self._max_log_bayes_factor, log_bayes_factor)
+
+    @property
+    def p_value(self) -> float:
+        """Anytime-valid p-value (1 / largest Bayes factor seen so far)."""
+        return min(1.0, exp(-self._max_log_bayes_factor))
+
+    def confidence_sequence(self) -> Tuple[float, float]:
+        """Anytime-valid (1 - alpha) confidence interval for p."""
+        grid = self._GRID
+        log_bayes_factor = (self._log_marginal() - self.successes * np.log(grid)
+                            - self.failures * np.log1p(-grid))
+        inside = grid[log_bayes_factor < log(1 / self.alpha)]
+        if not len(inside):
+            return 0.0, 1.0
+        return float(inside[0]), float(inside[-1])
+
+    @property
+    def decision(self) -> Optional[str]:
+        """'significant', 'futile', or None while undecided."""
+        if self.p_value <= self.alpha:
+            return "significant"
+        low, high = self.confidence_sequence()
+        if 0.5 - self.margin < low and high < 0.5 + self.margin:
+            return "futile"
+        return None
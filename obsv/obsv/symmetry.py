@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Symmetry reduction of move sequences.
+
+Every symmetry of the cube (a signed permutation of the coordinate axes: 384
+for the hypercube, 48 for the 3D cube) relabels twists: conjugating a twist
+by a symmetry gives another twist, e.g. swapping the x and w axes turns FR
+into FO. Relabeling every move of a sequence conjugates its map, so periods
+(and any statistic computed over a symmetric move pool, such as λ over all
+48 MoveGenerator.MOVES) are unchanged.
+
+Together with cyclic rotation and inversion (see canonical.py) this splits
+sequences of a given length into equivalence classes; a sweep only needs one
+evaluation per class, weighted by the number of sequences it stands for.
+"""
+
+from itertools import permutations, product
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .canonical import normalize_move
+from .ctrl_runner import CtrlRunner
+from .permutation import load_twist_table, move_codes
+
+
+class TwistSymmetry:
+    """Action of the cube's symmetry group on a puzzle's twists."""
+
+    def __init__(self, table: Dict):
+        """Build the action from a twist table.
+
+        Args:
+            table: Twist table as exported by `ctrl --export-twists`
+        """
+        twists = table["twists"]
+        self.dimension = table["dimension"]
+        self.moves: List[str] = [t["name"] for t in twists]
+        self._codes = move_codes(twists)
+
+        geometry = {
+            (t["axis"], t["sign"], tuple(t["plane"]), t["direction"]): i
+            for i, t in enumerate(twists)
+        }
+
+        # Codes run 0..len(twists)-1; the last code is padding and maps to itself
+        self.padding_code = len(twists)
+        self.inverse_code = np.array(
+            [self._codes[t["reverse"]] for t in twists] + [self.padding_code], dtype=np.intp
+        )
+
+        # Conjugating by e_i -> signs[i] * e_perm[i] grips facet (perm[a], signs[a] * s)
+        # and turns e_perm[c] toward direction * signs[c] * signs[d] * e_perm[d]
+        actions = []
+        for perm in permutations(range(self.dimension)):
+            for signs in product((1, -1), repeat=self.dimension):
+                action = []
+                for t in twists:
+                    a, (c, d) = t["axis"], t["plane"]
+                    direction = t["direction"] * signs[c] * signs[d]
+                    if perm[c] < perm[d]:
+                        plane = (perm[c], perm[d])
+                    else:
+                        plane, direction = (perm[d], perm[c]), -direction
+                    key = (perm[a], t["sign"] * signs[a], plane, direction)
+                    if key not in geometry:
+                        break
+                    action.append(geometry[key])
+                else:
+                    actions.append(action + [self.padding_code])
+
+        # Only symmetries that map the exported twist set onto itself are kept
+        self.action = np.array(actions, dtype=np.intp)
+        self.group_size = len(actions)
+
+    @classmethod
+    def from_ctrl(cls, runner: Optional[CtrlRunner] = None,
+                  cache_path: Optional[Path] = None) -> "TwistSymmetry":
+        """Build the symmetry action from ctrl's twist table (see load_twist_table)."""
+        return cls(load_twist_table(runner, cache_path))
+
+    def encode(self, sequences: List[List[str]]) -> np.ndarray:
+        """Encode equal-length move sequences as an array of move codes.
+
+        Raises:
+            ValueError: If a move is unknown or the lengths differ
+        """
+        lengths = {len(seq) for seq in sequences}
+        if len(lengths) > 1:
+            raise ValueError("Sequences must all have the same length")
+        try:
+            return np.array(
+                [[self._codes[normalize_move(m)] for m in seq] for seq in sequences],
+                dtype=np.intp
+            ).reshape(len(sequences), lengths.pop() if lengths else 0)
+        except KeyError as e:
+            raise ValueError(f"Unknown move: {e}") from None
+
+    def _variants(self, codes: np.ndarray, invert: bool) -> np.ndarray:
+        """Every relabeling, rotation (and inverse) of each row: shape (rows, variants, length)."""
+        relabeled = self.action[:, codes]                          # (G, B, L)
+        if invert:
+            inverted = self.inverse_code[relabeled[..., ::-1]]
+            relabeled = np.concatenate([relabeled, inverted])
+        length = codes.shape[1]
+        rotated = [np.roll(relabeled, -r, axis=2) for r in range(max(length, 1))]
+        variants = np.concatenate(rotated)                          # (V, B, L)
+        return variants.transpose(1, 0, 2)
+
+    def canonical_codes(self, codes: np.ndarray, invert: bool = True,
+                        chunk_size: int = 2_000_000) -> Tuple[np.ndarray, np.ndarray]:
+        """Canonical representative and class size for each row of codes.
+
+        Args:
+            codes: Array of shape (sequences, length), see encode
+            invert: Also identify sequences with their inverses
+            chunk_size: Approximate number of variant codes held in memory at once
+
+        Returns:
+            (canonical codes with the same shape as `codes`, class sizes): the
+            canonical row is the lexicographically smallest equivalent code
+            sequence, and the class size is the number of distinct sequences of
+            this length equivalent to the row
+        """
+        codes = np.asarray(codes, dtype=np.intp)
+        rows, length = codes.shape
+        canonical = np.empty_like(codes)
+        sizes = np.empty(rows, dtype=np.int64)
+
+        per_row = self.group_size * (2 if invert else 1) * max(length, 1) * max(length, 1)
+        step = max(1, chunk_size // per_row)
+        for start in range(0, rows, step):
+            block = codes[start:start + step]
+            variants = self._variants(block, invert)
+            count = variants.shape[1]
+
+            # Narrow down to the smallest variant one column at a time
+            candidate = np.ones(variants.shape[:2], dtype=bool)
+            for j in range(length):
+                column = np.where(candidate, variants[:, :, j], self.padding_code + 1)
+                candidate &= column == column.min(axis=1, keepdims=True)
+            best = candidate.argmax(axis=1)
+            canonical[start:start + len(block)] = variants[np.arange(len(block)), best]
+
+            # Orbit-stabilizer: the variants enumerate the orbit, each element
+            # as many times as the row's stabilizer is large
+            stabilizer = np.all(variants == block[:, None, :], axis=2).sum(axis=1)
+            sizes[start:start + len(block)] = count // stabilizer
+
+        return canonical, sizes
+
+    def canonical(self, moves: List[str], invert: bool = True) -> List[str]:
+        """Canonical representative of a single sequence's symmetry class."""
+        canonical, _ = self.canonical_codes(self.encode([moves]), invert)
+        return [self.moves[c] for c in canonical[0]]
+
+    def class_size(self, moves: List[str], invert: bool = True) -> int:
+        """Number of distinct sequences of this length equivalent to `moves`."""
+        _, sizes = self.canonical_codes(self.encode([moves]), invert)
+        return int(sizes[0])
+
+    def reduce(self, sequences: List[List[str]],
+               invert: bool = True) -> Tuple[List[List[str]], List[int], List[int]]:
+        """Collapse a list of sequences to one representative per class.
+
+        Sequences of different lengths are handled separately.
+
+        Returns:
+            (representatives, weights, class_sizes): weights[i] is how many of
+            the input sequences fall in representative i's class (weight each
+            class's result by it to recover statistics over the input), and
+            class_sizes[i] is the size of the class over all twists
+        """
+        by_length: Dict[int, List[List[str]]] = {}
+        for seq in sequences:
+            by_length.setdefault(len(seq), []).append(seq)
+
+        representatives, weights, class_sizes = [], [], []
+        for length in sorted(by_length):
+            canonical, sizes = self.canonical_codes(self.encode(by_length[length]), invert)
+            unique, first, counts = np.unique(
+                canonical, axis=0, return_index=True, return_counts=True
+            )
+            for row, index, count in zip(unique.reshape(len(counts), length), first, counts):
+                representatives.append([self.moves[c] for c in row])
+                weights.append(int(count))
+                class_sizes.append(int(sizes[index]))
+
+        return representatives, weights, class_sizes
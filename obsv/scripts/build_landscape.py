@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Compute the period of every short move sequence over an alphabet.
+
+Writes dense period tensors (one per sequence length) that heat maps, period
+tables and top-N lists can slice instead of running ctrl.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import obsv
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from obsv.landscape import main
+
+if __name__ == "__main__":
+    main()
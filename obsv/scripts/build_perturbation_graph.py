@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Build the perturbation graph: sequences linked to their single-edit neighbors.
+
+Stores CSR arrays under logs/perturbation_graph/ that extended_analysis.py
+and graph queries load memory-mapped.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import obsv
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from obsv.perturbation_graph import main
+
+if __name__ == "__main__":
+    main()
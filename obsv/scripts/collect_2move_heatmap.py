@@ -10,33 +10,27 @@ This will take approximately 30-60 minutes with parallel execution.
 """
 
 import sys
-import json
+from collections import defaultdict
+from dataclasses import asdict, replace
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from obsv.cache import CachedRunner
+from obsv.canonical import canonical_key
+from obsv.ctrl_runner import CtrlRunner
+from obsv.journal import RunJournal
 from obsv.lyapunov import LyapunovAnalyzer
 
+N_PERTURBATIONS = 10
 
-def get_existing_2move_sequences(logs_dir: Path) -> set:
-    """Get set of already-analyzed 2-move sequences."""
-    existing = set()
-
-    json_files = list(logs_dir.glob("lyapunov_*.json"))
-    json_files = [f for f in json_files if f.name != "lyapunov_summary.json"]
-
-    for json_file in json_files:
-        try:
-            with open(json_file) as f:
-                data = json.load(f)
 
-            if len(data['move_sequence']) == 2:
-                seq_tuple = tuple(data['move_sequence'])
-                existing.add(seq_tuple)
-        except Exception as e:
-            print(f"Warning: Error reading {json_file}: {e}")
-
-    return existing
+def get_existing_2move_sequences(journal: RunJournal) -> set:
+    """Get set of already-analyzed 2-move sequences."""
+    return {
+        tuple(result['sequence']) for result in journal.results()
+        if len(result['sequence']) == 2
+    }
 
 
 def main():
@@ -51,9 +45,12 @@ def main():
     print("="*70)
     print(f"\nTotal possible 2-move sequences: {len(all_sequences)}")
 
-    # Check what we already have
+    # Check what we already have: every finished sequence (and every finished
+    # perturbation of an interrupted one) is in the journal
     logs_dir = Path(__file__).parent.parent / "logs"
-    existing = get_existing_2move_sequences(logs_dir)
+    journal = RunJournal(logs_dir / "journal_2move_heatmap.jsonl",
+                         params={"n_perturbations": N_PERTURBATIONS})
+    existing = get_existing_2move_sequences(journal)
 
     print(f"Already analyzed: {len(existing)}")
     print(f"Remaining to collect: {len(all_sequences) - len(existing)}")
@@ -67,24 +64,35 @@ def main():
     if not missing_sequences:
         print("\n✓ All 2-move sequences already collected!")
         print("  You can generate the heat map now.")
+        journal.close()
         return
 
+    # A→B and B→A are rotations of each other: conjugate maps with the same
+    # period, whose substitution neighborhoods are rotations of each other too.
+    # Analyze one sequence per rotation class and record it for every member.
+    classes = defaultdict(list)
+    for seq in missing_sequences:
+        classes[canonical_key(seq, invert=False)].append(seq)
+    representatives = [members[0] for members in classes.values()]
+    print(f"Distinct up to rotation: {len(representatives)}")
+
     # Show sample of what we'll collect
     print(f"\nSample of sequences to collect:")
-    for seq in missing_sequences[:10]:
+    for seq in representatives[:10]:
         print(f"  {' → '.join(seq)}")
-    if len(missing_sequences) > 10:
-        print(f"  ... and {len(missing_sequences) - 10} more")
+    if len(representatives) > 10:
+        print(f"  ... and {len(representatives) - 10} more")
 
     # Estimate time
-    est_time_min = len(missing_sequences) * 3 / 60  # ~3 sec per sequence with parallelism
-    est_time_max = len(missing_sequences) * 6 / 60  # ~6 sec worst case
+    est_time_min = len(representatives) * 3 / 60  # ~3 sec per sequence with parallelism
+    est_time_max = len(representatives) * 6 / 60  # ~6 sec worst case
     print(f"\nEstimated time: {est_time_min:.1f}-{est_time_max:.1f} minutes")
 
     # Confirm
     response = input("\nProceed with collection? [y/N]: ")
     if response.lower() != 'y':
         print("Cancelled.")
+        journal.close()
         return
 
     # Run analysis
@@ -92,8 +100,23 @@ def main():
     print("Starting parallel analysis...")
     print(f"{'='*70}\n")
 
-    analyzer = LyapunovAnalyzer()
-    results = analyzer.analyze_sequence_batch(missing_sequences, n_perturbations=10, parallel=True, max_workers=6)
+    # Warm ctrl workers (the puzzle is loaded once per worker, not once per
+    # sequence) behind the result cache, so re-runs skip finished evaluations
+    with CachedRunner(CtrlRunner(persistent=True, pool_size=6)) as runner:
+        analyzer = LyapunovAnalyzer(runner=runner)
+        results = analyzer.analyze_sequence_batch(representatives, n_perturbations=N_PERTURBATIONS,
+                                                  parallel=True, max_workers=6, journal=journal)
+
+    # Record each result for the rest of its rotation class
+    index = len(representatives)
+    for result in list(results):
+        for seq in classes[canonical_key(result.sequence, invert=False)][1:]:
+            index += 1
+            rotated = replace(result, sequence=seq)
+            analyzer.save_result(rotated, index)
+            journal.record_result(seq, asdict(rotated))
+            results.append(rotated)
+    journal.close()
 
     # Quick summary
     print(f"\n{'='*70}")
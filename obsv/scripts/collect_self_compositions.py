@@ -14,6 +14,8 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from obsv.cache import CachedRunner
+from obsv.ctrl_runner import CtrlRunner
 from obsv.lyapunov import LyapunovAnalyzer
 
 
@@ -39,8 +41,9 @@ def main():
     print("Starting parallel analysis...")
     print(f"{'='*70}\n")
 
-    analyzer = LyapunovAnalyzer()
-    results = analyzer.analyze_sequence_batch(sequences, n_perturbations=10, parallel=True, max_workers=4)
+    with CachedRunner(CtrlRunner(persistent=True, pool_size=4)) as runner:
+        analyzer = LyapunovAnalyzer(runner=runner)
+        results = analyzer.analyze_sequence_batch(sequences, n_perturbations=10, parallel=True, max_workers=4)
 
     # Print results
     print(f"\n{'='*70}")
@@ -0,0 +1,71 @@
+"""
+Twist tables in the format of `ctrl --export-twists`, built in Python.
+
+The geometry follows ctrl/src/perm.rs (twist_geometry and cube_pieces), so
+engine and symmetry tests run without building ctrl. PermutationEngine checks
+the result against periods found by trajectory walks (REFERENCE_PERIODS).
+"""
+
+from itertools import product
+from typing import Dict, List
+
+FACETS = {"R": (0, 1), "L": (0, -1), "U": (1, 1), "D": (1, -1),
+          "F": (2, 1), "B": (2, -1), "O": (3, 1), "I": (3, -1)}
+
+
+def _parity(axes: List[int]) -> int:
+    sign = 1
+    for i in range(len(axes)):
+        for j in range(i + 1, len(axes)):
+            if axes[i] > axes[j]:
+                sign = -sign
+    return sign
+
+
+def hypercube_table(layers: int = 3) -> Dict:
+    """Twist table of ft_hypercube:<layers>: every 4D quarter twist ("FR")."""
+    outer = layers - 1
+    coords = [2 * i - outer for i in range(layers)]
+    pieces = [list(p) for p in product(coords, repeat=4) if any(abs(c) == outer for c in p)]
+    index = {tuple(p): i for i, p in enumerate(pieces)}
+
+    twists = []
+    for grip, toward in product(FACETS, repeat=2):
+        (a, s), (b, t) = FACETS[grip], FACETS[toward]
+        if a == b:
+            continue
+        plane = [k for k in range(4) if k not in (a, b)]
+        direction = -s * t * _parity([a, b] + plane)
+        c, d = plane
+
+        permutation = []
+        for i, p in enumerate(pieces):
+            if p[a] != s * outer:
+                permutation.append(i)
+                continue
+            q = list(p)
+            if direction > 0:
+                q[c], q[d] = -p[d], p[c]
+            else:
+                q[c], q[d] = p[d], -p[c]
+            permutation.append(index[tuple(q)])
+
+        opposite = next(f for f, (axis, sign) in FACETS.items() if axis == b and sign == -t)
+        twists.append({
+            "name": grip + toward,
+            "reverse": grip + opposite,
+            "axis": a,
+            "sign": s,
+            "plane": plane,
+            "direction": direction,
+            "permutation": permutation,
+        })
+
+    return {
+        "puzzle_id": f"ft_hypercube:{layers}",
+        "puzzle_name": f"{layers}^4 hypercube",
+        "dimension": 4,
+        "layers": layers,
+        "pieces": pieces,
+        "twists": twists,
+    }
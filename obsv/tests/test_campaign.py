@@ -0,0 +1,108 @@
+"""Campaign shards round-trip, sampling is reproducible, and both evaluation paths agree."""
+
+import numpy as np
+import pytest
+
+from hypercube import hypercube_table
+from obsv.campaign import ResultShard, read_shard, run_campaign, sample_chunks
+from obsv.ctrl_runner import MoveGenerator
+from obsv.permutation import PermutationEngine
+from obsv.stats import PeriodStats
+
+RECORDS = [
+    {"move_sequence": ["FR", "UF"], "period": 10080},
+    {"move_sequence": ["OF", "OU", "OR"], "period": None},
+    {"move_sequence": ["FR"], "period": 8},
+]
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return PermutationEngine(hypercube_table())
+
+
+class TrajectoryRunner:
+    """Non-vectorized runner: one run_sequence per sequence."""
+
+    ENGINE = "test"
+    ENGINE_VERSION = 1
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def run_sequence(self, moves, max_iterations, output_file=None, timeout=120):
+        return self.engine.run_sequence(moves, max_iterations)
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".parquet"])
+def test_shard_round_trip(tmp_path, suffix):
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+    path = tmp_path / f"shard{suffix}"
+    codes, lengths = MoveGenerator.random_codes(20, seed=0)
+    periods = np.arange(20) * 7  # the first period is 0: a failure
+    with ResultShard(path) as shard:
+        shard.write(RECORDS)
+        shard.write_codes(codes, lengths, periods, MoveGenerator.COMMON_MOVES)
+        assert shard.count == len(RECORDS) + 20
+
+    expected = RECORDS + [
+        {"move_sequence": seq, "period": int(p) or None}
+        for seq, p in zip(MoveGenerator.decode(codes, lengths), periods)
+    ]
+    assert list(read_shard(path)) == expected
+
+
+def test_partial_jsonl_line_is_skipped(tmp_path):
+    path = tmp_path / "shard.jsonl"
+    with ResultShard(path) as shard:
+        shard.write(RECORDS)
+    text = path.read_text()
+    path.write_text(text[:len(text) - 5])
+    assert list(read_shard(path)) == RECORDS[:-1]
+
+
+def test_unknown_shard_format_raises(tmp_path):
+    with pytest.raises(ValueError):
+        ResultShard(tmp_path / "shard.csv")
+
+
+def test_sample_chunks_is_reproducible_and_complete():
+    chunks = list(sample_chunks(10_000, 2, 6, chunk_size=3000, allow_repeats=False, seed=7))
+    assert [len(codes) for codes, _ in chunks] == [3000, 3000, 3000, 1000]
+    again = list(sample_chunks(10_000, 2, 6, chunk_size=3000, allow_repeats=False, seed=7))
+    for (codes, lengths), (codes2, lengths2) in zip(chunks, again):
+        assert np.array_equal(codes, codes2) and np.array_equal(lengths, lengths2)
+
+    sequences = [seq for codes, lengths in chunks for seq in MoveGenerator.decode(codes, lengths)]
+    assert all(2 <= len(seq) <= 6 for seq in sequences)
+    assert all(a != b for seq in sequences for a, b in zip(seq, seq[1:]))
+
+
+def test_campaign_shard_matches_its_statistics(tmp_path, engine):
+    path = tmp_path / "campaign.jsonl"
+    stats = run_campaign(engine, 5000, path, chunk_size=1024, seed=3)
+    records = list(read_shard(path))
+    assert len(records) == 5000 == stats.count + stats.failed
+
+    sequences = [r["move_sequence"] for r in records]
+    assert [r["period"] for r in records] == engine.periods(engine.encode(sequences)).tolist()
+
+    replayed = PeriodStats.from_results(records)
+    assert replayed.count == stats.count
+    assert replayed.max == stats.max and replayed.min == stats.min
+    assert replayed.overall.mean == pytest.approx(stats.overall.mean)
+    assert replayed.overall.variance == pytest.approx(stats.overall.variance)
+
+
+def test_vectorized_and_per_sequence_runners_agree(tmp_path, engine):
+    vectorized = run_campaign(engine, 300, tmp_path / "a.jsonl", chunk_size=128, seed=5)
+    per_sequence = run_campaign(TrajectoryRunner(engine), 300, tmp_path / "b.jsonl",
+                                chunk_size=128, max_workers=4, seed=5)
+    assert list(read_shard(tmp_path / "a.jsonl")) == list(read_shard(tmp_path / "b.jsonl"))
+    assert (vectorized.count, vectorized.failed, vectorized.max) == \
+        (per_sequence.count, per_sequence.failed, per_sequence.max)
+    assert vectorized.overall.mean == pytest.approx(per_sequence.overall.mean)
@@ -0,0 +1,73 @@
+"""Canonical keys: invariant under rotation and inversion, and period-preserving."""
+
+import random
+
+import pytest
+
+from hypercube import hypercube_table
+from obsv.canonical import (canonical_key, canonical_sequence, inverse_move,
+                            inverse_sequence, normalize_move)
+from obsv.ctrl_runner import MoveGenerator
+from obsv.permutation import PermutationEngine
+
+MOVES = MoveGenerator.MOVES
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return PermutationEngine(hypercube_table())
+
+
+def random_sequences(count, seed=0):
+    rng = random.Random(seed)
+    return [[rng.choice(MOVES) for _ in range(rng.randint(1, 6))] for _ in range(count)]
+
+
+def rotations(seq):
+    return [seq[i:] + seq[:i] for i in range(len(seq))]
+
+
+def test_inverse_move():
+    assert inverse_move("FR") == "FL"
+    assert inverse_move("R") == "R'"
+    assert inverse_move("R'") == "R"
+    assert normalize_move("FR'") == "FL"
+    for move in MOVES:
+        assert inverse_move(inverse_move(move)) == move
+
+
+def test_inverse_sequence_is_an_involution():
+    for seq in random_sequences(200):
+        assert inverse_sequence(inverse_sequence(seq)) == seq
+
+
+def test_key_is_invariant_under_rotation_and_inversion():
+    for seq in random_sequences(200):
+        key = canonical_key(seq)
+        for variant in rotations(seq) + rotations(inverse_sequence(seq)):
+            assert canonical_key(variant) == key
+
+
+def test_key_without_inversion_only_identifies_rotations():
+    seq = ["FR", "UF", "OR"]
+    assert {canonical_key(r, invert=False) for r in rotations(seq)} == {canonical_key(seq, invert=False)}
+    assert canonical_key(inverse_sequence(seq), invert=False) != canonical_key(seq, invert=False)
+    assert canonical_key(inverse_sequence(seq)) == canonical_key(seq)
+
+
+def test_canonical_sequence_is_a_member_of_the_class():
+    for seq in random_sequences(100):
+        members = {tuple(r) for r in rotations(seq) + rotations(inverse_sequence(seq))}
+        assert tuple(canonical_sequence(seq)) in members
+
+
+def test_key_preserves_period(engine):
+    for seq in random_sequences(100, seed=1):
+        variants = rotations(seq) + rotations(inverse_sequence(seq)) + [canonical_sequence(seq)]
+        periods = engine.periods(engine.encode([seq] + variants))
+        assert set(periods.tolist()) == {int(periods[0])}
+
+
+def test_sequence_followed_by_its_inverse_is_the_identity(engine):
+    for seq in random_sequences(50, seed=2):
+        assert engine.period(seq + inverse_sequence(seq)) == 1
@@ -0,0 +1,55 @@
+"""Run journals: replay, class-keyed periods, parameter checks and truncated-record recovery."""
+
+import pytest
+
+from obsv.canonical import canonical_key
+from obsv.journal import RunJournal
+
+
+def test_records_replay_after_reopening(tmp_path):
+    path = tmp_path / "run.jsonl"
+    with RunJournal(path, params={"n": 3}) as journal:
+        journal.record_batch([["FR", "UF"], ["OF", "OU"]])
+        journal.record_plan(["FR", "UF"], [["FL", "UF"]], [0.5])
+        journal.record_plan(["FR", "UF"], [["FR", "UB"]], [0.5])
+        journal.record_period(["UF", "FR"], 10080)
+        journal.record_period(["OF", "OU", "OR"], None)
+        journal.record_result(["FR", "UF"], {"lyapunov_exponent": 3.4})
+
+    with RunJournal(path, params={"n": 3}) as journal:
+        assert journal.params == {"n": 3}
+        assert journal.batch == [["FR", "UF"], ["OF", "OU"]]
+        assert journal.plan(["FR", "UF"]) == ([["FL", "UF"], ["FR", "UB"]], [0.5, 0.5])
+        assert journal.plan(["OF", "OU"]) is None
+        # Periods are shared by a whole rotation/inversion class
+        assert journal.periods[canonical_key(["FR", "UF"])] == 10080
+        assert journal.periods[canonical_key(["OF", "OU", "OR"])] is None
+        assert journal.result(["FR", "UF"]) == {"lyapunov_exponent": 3.4}
+        assert journal.result(["OF", "OU"]) is None
+        assert journal.results() == [{"lyapunov_exponent": 3.4}]
+
+
+def test_resuming_with_different_parameters_raises(tmp_path):
+    path = tmp_path / "run.jsonl"
+    RunJournal(path, params={"backend": "cargo"}).close()
+    RunJournal(path, params={"backend": "cargo"}).close()
+    with pytest.raises(ValueError):
+        RunJournal(path, params={"backend": "permutation"})
+
+
+def test_truncated_record_is_dropped_and_appending_resumes(tmp_path):
+    path = tmp_path / "run.jsonl"
+    with RunJournal(path) as journal:
+        journal.record_period(["FR"], 8)
+        journal.record_period(["FR", "UF"], 10080)
+
+    # A crash in the middle of writing the second record
+    text = path.read_text()
+    path.write_text(text[:len(text) - 10])
+
+    with RunJournal(path) as journal:
+        assert journal.periods == {canonical_key(["FR"]): 8}
+        journal.record_period(["OF", "OU"], 6)
+
+    with RunJournal(path) as journal:
+        assert journal.periods == {canonical_key(["FR"]): 8, canonical_key(["OF", "OU"]): 6}
@@ -0,0 +1,144 @@
+"""Streaming statistics: exact moments, sketch rank error, mergeability, sign-test error rates."""
+
+import json
+
+import numpy as np
+import pytest
+
+from obsv.stats import PeriodStats, QuantileSketch, RunningMoments, SequentialSignTest
+
+
+def rank_error(values, estimate, q):
+    """How far the estimate's rank is from q, as a fraction of the sample."""
+    ordered = np.sort(values)
+    low = np.searchsorted(ordered, estimate, side="left") / len(ordered)
+    high = np.searchsorted(ordered, estimate, side="right") / len(ordered)
+    return 0.0 if low <= q <= high else min(abs(low - q), abs(high - q))
+
+
+def test_running_moments_match_numpy_and_merge():
+    values = np.random.default_rng(0).lognormal(5, 2, size=10_000)
+    streamed = RunningMoments()
+    streamed.update(values.tolist())
+    merged = RunningMoments.from_array(values[:3000])
+    merged.merge(RunningMoments.from_array(values[3000:]))
+    for moments in (streamed, merged):
+        assert moments.count == len(values)
+        assert moments.mean == pytest.approx(values.mean())
+        assert moments.variance == pytest.approx(values.var(ddof=1))
+
+
+def test_small_sketch_is_exact():
+    sketch = QuantileSketch()
+    sketch.update([6, 840, 2160, 10080])
+    assert sketch.quantiles([0.25, 0.5, 0.75, 0.9]) == pytest.approx(
+        np.percentile([6, 840, 2160, 10080], [25, 50, 75, 90]).tolist()
+    )
+
+
+def test_sketch_rank_error_is_small():
+    values = np.random.default_rng(1).lognormal(5, 2, size=200_000)
+    sketch = QuantileSketch(k=200, seed=0)
+    sketch.update(values.tolist())
+    assert sketch.count == len(values)
+    for q, estimate in zip([0.01, 0.25, 0.5, 0.9, 0.99], sketch.quantiles([0.01, 0.25, 0.5, 0.9, 0.99])):
+        assert rank_error(values, estimate, q) < 0.02
+
+
+def test_merged_sketches_equal_a_single_sketch():
+    values = np.random.default_rng(2).integers(1, 10**6, size=100_000)
+    parts = np.array_split(values, 7)
+
+    # Before any compaction both hold every sample, so they agree exactly
+    small_single, small_merged = QuantileSketch(), QuantileSketch()
+    small_single.update(values[:150].tolist())
+    for part in np.array_split(values[:150], 3):
+        other = QuantileSketch()
+        other.update(part.tolist())
+        small_merged.merge(other)
+    qs = [0.1, 0.5, 0.9]
+    assert small_merged.quantiles(qs) == small_single.quantiles(qs)
+
+    # After compaction they agree to within the sketch's rank error
+    merged = QuantileSketch(seed=0)
+    for i, part in enumerate(parts):
+        other = QuantileSketch(seed=i + 1)
+        other.update(part.tolist())
+        merged.merge(other)
+    assert merged.count == len(values)
+    for q, estimate in zip(qs, merged.quantiles(qs)):
+        assert rank_error(values, estimate, q) < 0.02
+
+
+def test_period_stats_add_add_many_and_merge_agree():
+    rng = np.random.default_rng(3)
+    lengths = rng.integers(2, 7, size=500)
+    periods = rng.integers(-2, 5000, size=500)  # 0 and below are failures
+
+    one_by_one = PeriodStats()
+    for length, period in zip(lengths.tolist(), periods.tolist()):
+        one_by_one.add(length, period)
+    chunked = PeriodStats()
+    chunked.add_many(lengths, periods)
+    merged = PeriodStats()
+    for part in np.array_split(np.arange(500), 4):
+        worker = PeriodStats()
+        worker.add_many(lengths[part], periods[part])
+        merged.merge(worker)
+
+    ok = periods > 0
+    for stats in (one_by_one, chunked, merged):
+        assert stats.failed == int((~ok).sum())
+        assert stats.count == int(ok.sum())
+        assert (stats.min, stats.max) == (periods[ok].min(), periods[ok].max())
+        assert stats.overall.mean == pytest.approx(periods[ok].mean())
+        for length in np.unique(lengths).tolist():
+            group = periods[ok & (lengths == length)]
+            assert stats.by_length[length].count == len(group)
+            assert stats.max_by_length[length] == group.max()
+
+
+def test_empty_summary_is_valid_json():
+    stats = PeriodStats()
+    stats.add(3, None)
+    summary = json.loads(json.dumps(stats.summary(), allow_nan=False))
+    assert summary["overall"]["failed"] == 1
+    assert summary["overall"]["min"] is None and summary["overall"]["median"] is None
+
+
+def test_sign_test_error_rate_under_the_null():
+    rng = np.random.default_rng(4)
+    alpha, runs, draws = 0.1, 400, 300
+    rejections = 0
+    for _ in range(runs):
+        test = SequentialSignTest(alpha, margin=0.0)
+        for success in rng.random(draws) < 0.5:
+            test.add(bool(success))
+            if test.p_value <= alpha:  # "significant", checked after every draw
+                rejections += 1
+                break
+    # Anytime-valid: at most alpha, up to Monte Carlo noise
+    assert rejections / runs <= alpha + 0.03
+
+
+def test_sign_test_detects_a_difference_and_covers_the_truth():
+    rng = np.random.default_rng(5)
+    test = SequentialSignTest(0.05, margin=0.2)
+    draws = 0
+    while test.decision is None:
+        test.add(bool(rng.random() < 0.8))
+        draws += 1
+    assert test.decision == "significant"
+    assert draws < 100
+    low, high = test.confidence_sequence()
+    assert low <= 0.8 <= high and high < 1.0
+
+
+def test_sign_test_stops_for_futility_near_one_half():
+    rng = np.random.default_rng(6)
+    test = SequentialSignTest(0.05, margin=0.2)
+    while test.decision is None and test.count < 10_000:
+        test.add(bool(rng.random() < 0.5))
+    assert test.decision == "futile"
+    low, high = test.confidence_sequence()
+    assert 0.3 < low < 0.5 < high < 0.7
@@ -0,0 +1,80 @@
+"""Symmetry classes: 384 relabelings, class sizes and weights that add up, shared periods."""
+
+import numpy as np
+import pytest
+
+from hypercube import hypercube_table
+from obsv.canonical import canonical_key
+from obsv.permutation import PermutationEngine
+from obsv.symmetry import TwistSymmetry
+
+
+@pytest.fixture(scope="module")
+def table():
+    return hypercube_table()
+
+
+@pytest.fixture(scope="module")
+def symmetry(table):
+    return TwistSymmetry(table)
+
+
+def all_codes(length, moves=48):
+    return np.stack(np.unravel_index(np.arange(moves ** length), (moves,) * length), axis=1)
+
+
+def test_group_is_the_hyperoctahedral_group(symmetry):
+    assert symmetry.group_size == 384
+    # Every relabeling permutes the twists and fixes the padding code
+    for action in symmetry.action:
+        assert sorted(action[:-1]) == list(range(48))
+        assert action[-1] == symmetry.padding_code
+
+
+@pytest.mark.parametrize("length", [1, 2, 3])
+def test_class_sizes_sum_to_all_sequences(symmetry, length):
+    codes = all_codes(length)
+    canonical, sizes = symmetry.canonical_codes(codes)
+    _, first = np.unique(canonical, axis=0, return_index=True)
+    assert sizes[first].sum() == 48 ** length
+    # Every member of a class reports the class's size
+    _, inverse = np.unique(canonical, axis=0, return_inverse=True)
+    counts = np.bincount(inverse.ravel())
+    assert np.array_equal(counts[inverse.ravel()], sizes)
+
+
+def test_reduce_weights_count_the_input(symmetry):
+    sequences = [[symmetry.moves[c] for c in row] for row in all_codes(2)]
+    representatives, weights, class_sizes = symmetry.reduce(sequences)
+    assert sum(weights) == len(sequences)
+    # The input is every sequence of its length, so each class is complete
+    assert weights == class_sizes
+    for rep in representatives:
+        assert symmetry.canonical(rep) == rep
+
+
+def test_canonical_is_invariant_under_relabeling(symmetry):
+    rng = np.random.default_rng(0)
+    codes = rng.integers(0, 48, size=(50, 4))
+    canonical, _ = symmetry.canonical_codes(codes)
+    for action in symmetry.action[rng.integers(0, symmetry.group_size, size=20)]:
+        relabeled, _ = symmetry.canonical_codes(action[codes])
+        assert np.array_equal(relabeled, canonical)
+
+
+def test_class_members_share_the_period(table, symmetry):
+    engine = PermutationEngine(table)
+    rng = np.random.default_rng(1)
+    for row in rng.integers(0, 48, size=(30, 3)):
+        members = symmetry.action[:, row]
+        sequences = [[symmetry.moves[c] for c in member] for member in members]
+        assert len(set(engine.periods(engine.encode(sequences)).tolist())) == 1
+
+
+def test_symmetry_classes_are_unions_of_key_classes(symmetry):
+    # Relabeling only adds identifications to rotation and inversion
+    sequences = [[symmetry.moves[c] for c in row] for row in all_codes(2)]
+    by_key = {}
+    for seq in sequences:
+        by_key.setdefault(canonical_key(seq), set()).add(tuple(symmetry.canonical(seq)))
+    assert all(len(classes) == 1 for classes in by_key.values())